@@ -0,0 +1,269 @@
+"""Timing suite for the card pipeline, validator, parsers and simulators.
+
+Builds a synthetic deck with ``synthetic_deck`` (``--cards``, 1 000 by
+default; 10 000 to 100 000 for the scaling runs) and times:
+
+* ``process_cards``: the read-only ``processor.py process`` command over
+  the deck written to a temporary directory;
+* ``validate_card``: ``SchemaValidator.validate_card`` on every parsed card;
+* ``yaml_fallback.safe_load``: the fallback parser on every card's text;
+* ``slice_candidate_paragraphs``: one keyword slice per card over a
+  synthetic judgment of ``--paragraphs`` paragraphs;
+* ``optimise_diagram[<engine>]``: the exact solver and the batch engine;
+* ``simulate[<engine>]``: every default prompt strategy, per engine.
+
+Each case reports the best and median of ``--repeat`` runs and the best time
+per item (card, call or strategy).  ``--json`` writes the results;
+``--baseline`` compares them with an earlier ``--json`` file and exits 1
+when any case's time per item grew by more than ``--threshold`` (a
+fraction, 0.25 by default)::
+
+    PYTHONPATH=src python benchmarks/suite.py --cards 10000 --json reports/bench.json
+    PYTHONPATH=src python benchmarks/suite.py --baseline reports/bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic_deck  # noqa: E402
+from jd.monte_carlo.optimize_diagram import (  # noqa: E402
+    _maybe_optimise_score_weights,
+    _maybe_optimise_section_weights,
+    optimise_diagram,
+)
+from windsurf.flashcards.processor import (  # noqa: E402
+    FlashcardProcessor,
+    process_cards,
+)
+from windsurf.tools import yaml_fallback  # noqa: E402
+from windsurf.tools.legal_pinpoint_pipeline import (  # noqa: E402
+    Paragraph,
+    ParagraphTable,
+    slice_candidate_paragraphs,
+)
+from windsurf.tools.schema_validator import SchemaValidator  # noqa: E402
+from windsurf.tools.simulate_prompt_strategies import (  # noqa: E402
+    default_strategies,
+    np,
+    simulate,
+)
+
+Case = Callable[[], object]
+
+
+def _time(fn: Case, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _row(samples: List[float], items: int) -> Dict[str, float]:
+    best = min(samples)
+    return {
+        "items": items,
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "per_item_us": round(best * 1e6 / max(items, 1), 3),
+    }
+
+
+def _judgment(texts: Sequence[str], count: int, seed: int) -> ParagraphTable:
+    """A judgment-shaped table whose paragraphs are sentences from the deck."""
+
+    rng = random.Random(seed)
+    sentences = [s.strip() for text in texts for s in text.split(". ") if len(s) > 40]
+    return ParagraphTable(
+        Paragraph(
+            f"[{n}]", " ".join(rng.sample(sentences, 3)), page=n // 4 + 1, offset=0
+        )
+        for n in range(1, count + 1)
+    )
+
+
+def run_suite(
+    cards: int,
+    repeat: int,
+    seed: int = 0,
+    paragraphs: int = 300,
+    only: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    texts = synthetic_deck.generate_texts(cards, seed)
+    docs = [yaml_fallback.safe_load(text) for text in texts.values()]
+    cases: Dict[str, tuple] = {}
+
+    cases["yaml_fallback.safe_load"] = (
+        lambda: [yaml_fallback.safe_load(text) for text in texts.values()],
+        len(texts),
+    )
+
+    validator = SchemaValidator(synthetic_deck.POLICY)
+    cases["validate_card"] = (
+        lambda: [validator.validate_card(doc) for doc in docs],
+        len(docs),
+    )
+
+    judgment = _judgment(
+        [str(doc.get("back", "")) for doc in docs[:200]], paragraphs, seed
+    )
+    queries = [list(doc.get("keywords") or [])[:6] for doc in docs]
+    cases["slice_candidate_paragraphs"] = (
+        lambda: [
+            slice_candidate_paragraphs(judgment, keywords) for keywords in queries
+        ],
+        len(queries),
+    )
+
+    section_weights = _maybe_optimise_section_weights(False, 150)
+    score_weights = _maybe_optimise_score_weights(False)
+    for engine in ("exact", "batch"):
+        cases[f"optimise_diagram[{engine}]"] = (
+            lambda engine=engine: optimise_diagram(
+                2000, section_weights, score_weights, seed=seed, engine=engine
+            ),
+            1,
+        )
+
+    strategies = default_strategies()
+    for engine, runs in (("numpy", 20000), ("python", 2000)):
+        if engine == "numpy" and np is None:
+            continue
+        cases[f"simulate[{engine}]"] = (
+            lambda engine=engine, runs=runs: [
+                simulate(strategy, runs=runs, seed=seed, engine=engine)
+                for strategy in strategies
+            ],
+            len(strategies),
+        )
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="windsurf-bench-") as tmp:
+        deck_dir = Path(tmp)
+        for name, text in texts.items():
+            (deck_dir / name).write_text(text, encoding="utf-8")
+        processor = FlashcardProcessor()
+        processor.card_dirs = [deck_dir]
+
+        def run_process() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_cards(processor, "*.yml")
+
+        cases["process_cards"] = (run_process, len(texts))
+
+        for name, (fn, items) in cases.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            fn()  # warm caches (policy plan, compiled regexes) outside the timing
+            results[name] = _row(_time(fn, repeat), items)
+    return results
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Dict[str, object]]:
+    """Cases whose time per item grew by more than ``threshold`` (a fraction)."""
+
+    regressions = []
+    for name, row in current.items():
+        before = baseline.get(name)
+        if not before or not before.get("per_item_us"):
+            continue
+        ratio = row["per_item_us"] / before["per_item_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "case": name,
+                    "baseline_us": before["per_item_us"],
+                    "current_us": row["per_item_us"],
+                    "ratio": round(ratio, 3),
+                }
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--paragraphs", type=int, default=300)
+    parser.add_argument(
+        "--only",
+        help="Comma-separated case name prefixes (e.g. validate_card,simulate)",
+    )
+    parser.add_argument("--json", type=Path, help="Write the results as JSON")
+    parser.add_argument(
+        "--baseline", type=Path, help="Earlier --json output to compare with"
+    )
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_suite(args.cards, args.repeat, args.seed, args.paragraphs, only)
+    payload: Dict[str, object] = {
+        "meta": {
+            "cards": args.cards,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+    print(
+        f"{'case':<30} {'items':>7} {'best ms':>10} {'median ms':>10} {'us/item':>10}"
+    )
+    for name, row in results.items():
+        print(
+            f"{name:<30} {row['items']:>7} {row['best_ms']:>10.2f} "
+            f"{row['median_ms']:>10.2f} {row['per_item_us']:>10.1f}"
+        )
+
+    regressions: List[Dict[str, object]] = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        payload["baseline"] = {
+            "path": str(args.baseline),
+            "threshold": args.threshold,
+            "regressions": regressions,
+        }
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%} against {args.baseline}:")
+            for item in regressions:
+                print(
+                    f"  {item['case']}: {item['baseline_us']:.1f} -> "
+                    f"{item['current_us']:.1f} us/item (x{item['ratio']})"
+                )
+        else:
+            print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
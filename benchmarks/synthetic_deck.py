@@ -0,0 +1,289 @@
+"""Generate realistic synthetic flashcards for the benchmark suite.
+
+Each card starts from ``scaffold_card_data`` (the template behind
+``processor.py scaffold``) for the real ``cards_policy.yml``, then every
+templated field is replaced with content sampled from the shipped deck in
+``src/jd/cards_yaml``: the back is stitched together heading by heading from
+different real cards, so citations and section shapes follow the deck rather
+than the placeholders.  Harvested values and back lines are screened against
+the policy, report series are defined on first use and cards are redrawn until
+they validate, so only the ``defect_rate`` share (a missing back section or
+the scaffold's unpinpointed statutory hook) fails and the rest exercise the
+valid-card paths.  Generation is seeded::
+
+    PYTHONPATH=src python benchmarks/synthetic_deck.py /tmp/deck --cards 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from windsurf.flashcards.processor import scaffold_card_data  # noqa: E402
+from windsurf.tools import yaml_fallback  # noqa: E402
+from windsurf.tools.schema_validator import SchemaValidator  # noqa: E402
+
+try:
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover - PyYAML is optional here
+    yaml = None
+
+DECK_DIR = ROOT / "src" / "jd" / "cards_yaml"
+POLICY = ROOT / "src" / "jd" / "policy" / "cards_policy.yml"
+SAMPLED_FIELDS = (
+    "front",
+    "why_it_matters",
+    "mnemonic",
+    "diagram",
+    "tripwires",
+    "anchors",
+    "keywords",
+    "tags",
+)
+# Report series, courts and places the deck cites without expanding them.
+LONG_FORMS = {
+    "CLR": "Commonwealth Law Reports",
+    "NSWLR": "New South Wales Law Reports",
+    "VSCA": "Victorian Court of Appeal",
+    "NSWCA": "New South Wales Court of Appeal",
+    "AC": "Appeal Cases",
+    "PC": "Privy Council",
+    "UK": "United Kingdom",
+    "ACL": "Australian Consumer Law",
+}
+
+
+def _load(text: str) -> object:
+    if yaml is not None:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        return yaml.load(text, Loader=loader)
+    return yaml_fallback.safe_load(text)
+
+
+def _dump(data: Dict[str, object]) -> str:
+    # The fallback emitter writes multi-line text as ``|`` blocks like the deck.
+    return yaml_fallback.safe_dump(data, sort_keys=False, allow_unicode=True)
+
+
+@dataclass
+class DeckSample:
+    """Field values and back sections harvested from the real deck.
+
+    The deck itself does not meet ``cards_policy.yml`` (long sentences,
+    unexpanded report series, statutes cited without a section), so every
+    value and every back line is screened against the policy's validator on
+    the way in and only the ones that raise no error of their own are kept.
+    """
+
+    policy: Dict
+    headings: List[re.Pattern]
+    validator: SchemaValidator
+    fields: Dict[str, List[object]] = field(default_factory=dict)
+    sections: List[List[str]] = field(default_factory=list)
+    _baseline: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def load(
+        cls, deck_dir: Path = DECK_DIR, policy_path: Path = POLICY
+    ) -> "DeckSample":
+        policy = _load(policy_path.read_text(encoding="utf-8")) or {}
+        headings = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in policy.get("back", {}).get("required_headings_regex", [])
+        ]
+        validator = SchemaValidator(policy_path)
+        sample = cls(policy=policy, headings=headings, validator=validator)
+        sample._baseline = frozenset(validator.validate_card({}).errors)
+        sample.sections = [[] for _ in headings]
+        for path in sorted(deck_dir.glob("*.yml")):
+            try:
+                card = _load(path.read_text(encoding="utf-8"))
+            except Exception:
+                continue  # the deck keeps a few cards only the repair stage accepts
+            if isinstance(card, dict):
+                sample.add(card)
+        if not all(sample.sections):
+            raise ValueError(f"No policy-clean back sections in {deck_dir}")
+        return sample
+
+    def add(self, card: Dict) -> None:
+        for name in SAMPLED_FIELDS:
+            value = card.get(name)
+            if value and self._clean({name: value}):
+                self.fields.setdefault(name, []).append(value)
+        for index, block in self._split_back(str(card.get("back") or "")):
+            heading, *lines = block.splitlines()
+            kept = [
+                line
+                for line in lines
+                if line.strip()
+                and self._clean({"back": define_abbreviations(heading + "\n" + line)})
+            ]
+            if kept:
+                self.sections[index].append("\n".join([heading, *kept]))
+
+    def _clean(self, partial: Dict) -> bool:
+        """Whether ``partial`` raises no error beyond those of an empty card.
+
+        The back's length is a property of the whole stitched back, so its
+        word-count errors are left to ``synthetic_card``.
+        """
+
+        return not [
+            error
+            for error in self.validator.validate_card(partial).errors
+            if error not in self._baseline and not error.startswith("Back must contain")
+        ]
+
+    def _split_back(self, text: str) -> Iterator[Tuple[int, str]]:
+        current: Optional[int] = None
+        buffer: List[str] = []
+        for line in text.splitlines():
+            index = next(
+                (
+                    i
+                    for i, pattern in enumerate(self.headings)
+                    if pattern.search(line.strip())
+                ),
+                None,
+            )
+            if index is None:
+                if current is not None:
+                    buffer.append(line)
+                continue
+            if current is not None:
+                yield current, "\n".join(buffer).strip()
+            current, buffer = index, [line.strip()]
+        if current is not None:
+            yield current, "\n".join(buffer).strip()
+
+
+def define_abbreviations(back: str) -> str:
+    """``back`` with a line defining each ``LONG_FORMS`` abbreviation it uses.
+
+    The line goes straight after the first heading, ahead of every use, which
+    is where the policy wants an abbreviation expanded.
+    """
+
+    used = [abbr for abbr in LONG_FORMS if re.search(rf"\b{abbr}\b", back)]
+    if not used:
+        return back
+    heading, _, rest = back.partition("\n")
+    definitions = (
+        "Abbreviations: "
+        + "; ".join(f"{LONG_FORMS[abbr]} ({abbr})" for abbr in used)
+        + "."
+    )
+    return "\n".join(part for part in (heading, definitions, rest) if part)
+
+
+def _draw_card(sample: DeckSample, index: int, rng: random.Random) -> Dict[str, object]:
+    card = scaffold_card_data(f"Synthetic topic {index}", "synthetic", sample.policy)
+    for name, values in sample.fields.items():
+        if name in card:
+            card[name] = copy.deepcopy(rng.choice(values))
+    return card
+
+
+def _stitch(blocks: Sequence[str]) -> str:
+    return define_abbreviations("\n\n".join(blocks)) + "\n"
+
+
+def synthetic_card(
+    sample: DeckSample,
+    index: int,
+    rng: random.Random,
+    defect_rate: float = 0.1,
+    attempts: int = 200,
+) -> Dict[str, object]:
+    """One card: the scaffold template with real-deck content sampled in.
+
+    Cards are redrawn (up to ``attempts`` times) until the validator accepts
+    them, then a ``defect_rate`` share loses a back section or gets the
+    scaffold's unpinpointed statutory hook back, so roughly that share fails
+    validation and the rest reach the valid-card paths.
+    """
+
+    for _ in range(attempts):
+        card = _draw_card(sample, index, rng)
+        blocks = [rng.choice(pool) for pool in sample.sections]
+        card["back"] = _stitch(blocks)
+        if sample.validator.validate_card(card).is_valid:
+            break
+    if rng.random() < defect_rate:
+        if rng.random() < 0.5:
+            del blocks[rng.randrange(len(blocks))]
+        else:
+            scaffold_back = scaffold_card_data(
+                "placeholder", "synthetic", sample.policy
+            )
+            hook = next(
+                i
+                for i, pattern in enumerate(sample.headings)
+                if "Statutory" in pattern.pattern
+            )
+            blocks[hook] = dict(sample._split_back(str(scaffold_back["back"])))[hook]
+        card["back"] = _stitch(blocks)
+    return card
+
+
+def generate_texts(
+    count: int,
+    seed: int = 0,
+    sample: Optional[DeckSample] = None,
+    defect_rate: float = 0.1,
+) -> Dict[str, str]:
+    """``count`` synthetic cards as ``{file name: YAML text}``."""
+
+    sample = sample or DeckSample.load()
+    rng = random.Random(seed)
+    return {
+        f"synthetic-{index:06d}.yml": _dump(
+            synthetic_card(sample, index, rng, defect_rate)
+        )
+        for index in range(1, count + 1)
+    }
+
+
+def write_deck(
+    directory: Path,
+    count: int,
+    seed: int = 0,
+    sample: Optional[DeckSample] = None,
+    defect_rate: float = 0.1,
+) -> List[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, text in generate_texts(count, seed, sample, defect_rate).items():
+        path = directory / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--defect-rate", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    paths = write_deck(
+        args.directory, args.cards, args.seed, defect_rate=args.defect_rate
+    )
+    print(f"Wrote {len(paths)} synthetic cards to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
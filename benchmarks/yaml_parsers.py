@@ -0,0 +1,163 @@
+"""Benchmark ``windsurf.tools.yaml_fallback`` against PyYAML on the card deck.
+
+Parses every card in ``src/jd/cards_yaml`` plus the policy file with the
+fallback parser, ``yaml.safe_load`` (pure-Python ``SafeLoader``) and
+``CSafeLoader`` when PyYAML was built with libyaml, checks the fallback
+returns the same data, and reports the best and median time per deck pass.
+A scaling run parses one synthetic card whose ``back`` grows 1x..16x to
+show the fallback's time per kilobyte stays flat (linear time)::
+
+    PYTHONPATH=src python benchmarks/yaml_parsers.py --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from windsurf.tools import yaml_fallback  # noqa: E402
+
+try:
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover - PyYAML is optional here
+    yaml = None
+
+DECK_DIR = ROOT / "src" / "jd" / "cards_yaml"
+POLICY = ROOT / "src" / "jd" / "policy" / "cards_policy.yml"
+
+
+def load_deck() -> Dict[str, str]:
+    paths = sorted(DECK_DIR.glob("*.yml")) + [POLICY]
+    return {path.name: path.read_text(encoding="utf-8") for path in paths}
+
+
+def parsers() -> Dict[str, Callable[[str], object]]:
+    found: Dict[str, Callable[[str], object]] = {
+        "yaml_fallback": yaml_fallback.safe_load
+    }
+    if yaml is not None:
+        found["yaml.safe_load"] = yaml.safe_load
+        loader = getattr(yaml, "CSafeLoader", None)
+        if loader is not None:
+            found["CSafeLoader"] = lambda text: yaml.load(text, Loader=loader)
+    return found
+
+
+def _time(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def check_agreement(texts: Dict[str, str]) -> Dict[str, str]:
+    """Cards where the fallback disagrees with ``yaml.safe_load``."""
+
+    problems: Dict[str, str] = {}
+    if yaml is None:
+        return problems
+    for name, text in texts.items():
+        try:
+            expected = yaml.safe_load(text)
+        except yaml.YAMLError:
+            continue
+        try:
+            if yaml_fallback.safe_load(text) != expected:
+                problems[name] = "different result"
+        except yaml_fallback.YAMLError as exc:
+            problems[name] = str(exc)
+    return problems
+
+
+def bench_deck(texts: Dict[str, str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for label, parse in parsers().items():
+        usable = []
+        for text in texts.values():
+            try:
+                parse(text)
+            except Exception:
+                continue  # cards PyYAML rejects are skipped for every parser
+            usable.append(text)
+        samples = _time(lambda: [parse(text) for text in usable], repeat)
+        results[label] = {
+            "cards": len(usable),
+            "best_ms": min(samples) * 1000,
+            "median_ms": statistics.median(samples) * 1000,
+        }
+    return results
+
+
+def bench_scaling(texts: Dict[str, str], repeat: int) -> List[Dict[str, float]]:
+    card = next(iter(texts.values()))
+    head, sep, tail = card.partition("back: |\n")
+    body, rest_sep, rest = tail.partition("\nwhy_it_matters:")
+    rows = []
+    for factor in (1, 4, 16):
+        text = head + sep + "\n".join([body] * factor) + rest_sep + rest
+        samples = _time(lambda: yaml_fallback.safe_load(text), repeat)
+        kilobytes = len(text.encode("utf-8")) / 1024
+        rows.append(
+            {
+                "factor": factor,
+                "kb": round(kilobytes, 1),
+                "best_ms": min(samples) * 1000,
+                "us_per_kb": min(samples) * 1e6 / kilobytes,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    texts = load_deck()
+    problems = check_agreement(texts)
+    deck = bench_deck(texts, args.repeat)
+    scaling = bench_scaling(texts, args.repeat)
+
+    print(f"Deck: {len(texts)} files, {sum(map(len, texts.values())) / 1024:.0f} KB")
+    baseline = deck.get("yaml.safe_load", {}).get("best_ms")
+    print(
+        f"{'parser':<16} {'cards':>5} {'best ms':>9} {'median ms':>10} {'vs safe_load':>13}"
+    )
+    for label, row in deck.items():
+        ratio = f"{baseline / row['best_ms']:.1f}x" if baseline else "-"
+        print(
+            f"{label:<16} {row['cards']:>5} {row['best_ms']:>9.2f} "
+            f"{row['median_ms']:>10.2f} {ratio:>13}"
+        )
+    print("\nyaml_fallback scaling (one card, back repeated):")
+    for row in scaling:
+        print(
+            f"  x{row['factor']:<3} {row['kb']:>7.1f} KB {row['best_ms']:>8.2f} ms {row['us_per_kb']:>8.1f} us/KB"
+        )
+    if problems:
+        print("\nFallback disagrees with yaml.safe_load on:")
+        for name, problem in problems.items():
+            print(f"  {name}: {problem}")
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {"deck": deck, "scaling": scaling, "problems": problems}, indent=2
+            ),
+            encoding="utf-8",
+        )
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,21 +5,11 @@ import os
 import re
 import sys
 import time
-import shutil
 import random
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
 
-try:
-    import openai  # type: ignore[import-not-found]
-    from openai import OpenAI  # type: ignore[import-not-found]
-except ImportError:
-    print(
-        "Error: 'openai' package is required. Please install it with: pip install openai"
-    )
-    sys.exit(1)
-
 try:
     import yaml
 except ImportError:
@@ -28,8 +18,12 @@ except ImportError:
     )
     sys.exit(1)
 
+from windsurf.backups import BackupStore, write_atomic
+from windsurf.llm import get_client
+from windsurf.paths import REPO_ROOT, REPORTS_DIR
+from windsurf.telemetry import report_run
+
 print("Using API Key:", (os.environ.get("OPENAI_API_KEY") or "<missing>")[:10], "...")
-openai.api_key = os.environ.get("OPENAI_API_KEY")
 
 # Constants
 CANON_MM = (
@@ -66,39 +60,15 @@ if not API_KEY:
 
 
 def chat(messages, temperature=None, max_completion_tokens=1800, max_retries=3):
-    """Send messages to the OpenAI API with retries and timeouts using the official client."""
-    client = OpenAI(api_key=API_KEY, base_url=API_BASE)
-
-    for attempt in range(max_retries):
-        try:
-            # Prepare the request parameters
-            params = {
-                "model": MODEL,
-                "messages": messages,
-                "temperature": temperature or 0.7,
-                "timeout": 60,  # 60 seconds timeout
-            }
-
-            # Only include max_completion_tokens for OpenAI's API v1
-            if "openai.com" in API_BASE:
-                params["max_completion_tokens"] = max_completion_tokens
-
-            # Make the API call
-            response = client.chat.completions.create(**params)
-            return response.choices[0].message.content
-
-        except Exception as err:
-            error_msg = str(err).replace("openaai.com", "openai.com")
-            if attempt == max_retries - 1:  # Last attempt
-                print(f"  - ❌ Final attempt failed: {error_msg[:200]}...")
-                raise
-
-            wait_time = (2**attempt) * 2
-            print(f"  - ⚠️  Error: {error_msg[:200]}...")
-            print(f"  - Waiting {wait_time}s before retry...")
-            time.sleep(wait_time)
-
-    raise RuntimeError(f"Failed after {max_retries} retries")
+    """Send messages through the shared client (pooled, 60s timeout, jittered backoff)."""
+    params = {"temperature": temperature or 0.7}
+    # Only include max_completion_tokens for OpenAI's API v1
+    if "openai.com" in API_BASE:
+        params["max_completion_tokens"] = max_completion_tokens
+    client = get_client(model=MODEL, api_key=API_KEY, base_url=API_BASE, timeout=60)
+    return client.complete(
+        messages, tool="fix_cards", max_retries=max_retries - 1, **params
+    )
 
 
 # ---- I/O & validation helpers ----
@@ -112,8 +82,10 @@ def ydump(d: Dict[str, Any]) -> str:
 
 ROOT = Path(__file__).parent / "cards_yaml"
 timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-BACKUP = Path("backups") / f"llm_fix_{timestamp}"
-BACKUP.mkdir(parents=True, exist_ok=True)
+# Same content-addressed store as ``processor.py`` (restore with
+# ``processor.py restore --run llm_fix_<timestamp>``).
+BACKUPS = BackupStore(REPO_ROOT / "backups")
+BACKUP_RUN = f"llm_fix_{timestamp}"
 
 
 @dataclass
@@ -454,7 +426,6 @@ def run_audit_model(
 def main():
     files = sorted(ROOT.glob("*.yml"))
     print(f"Found {len(files)} cards.")
-    BACKUP.mkdir(exist_ok=True)
 
     summary: List[Tuple[str, ValidationReport]] = []
 
@@ -555,8 +526,8 @@ def main():
             continue
 
         # Success path
-        shutil.copy2(path, BACKUP / path.name)
-        path.write_text(ydump(card), encoding="utf-8")
+        BACKUPS.add(path, BACKUP_RUN)
+        write_atomic(path, ydump(card))
         summary.append((path.name, report))
         status = "with API" if used_api else "locally"
         print(f"  - ✅ {path.name}: updated {status}")
@@ -582,11 +553,13 @@ def main():
         for warn in rep.warnings:
             report_lines.append(f"  • warning: {warn}")
 
-    report_path = BACKUP / "report.md"
-    Path(report_path).write_text("\n".join(report_lines), encoding="utf-8")
-    print(f"\nDone. Backups & report at: {BACKUP}")
+    report_path = REPORTS_DIR / f"{BACKUP_RUN}.md"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text("\n".join(report_lines), encoding="utf-8")
+    print(f"\nDone. Report at: {report_path}; backups in run {BACKUP_RUN}")
     if failed:
         print(f"{len(failed)} card(s) failed; see {report_path}")
+    report_run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+"""Vectorised Monte Carlo search over diagram candidates.
+
+The reference loop in ``optimize_diagram`` builds one ``DiagramCandidate`` per
+iteration, validates it and scores it with ``compute_metrics``.  This module
+draws the same distribution of candidates in bulk instead:
+
+* children are sampled as NumPy index arrays into each label's pool (random
+  permutations via ``argsort`` of uniform keys, like ``sample_children``);
+  only the child vectors the pools can fill without repeating a leaf
+  (``feasible_child_vectors``) are drawn;
+* validity is checked arithmetically by comparing each row's child vector to
+  those vectors and the node limit;
+* coverage, priority and balance are computed with array operations.
+
+Only the winning row is turned back into a ``DiagramCandidate``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .config import (
+    MAX_TOTAL_NODES,
+    TOP_LEVEL_BRANCHES,
+    CardContext,
+    feasible_child_vectors,
+    get_card_context,
+    use_card_context,
+)
+from .diagram_generator import DiagramCandidate, _weighted_vector_choice
+
+DEFAULT_PRIORITY = 0.6
+DEFAULT_BATCH_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class _LabelTables:
+    """Per-label lookup arrays shared by every batch."""
+
+    pool: List[str]
+    item_priority: np.ndarray  # priority of each pool item
+    best_prefix: np.ndarray  # best_prefix[c] = sum of the top-c priorities
+
+
+def _label_tables(context: CardContext) -> List[_LabelTables]:
+    tables: List[_LabelTables] = []
+    for label in context.section_labels:
+        pool = list(context.section_content.get(label, []))
+        priorities = context.key_item_priority.get(label, {})
+        item_priority = np.array(
+            [priorities.get(item, DEFAULT_PRIORITY) for item in pool], dtype=float
+        )
+        ranked = sorted(priorities.values(), reverse=True)
+        best_prefix = np.concatenate(([0.0], np.cumsum(ranked, dtype=float)))
+        tables.append(_LabelTables(pool, item_priority, best_prefix))
+    return tables
+
+
+def _sample_indices(
+    rng: np.random.Generator, batch: int, pool_size: int, count: int
+) -> np.ndarray:
+    """Return ``(batch, count)`` distinct pool indices mirroring ``sample_children``."""
+
+    if count <= 0 or pool_size == 0:
+        return np.zeros((batch, 0), dtype=np.intp)
+    keys = rng.random((batch, pool_size))
+    return np.argsort(keys, axis=1)[:, :count]
+
+
+class BatchDiagramSearch:
+    """Score many random candidates per call using NumPy arrays."""
+
+    def __init__(
+        self,
+        section_weights: Optional[Mapping[str, float]] = None,
+        score_weights: Optional[Mapping[str, float]] = None,
+        context: Optional[CardContext] = None,
+    ) -> None:
+        self.context = context or get_card_context()
+        self.section_weights = section_weights
+        score_weights = score_weights or {}
+        self.weights = (
+            score_weights.get("coverage", 0.4),
+            score_weights.get("priority", 0.4),
+            score_weights.get("balance", 0.2),
+        )
+        self._tables = _label_tables(self.context)
+        vectors = feasible_child_vectors(self.context)
+        if not vectors:
+            raise RuntimeError("No allowed child vector fits this card's item pools")
+        self._vectors = np.asarray(vectors, dtype=np.intp)
+        # Labels are fixed per context, so the branch count check done by
+        # ``validate_candidate`` either passes for every candidate or for none.
+        self._labels_valid = len(self.context.section_labels) == TOP_LEVEL_BRANCHES
+
+    def _choose_vectors(self, rng: np.random.Generator, batch: int) -> np.ndarray:
+        if self.section_weights:
+            best = list(_weighted_vector_choice(self.section_weights))
+            return np.tile(np.asarray(best, dtype=np.intp), (batch, 1))
+        return self._vectors[rng.integers(len(self._vectors), size=batch)]
+
+    def sample_metrics(
+        self, rng: np.random.Generator, batch: int
+    ) -> tuple[np.ndarray, List[np.ndarray], np.ndarray, np.ndarray]:
+        """Return ``(counts, indices, metrics, valid)`` for ``batch`` candidates.
+
+        ``counts`` has shape ``(batch, labels)``; ``indices[j]`` holds the pool
+        indices drawn for label ``j`` (only the first ``counts[:, j]`` columns
+        are used); ``metrics`` has columns coverage, priority and balance, as
+        computed by ``evaluation.compute_metrics``.
+        """
+
+        requested = self._choose_vectors(rng, batch)
+        pool_sizes = np.array([len(t.pool) for t in self._tables], dtype=np.intp)
+        counts = np.where(pool_sizes > 0, requested, 0)
+
+        indices: List[np.ndarray] = []
+        priority_total = np.zeros(batch)
+        max_total = np.zeros(batch)
+        for j, table in enumerate(self._tables):
+            width = int(counts[:, j].max(initial=0))
+            drawn = _sample_indices(rng, batch, len(table.pool), width)
+            indices.append(drawn)
+            if width:
+                used = np.arange(width) < counts[:, j, None]
+                priority_total += (table.item_priority[drawn] * used).sum(axis=1)
+            top = np.minimum(counts[:, j], len(table.best_prefix) - 1)
+            max_total += table.best_prefix[top]
+
+        coverage = (counts > 0).sum(axis=1) / max(len(self._tables), 1)
+        priority = np.divide(
+            priority_total,
+            max_total,
+            out=np.zeros(batch),
+            where=max_total > 0,
+        )
+        if counts.shape[1] > 1:
+            balance = 1.0 / (1.0 + counts.std(axis=1))
+        else:
+            balance = np.ones(batch)
+        metrics = np.column_stack((coverage, priority, balance))
+
+        allowed = (
+            (counts[:, None, :] == self._vectors[None, :, :]).all(axis=2).any(axis=1)
+        )
+        valid = allowed & (counts.sum(axis=1) <= MAX_TOTAL_NODES) & self._labels_valid
+        return counts, indices, metrics, valid
+
+    def sample(
+        self, rng: np.random.Generator, batch: int
+    ) -> tuple[np.ndarray, List[np.ndarray], np.ndarray]:
+        """Return ``(counts, indices, scores)``; invalid candidates score ``-inf``."""
+
+        counts, indices, metrics, valid = self.sample_metrics(rng, batch)
+        scores = metrics @ np.asarray(self.weights)
+        return counts, indices, np.where(valid, scores, -np.inf)
+
+    def candidate(
+        self, counts: np.ndarray, indices: List[np.ndarray], row: int
+    ) -> DiagramCandidate:
+        children: Dict[str, List[str]] = {}
+        for j, (label, table) in enumerate(
+            zip(self.context.section_labels, self._tables)
+        ):
+            picks = indices[j][row, : counts[row, j]]
+            children[label] = [table.pool[i] for i in picks]
+        return DiagramCandidate(labels=self.context.section_labels, children=children)
+
+    def run(
+        self,
+        iterations: int,
+        seed: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> tuple[DiagramCandidate, float]:
+        """Return the best of ``iterations`` random candidates and its score."""
+
+        rng = np.random.default_rng(seed)
+        best: Optional[DiagramCandidate] = None
+        best_score = float("-inf")
+        remaining = iterations
+        while remaining > 0:
+            batch = min(batch_size, remaining)
+            remaining -= batch
+            counts, indices, scores = self.sample(rng, batch)
+            row = int(np.argmax(scores))
+            if scores[row] > best_score:
+                best_score = float(scores[row])
+                best = self.candidate(counts, indices, row)
+        if best is None:
+            raise RuntimeError("No valid diagram generated within constraints")
+        return best, best_score
+
+
+def optimise_diagram_batched(
+    iterations: int,
+    section_weights: Optional[Mapping[str, float]],
+    score_weights: Optional[Mapping[str, float]],
+    seed: Optional[int] = None,
+    context: Optional[CardContext] = None,
+) -> DiagramCandidate:
+    context = context or get_card_context()
+    with use_card_context(context):
+        search = BatchDiagramSearch(section_weights, score_weights, context=context)
+        candidate, _ = search.run(iterations, seed=seed)
+    return candidate
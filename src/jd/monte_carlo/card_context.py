@@ -0,0 +1,248 @@
+"""Derive a ``CardContext`` from a flashcard's YAML.
+
+The five branch labels are fixed by the diagram policy (they index
+``ALLOWED_CHILD_VECTORS``), but their child pools and priorities come from
+the card itself:
+
+* each label draws items from one or more back sections (see
+  ``SECTION_SOURCES``): bullet or numbered lines when the section has them,
+  otherwise its sentences;
+* labels whose sections are missing fall back to the card's anchors, to case
+  or statute references found anywhere in the back, or to ``why_it_matters``;
+* items are shortened to diagram-sized node text at a clause or phrase
+  boundary (before a preposition or conjunction); items with no such
+  boundary within ``MAX_NODE_WORDS`` words are dropped rather than cut
+  mid-phrase, and an item already used by an earlier label is not offered
+  again, so a diagram never shows the same leaf twice;
+* priority decreases with position in the section (authors list the most
+  important point first), and items that match the card's ``anchors``
+  (cases or statutes) are promoted to the top.
+
+The root label is the topic before the colon in ``front`` when there is one,
+otherwise the card's file name.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+import re
+
+import yaml
+
+from .config import DEFAULT_SECTION_LABELS, CardContext
+
+SECTION_SOURCES: Dict[str, tuple[str, ...]] = {
+    "Legal Test": ("Rule", "Issue"),
+    "Case Law": ("Authorities map",),
+    "Application": ("Application scaffold",),
+    "Statute": ("Statutory hook",),
+    "Core Principle": ("Conclusion", "Tripwires"),
+}
+BACK_HEADINGS = (
+    "Issue",
+    "Rule",
+    "Application scaffold",
+    "Authorities map",
+    "Statutory hook",
+    "Tripwires",
+    "Conclusion",
+)
+
+POOL_SIZE = 4
+MAX_NODE_WORDS = 6
+TOP_PRIORITY = 1.0
+PRIORITY_STEP = 0.1
+MIN_PRIORITY = 0.6
+
+_HEADING_RE = re.compile(
+    r"^(" + "|".join(re.escape(h) for h in BACK_HEADINGS) + r")\.\s*(.*)$"
+)
+_BULLET_RE = re.compile(r"^(?:[-•*]|\(\d+\)|\d+[.)])\s+")
+_SENTENCE_RE = re.compile(r"(?<=[.?!])\s+(?=[A-Z(])")
+_CASE_NAME_RE = re.compile(r"^(.+?)\s+[\[(]\d{4}")
+_CLAUSE_END_RE = re.compile(r"\s+[—–-]\s+|[;:]\s")
+_PHRASE_END_RE = re.compile(r",\s+|\s+\(")
+# A node may end before one of these words but never on one.
+_FUNCTION_WORDS = frozenset(
+    "a an the of and or to in on at by for with from as that which is are "
+    "if but than into under whether when where because unless not only "
+    "rather".split()
+)
+_CASE_REF_RE = re.compile(
+    r"\b([A-Z][\w'&.]*(?: (?:[A-Z][\w'&.]*|of|the|for))* v "
+    r"[A-Z][\w'&.]*(?: (?:[A-Z][\w'&.]*|of|the|for))*)"
+)
+_STATUTE_REF_RE = re.compile(r"\b([A-Z][A-Za-z ]+ Act \d{4}(?: \([A-Z][a-z]+\))?)")
+
+
+def parse_back_sections(back: str) -> Dict[str, List[str]]:
+    """Return the items of each recognised back section, in order."""
+
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    prose: Dict[str, List[str]] = {}
+    for raw_line in (back or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = _HEADING_RE.match(line)
+        if match:
+            current = match.group(1)
+            sections.setdefault(current, [])
+            prose.setdefault(current, [])
+            if match.group(2):
+                prose[current].append(match.group(2))
+            continue
+        if current is None:
+            continue
+        if _BULLET_RE.match(line):
+            sections[current].append(_BULLET_RE.sub("", line))
+        else:
+            prose[current].append(line)
+    for heading, lines in prose.items():
+        if not sections[heading] and lines:
+            text = " ".join(lines)
+            sections[heading] = [s for s in _SENTENCE_RE.split(text) if s.strip()]
+    return sections
+
+
+def _anchor_names(anchors: object, kind: str) -> List[str]:
+    if isinstance(anchors, Mapping):
+        names: List[str] = []
+        for entry in anchors.get(kind, []) or []:
+            if isinstance(entry, Mapping) and entry.get("name"):
+                names.append(str(entry["name"]))
+            elif isinstance(entry, str):
+                names.append(entry)
+        return names
+    if isinstance(anchors, list):
+        return [str(item) for item in anchors]
+    return []
+
+
+def _node_text(label: str, item: str) -> str:
+    text = item.strip()
+    if label == "Case Law":
+        # Case names are kept whole; truncating them would misname the case.
+        match = _CASE_NAME_RE.match(text)
+        return (match.group(1) if match else text).rstrip(".,;:—–- ")
+    text = _SENTENCE_RE.split(text, maxsplit=1)[0]
+    text = _CLAUSE_END_RE.split(text, maxsplit=1)[0].rstrip(".,;:—–- ")
+    return _shorten(text)
+
+
+def _shorten(text: str) -> str:
+    """``text`` cut to at most ``MAX_NODE_WORDS`` words at a phrase boundary, or ``""``."""
+
+    if text.rfind("(") > text.rfind(")"):
+        text = text[: text.rfind("(")].rstrip(".,;:—–- ")  # unclosed aside
+    words = text.split()
+    if len(words) <= MAX_NODE_WORDS:
+        return text if words and words[-1].lower() not in _FUNCTION_WORDS else ""
+    head = _PHRASE_END_RE.split(text, maxsplit=1)[0].split()
+    if 2 <= len(head) <= MAX_NODE_WORDS and head[-1].lower() not in _FUNCTION_WORDS:
+        return " ".join(head)
+    for end in range(MAX_NODE_WORDS, 1, -1):
+        if (
+            words[end].lower() in _FUNCTION_WORDS
+            and words[end - 1].lower() not in _FUNCTION_WORDS
+        ):
+            return " ".join(words[:end]).rstrip(".,;:—–- ")
+    return ""
+
+
+def _rank_items(items: Iterable[str], anchors: List[str]) -> Dict[str, float]:
+    unique: List[str] = []
+    for item in items:
+        if item and item not in unique:
+            unique.append(item)
+    anchored = [
+        item
+        for item in unique
+        if any(item in anchor or anchor in item for anchor in anchors)
+    ]
+    ordered = anchored + [item for item in unique if item not in anchored]
+    return {
+        item: max(MIN_PRIORITY, round(TOP_PRIORITY - PRIORITY_STEP * rank, 2))
+        for rank, item in enumerate(ordered[:POOL_SIZE])
+    }
+
+
+def _fallback_items(
+    label: str, back: str, anchor_names: Mapping[str, List[str]], why: str
+) -> List[str]:
+    """Items for a label whose source sections are missing from the card."""
+
+    if anchor_names.get(label):
+        return list(anchor_names[label])
+    if label == "Case Law":
+        return _CASE_REF_RE.findall(back)
+    if label == "Statute":
+        return _STATUTE_REF_RE.findall(back)
+    return [s for s in _SENTENCE_RE.split(why.strip()) if s.strip()]
+
+
+def _root_label(card: Mapping[str, object], card_path: Optional[Path]) -> str:
+    front = str(card.get("front") or "")
+    topic, sep, _ = front.partition(":")
+    if sep and len(topic.split()) <= MAX_NODE_WORDS:
+        return topic.strip()
+    if card_path is not None:
+        slug = re.sub(r"^\d+-", "", card_path.stem).replace("-", " ")
+        return slug[:1].upper() + slug[1:]
+    return " ".join(front.rstrip("?").split()[:MAX_NODE_WORDS])
+
+
+def build_card_context(
+    card: Mapping[str, object], card_path: Optional[Path] = None
+) -> CardContext:
+    """Build the optimiser context for an already loaded card."""
+
+    back = str(card.get("back") or "")
+    sections = parse_back_sections(back)
+    anchors = card.get("anchors")
+    anchor_names = {
+        "Case Law": _anchor_names(anchors, "cases"),
+        "Statute": _anchor_names(anchors, "statutes"),
+    }
+    why = str(card.get("why_it_matters") or "")
+
+    content: Dict[str, List[str]] = {}
+    priority: Dict[str, Dict[str, float]] = {}
+    used: set[str] = set()
+    for label in DEFAULT_SECTION_LABELS:
+        items: List[str] = []
+        for heading in SECTION_SOURCES[label]:
+            items.extend(sections.get(heading, []))
+        if not items:
+            items = _fallback_items(label, back, anchor_names, why)
+        ranked = _rank_items(
+            (
+                text
+                for text in (_node_text(label, item) for item in items)
+                if text not in used
+            ),
+            anchor_names.get(label, []),
+        )
+        used.update(ranked)
+        content[label] = list(ranked)
+        priority[label] = ranked
+
+    return CardContext(
+        root_label=_root_label(card, card_path),
+        section_labels=list(DEFAULT_SECTION_LABELS),
+        section_content=content,
+        key_item_priority=priority,
+        card_path=card_path,
+    )
+
+
+def load_card_context(card_path: Path) -> CardContext:
+    """Load ``card_path`` and derive its ``CardContext``."""
+
+    card_path = Path(card_path)
+    card = yaml.safe_load(card_path.read_text(encoding="utf-8")) or {}
+    if not isinstance(card, Mapping):
+        raise ValueError(f"{card_path} does not contain a YAML mapping")
+    return build_card_context(card, card_path)
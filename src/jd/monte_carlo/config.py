@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
+import hashlib
+import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
 
 @dataclass(frozen=True)
@@ -15,17 +18,19 @@ class CardContext:
     section_labels: List[str]
     section_content: Dict[str, List[str]]
     key_item_priority: Dict[str, Dict[str, float]]
+    card_path: Optional[Path] = None
 
 
 # Base paths
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
-CARDS_DIR = PROJECT_ROOT / "windsurf" / "jd" / "cards_yaml"
+CARDS_DIR = Path(__file__).resolve().parents[1] / "cards_yaml"
 CACHE_DIR = Path(__file__).resolve().parent / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Card specific configuration for 0004-causation-s51-factual-vs-scope.yml
 DEFAULT_CARD_FILENAME = "0004-causation-s51-factual-vs-scope.yml"
 DEFAULT_CARD_PATH = CARDS_DIR / DEFAULT_CARD_FILENAME
+CARD_PATH = DEFAULT_CARD_PATH
 
 # Diagram policy parameters
 MAX_TOTAL_NODES = 12
@@ -109,8 +114,16 @@ DEFAULT_CARD_CONTEXT = CardContext(
     section_labels=DEFAULT_SECTION_LABELS,
     section_content=DEFAULT_SECTION_CONTENT,
     key_item_priority=DEFAULT_KEY_PRIORITY,
+    card_path=DEFAULT_CARD_PATH,
 )
 
+# Aliases for the default card; code that must follow the active card calls
+# ``get_card_context()`` instead.
+SECTION_LABELS = DEFAULT_CARD_CONTEXT.section_labels
+SECTION_CONTENT = DEFAULT_CARD_CONTEXT.section_content
+KEY_ITEM_PRIORITY = DEFAULT_CARD_CONTEXT.key_item_priority
+TOP_LEVEL_BRANCHES = len(SECTION_LABELS)
+
 DEFAULT_SECTION_WEIGHTS = {
     "Legal Test": 0.25,
     "Case Law": 0.25,
@@ -125,7 +138,7 @@ DEFAULT_SCORE_WEIGHTS = {
     "balance": 0.15,
 }
 
-# Cache files
+# Cache files for the default card; other cards use ``cache_path``.
 WEIGHT_CACHE = CACHE_DIR / "weights.json"
 SCORE_CACHE = CACHE_DIR / "score_weights.json"
 
@@ -137,3 +150,79 @@ def max_children_per_label(section_labels: List[str]) -> Dict[str, int]:
         label: max(vector[idx] for vector in ALLOWED_CHILD_VECTORS)
         for idx, label in enumerate(section_labels)
     }
+
+
+_active_context = DEFAULT_CARD_CONTEXT
+
+
+def get_card_context() -> CardContext:
+    """Return the card context the optimiser is currently working on."""
+
+    return _active_context
+
+
+def set_card_context(context: CardContext) -> None:
+    """Make ``context`` the active card for this process."""
+
+    global _active_context
+    _active_context = context
+
+
+@contextmanager
+def use_card_context(context: CardContext) -> Iterator[CardContext]:
+    """Temporarily switch the active card context."""
+
+    previous = get_card_context()
+    set_card_context(context)
+    try:
+        yield context
+    finally:
+        set_card_context(previous)
+
+
+def feasible_child_vectors(context: Optional[CardContext] = None) -> List[List[int]]:
+    """Allowed child vectors the context's pools can fill without repeating a leaf."""
+
+    context = context or get_card_context()
+    sizes = [
+        len(set(context.section_content.get(label, [])))
+        for label in context.section_labels
+    ]
+    return [
+        list(vector)
+        for vector in ALLOWED_CHILD_VECTORS
+        if all(count <= size for count, size in zip(vector, sizes))
+    ]
+
+
+def get_max_children_per_label() -> Dict[str, int]:
+    return max_children_per_label(get_card_context().section_labels)
+
+
+def context_fingerprint(context: Optional[CardContext] = None) -> str:
+    """Return a stable hash of everything the optimisers read from a context."""
+
+    context = context or get_card_context()
+    payload = json.dumps(
+        [
+            context.root_label,
+            context.section_labels,
+            context.section_content,
+            context.key_item_priority,
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path(
+    kind: str, context: Optional[CardContext] = None, **params: object
+) -> Path:
+    """Return the cache file for ``kind`` keyed by card context and ``params``."""
+
+    key = context_fingerprint(context)
+    if params:
+        settings = json.dumps(params, sort_keys=True)
+        key += "-" + hashlib.sha1(settings.encode("utf-8")).hexdigest()[:8]
+    return CACHE_DIR / f"{kind}-{key}.json"
@@ -0,0 +1,135 @@
+"""Optimise diagrams for a whole deck, one worker process per card.
+
+Each worker loads its card, derives the ``CardContext`` from the card's back
+sections and anchors, makes it the active context for that process and runs
+``optimise_diagram``.  Score weights are resolved once in the parent and
+shared; section weights are not used, so every allowed child vector the
+card's item pools can fill without repeating a leaf is considered.  Cards
+whose pools fit no vector are reported as errors and left unchanged.
+
+Usage::
+
+    python -m jd.monte_carlo.deck                 # every card in cards_yaml
+    python -m jd.monte_carlo.deck a.yml b.yml --dry-run --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .card_context import load_card_context
+from .config import CARDS_DIR, set_card_context
+from .evaluation import compute_metrics, score_candidate
+from .optimize_diagram import optimise_diagram, update_card
+from .score_optimizer import load_score_weights
+
+
+def optimise_card(
+    card_path: Path,
+    score_weights: Dict[str, float],
+    engine: str = "exact",
+    iterations: int = 2000,
+    seed: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, object]:
+    """Optimise one card's diagram and report the outcome as a dict."""
+
+    report: Dict[str, object] = {"card": str(card_path)}
+    try:
+        context = load_card_context(card_path)
+        set_card_context(context)
+        candidate = optimise_diagram(
+            iterations=iterations,
+            section_weights={},
+            score_weights=score_weights,
+            seed=seed,
+            engine=engine,
+        )
+        diagram_text = candidate.to_mermaid()
+        if not dry_run:
+            update_card(diagram_text, card_path)
+    except Exception as exc:
+        report.update(status="error", error=str(exc))
+        return report
+    report.update(
+        status="dry-run" if dry_run else "updated",
+        root=context.root_label,
+        child_vector=candidate.child_vector(),
+        score=score_candidate(compute_metrics(candidate), score_weights),
+        diagram=diagram_text,
+    )
+    return report
+
+
+def optimise_deck(
+    card_paths: Sequence[Path],
+    workers: Optional[int] = None,
+    engine: str = "exact",
+    iterations: int = 2000,
+    seed: Optional[int] = None,
+    dry_run: bool = False,
+) -> List[Dict[str, object]]:
+    """Optimise every card in ``card_paths`` in parallel, in input order."""
+
+    score_weights = load_score_weights().to_dict()
+    workers = workers or min(len(card_paths), os.cpu_count() or 1) or 1
+    reports: Dict[Path, Dict[str, object]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                optimise_card, path, score_weights, engine, iterations, seed, dry_run
+            ): path
+            for path in card_paths
+        }
+        for future in as_completed(futures):
+            reports[futures[future]] = future.result()
+    return [reports[path] for path in card_paths]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Optimise diagrams for every card in parallel"
+    )
+    parser.add_argument(
+        "cards",
+        nargs="*",
+        type=Path,
+        help=f"Card YAML files (default: all in {CARDS_DIR})",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument("--engine", choices=["exact", "batch", "loop"], default="exact")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=2000,
+        help="Monte Carlo iterations (batch/loop engines)",
+    )
+    parser.add_argument("--seed", type=int, help="Deterministic random seed")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not write to cards; just report diagrams",
+    )
+    args = parser.parse_args(argv)
+
+    card_paths = args.cards or sorted(CARDS_DIR.glob("*.yml"))
+    reports = optimise_deck(
+        card_paths,
+        workers=args.workers,
+        engine=args.engine,
+        iterations=args.iterations,
+        seed=args.seed,
+        dry_run=args.dry_run,
+    )
+    for report in reports:
+        print(json.dumps(report, ensure_ascii=False))
+    return 1 if any(report["status"] == "error" for report in reports) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
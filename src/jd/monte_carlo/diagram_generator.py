@@ -6,9 +6,11 @@ from dataclasses import dataclass
 from typing import Dict, List, Mapping, Optional, Sequence
 import random
 
+from windsurf.tools.mindmap import MindmapStructure, render_node
+
 from .config import (
-    ALLOWED_CHILD_VECTORS,
     MAX_TOTAL_NODES,
+    feasible_child_vectors,
     get_card_context,
     get_max_children_per_label,
 )
@@ -20,12 +22,11 @@ class DiagramCandidate:
     children: Dict[str, List[str]]
 
     def to_mermaid(self) -> str:
-        context = get_card_context()
-        lines = ["```mermaid", "mindmap", f"  root(({context.root_label}))"]
+        lines = ["```mermaid", "mindmap", f"  {_root_node()}"]
         for label in self.labels:
-            lines.append(f"    {label}")
+            lines.append(f"    {render_node(label)}")
             for child in self.children.get(label, []):
-                lines.append(f"      {child}")
+                lines.append(f"      {render_node(child)}")
         lines.append("```")
         return "\n".join(lines)
 
@@ -37,13 +38,29 @@ class DiagramCandidate:
     def child_vector(self) -> List[int]:
         return [len(self.children.get(label, [])) for label in self.labels]
 
+    def structure(self) -> MindmapStructure:
+        """Return the mindmap structure ``to_mermaid`` would render."""
+        children = {
+            label: [render_node(child) for child in self.children.get(label, [])]
+            for label in self.labels
+        }
+        return MindmapStructure.from_branches(_root_node(), self.labels, children)
+
+
+def _root_node() -> str:
+    # Root labels come from the card (front or file name) and may hold "(Vic)".
+    return "root" + render_node(get_card_context().root_label, "((", "))")
+
 
 def _weighted_vector_choice(weight_map: Optional[Mapping[str, float]]) -> Sequence[int]:
     context = get_card_context()
     section_labels = context.section_labels
     max_children_map = get_max_children_per_label()
+    vectors = feasible_child_vectors(context)
+    if not vectors:
+        raise RuntimeError("No allowed child vector fits this card's item pools")
     if not weight_map:
-        return random.choice(ALLOWED_CHILD_VECTORS)
+        return random.choice(vectors)
 
     # Normalise weights and derive a simple target profile per label (0..1)
     total = sum(weight_map.get(label, 1.0) for label in section_labels)
@@ -58,7 +75,7 @@ def _weighted_vector_choice(weight_map: Optional[Mapping[str, float]]) -> Sequen
         # smaller is better
         return sum(distances)
 
-    best_vector = min(ALLOWED_CHILD_VECTORS, key=vector_distance)
+    best_vector = min(vectors, key=vector_distance)
     return best_vector
 
 
@@ -69,13 +86,8 @@ def sample_children(label: str, count: int) -> List[str]:
         return []
     if not pool:
         return []
-    if len(pool) >= count:
-        return random.sample(pool, count)
-    # Repeat pool items to satisfy required count while preserving order variety
-    repeats: List[str] = []
-    while len(repeats) < count:
-        repeats.extend(random.sample(pool, len(pool)) if len(pool) > 1 else pool)
-    return repeats[:count]
+    # Never repeat a leaf: a short pool yields a short (invalid) branch.
+    return random.sample(pool, min(count, len(pool)))
 
 
 def generate_candidate(
@@ -7,7 +7,7 @@ from typing import Dict
 
 import numpy as np
 
-from .config import KEY_ITEM_PRIORITY, SECTION_LABELS
+from .config import get_card_context
 from .diagram_generator import DiagramCandidate
 
 
@@ -19,14 +19,15 @@ class Metrics:
 
 
 def compute_metrics(candidate: DiagramCandidate) -> Metrics:
+    context = get_card_context()
     child_counts = candidate.child_vector()
     active_sections = sum(1 for count in child_counts if count > 0)
-    coverage = active_sections / len(SECTION_LABELS)
+    coverage = active_sections / len(context.section_labels)
 
     priority_total = 0.0
     max_total = 0.0
     for label, children in candidate.children.items():
-        priorities = KEY_ITEM_PRIORITY.get(label, {})
+        priorities = context.key_item_priority.get(label, {})
         for child in children:
             priority_total += priorities.get(child, 0.6)
         # assume selecting highest priority items is best possible baseline
@@ -0,0 +1,105 @@
+"""Exact solver for the diagram selection problem.
+
+For a fixed child vector, coverage and balance depend only on the vector, and
+the priority score is ``sum(chosen priorities) / best possible sum`` where the
+denominator also depends only on the vector.  The objective therefore
+separates by label: the best candidate for a vector takes the highest
+priority distinct items of each label's pool.  A vector asking a label for
+more children than its pool holds is skipped, never filled by repeating
+items.  Enumerating the allowed vectors with those children yields the
+provably best candidate in ``O(vectors * pool log pool)``, deterministically.
+
+Monte Carlo (``batch_search``) stays available for experimenting with
+objectives that do not separate this way.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .config import (
+    CardContext,
+    feasible_child_vectors,
+    get_card_context,
+    use_card_context,
+)
+from .diagram_generator import DiagramCandidate, _weighted_vector_choice
+from .evaluation import compute_metrics, score_candidate
+from .policy_validator import validate_candidate
+
+DEFAULT_PRIORITY = 0.6
+
+
+def _best_children(
+    pool: Sequence[str], priorities: Mapping[str, float], count: int
+) -> Optional[List[str]]:
+    """The ``count`` highest priority distinct items, or ``None`` if too few."""
+
+    if count <= 0:
+        return []
+    ranked = sorted(
+        dict.fromkeys(pool), key=lambda item: -priorities.get(item, DEFAULT_PRIORITY)
+    )
+    if count > len(ranked):
+        return None
+    return ranked[:count]
+
+
+def _vector_children(
+    context: CardContext, vector: Sequence[int]
+) -> Optional[Dict[str, List[str]]]:
+    children: Dict[str, List[str]] = {}
+    for label, count in zip(context.section_labels, vector):
+        picks = _best_children(
+            context.section_content.get(label, []),
+            context.key_item_priority.get(label, {}),
+            count,
+        )
+        if picks is None:
+            return None
+        children[label] = picks
+    return children
+
+
+def _candidate_vectors(
+    section_weights: Optional[Mapping[str, float]],
+) -> List[List[int]]:
+    # ``generate_candidate`` commits to a single vector when section weights
+    # are supplied; keep the same search space so both engines agree.
+    if section_weights:
+        return [list(_weighted_vector_choice(section_weights))]
+    return feasible_child_vectors()
+
+
+def solve_exact(
+    section_weights: Optional[Mapping[str, float]],
+    score_weights: Mapping[str, float],
+    context: Optional[CardContext] = None,
+) -> Tuple[DiagramCandidate, float]:
+    """Return the best valid candidate and its score."""
+
+    context = context or get_card_context()
+    with use_card_context(context):
+        return _solve(context, section_weights, score_weights)
+
+
+def _solve(
+    context: CardContext,
+    section_weights: Optional[Mapping[str, float]],
+    score_weights: Mapping[str, float],
+) -> Tuple[DiagramCandidate, float]:
+    best: Optional[DiagramCandidate] = None
+    best_score = float("-inf")
+    for vector in _candidate_vectors(section_weights):
+        children = _vector_children(context, vector)
+        if children is None:
+            continue
+        candidate = DiagramCandidate(labels=context.section_labels, children=children)
+        if not validate_candidate(candidate).valid:
+            continue
+        score = score_candidate(compute_metrics(candidate), dict(score_weights))
+        if score > best_score:
+            best, best_score = candidate, score
+    if best is None:
+        raise RuntimeError("No valid diagram exists within constraints")
+    return best, best_score
@@ -1,17 +1,21 @@
-"""Optimise the diagram for 0004-causation-s51-factual-vs-scope.yml."""
+"""Optimise a card diagram (0004-causation-s51-factual-vs-scope.yml by default)."""
 
 from __future__ import annotations
 
 import argparse
 import json
+from pathlib import Path
 from typing import Dict, Optional
 
 import yaml
 
-from .config import CARD_PATH
+from .batch_search import optimise_diagram_batched
+from .card_context import load_card_context
+from .config import CARD_PATH, get_card_context, set_card_context
 from .diagram_generator import DiagramCandidate, generate_candidate
 from .evaluation import compute_metrics, score_candidate
-from .policy_validator import validate_diagram
+from .exact_search import solve_exact
+from .policy_validator import validate_candidate, validate_diagram
 from .score_optimizer import load_score_weights, optimise_score_weights
 from .weight_optimizer import load_weights, optimise_weights
 
@@ -22,7 +26,7 @@ def _maybe_optimise_section_weights(
     if force:
         return optimise_weights(max_iterations=max_iterations)
     try:
-        return load_weights(force_recalculate=False)
+        return load_weights(force_recalculate=False, max_iterations=max_iterations)
     except Exception:
         return optimise_weights(max_iterations=max_iterations)
 
@@ -50,7 +54,28 @@ def optimise_diagram(
     section_weights: Dict[str, float],
     score_weights: Dict[str, float],
     seed: Optional[int] = None,
+    engine: str = "exact",
 ) -> DiagramCandidate:
+    """Return the best diagram candidate.
+
+    ``engine="exact"`` (the default) enumerates the allowed child vectors with
+    the highest priority children and ignores ``iterations`` and ``seed``.
+    The Monte Carlo engines sample ``iterations`` random candidates:
+    ``"batch"`` scores them with NumPy arrays and renders Mermaid only for the
+    winner; ``"loop"`` is the original one-candidate-at-a-time search, kept
+    as a reference implementation.
+    """
+
+    if engine == "exact":
+        candidate, _ = solve_exact(section_weights, score_weights)
+        return candidate
+    if engine == "batch":
+        return optimise_diagram_batched(
+            iterations, section_weights, score_weights, seed=seed
+        )
+    if engine != "loop":
+        raise ValueError(f"Unknown engine: {engine}")
+
     if seed is not None:
         import random
 
@@ -60,9 +85,7 @@ def optimise_diagram(
     best_score = float("-inf")
     for _ in range(iterations):
         candidate = generate_candidate(section_weights)
-        diagram = candidate.to_mermaid()
-        validation = validate_diagram(diagram)
-        if not validation.valid:
+        if not validate_candidate(candidate).valid:
             continue
         metrics = compute_metrics(candidate)
         score = score_candidate(metrics, score_weights)
@@ -74,10 +97,18 @@ def optimise_diagram(
     return best_candidate
 
 
-def update_card(diagram_text: str) -> None:
-    data = yaml.safe_load(CARD_PATH.read_text(encoding="utf-8"))
+def update_card(diagram_text: str, card_path: Optional[Path] = None) -> None:
+    """Write ``diagram_text`` into the card after validating the rendered text."""
+
+    validation = validate_diagram(diagram_text)
+    if not validation.valid:
+        raise ValueError(
+            "Refusing to write invalid diagram: " + "; ".join(validation.errors)
+        )
+    card_path = card_path or get_card_context().card_path or CARD_PATH
+    data = yaml.safe_load(card_path.read_text(encoding="utf-8"))
     data["diagram"] = diagram_text
-    CARD_PATH.write_text(
+    card_path.write_text(
         yaml.safe_dump(
             data,
             sort_keys=False,
@@ -89,9 +120,17 @@ def update_card(diagram_text: str) -> None:
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Optimise the causation diagram")
+    parser = argparse.ArgumentParser(description="Optimise a card diagram")
+    parser.add_argument(
+        "--card",
+        type=Path,
+        help="Card YAML to optimise (default: the built-in causation card)",
+    )
     parser.add_argument(
-        "--iterations", type=int, default=2000, help="Monte Carlo iterations"
+        "--iterations",
+        type=int,
+        default=2000,
+        help="Monte Carlo iterations (batch/loop engines)",
     )
     parser.add_argument(
         "--force-section-weights",
@@ -102,6 +141,12 @@ def main() -> None:
         "--force-score-weights", action="store_true", help="Re-optimise scoring weights"
     )
     parser.add_argument("--seed", type=int, help="Deterministic random seed")
+    parser.add_argument(
+        "--engine",
+        choices=["exact", "batch", "loop"],
+        default="exact",
+        help="Exact solver, vectorised Monte Carlo or the reference loop",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -115,6 +160,9 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    if args.card is not None:
+        set_card_context(load_card_context(args.card))
+
     section_weights = _maybe_optimise_section_weights(
         args.force_section_weights,
         args.max_weight_iters,
@@ -126,6 +174,7 @@ def main() -> None:
         section_weights=section_weights,
         score_weights=score_weights,
         seed=args.seed,
+        engine=args.engine,
     )
 
     diagram_text = candidate.to_mermaid()
@@ -1,4 +1,11 @@
-"""Validate mindmap diagrams against cards policy constraints."""
+"""Validate mindmap diagrams against cards policy constraints.
+
+``validate_candidate`` checks a ``DiagramCandidate`` structurally and is what
+the optimisers use per candidate.  ``validate_diagram`` parses Mermaid text
+into the same structure and is meant for write time, where the rendered text
+is what ends up in the card.  Both apply ``windsurf.tools.mindmap``'s checks,
+which ``SchemaValidator`` shares.
+"""
 
 from __future__ import annotations
 
@@ -6,12 +13,15 @@ from dataclasses import dataclass
 from typing import List
 import re
 
+from windsurf.tools.mindmap import MindmapStructure, parse_mindmap, structure_errors
+
 from .config import (
     ALLOWED_CHILD_VECTORS,
     MAX_TOTAL_NODES,
-    SECTION_LABELS,
     TOP_LEVEL_BRANCHES,
+    get_card_context,
 )
+from .diagram_generator import DiagramCandidate
 
 
 @dataclass
@@ -27,6 +37,28 @@ def _extract_lines(diagram: str) -> List[str]:
     return [line.rstrip() for line in diagram.strip().splitlines() if line.strip()]
 
 
+def _structure_errors(structure: MindmapStructure) -> List[str]:
+    # MAX_TOTAL_NODES counts children only; branch labels are fixed by policy.
+    errors = structure_errors(
+        structure,
+        max_child_nodes=MAX_TOTAL_NODES,
+        min_branches=TOP_LEVEL_BRANCHES,
+        max_branches=TOP_LEVEL_BRANCHES,
+        expected_branches=get_card_context().section_labels,
+        allowed_child_vectors=ALLOWED_CHILD_VECTORS,
+    )
+    leaves = [kid for kids in structure.children for kid in kids]
+    repeated = sorted({leaf for leaf in leaves if leaves.count(leaf) > 1})
+    if repeated:
+        errors.append(f"Mindmap repeats child nodes: {', '.join(repeated)}")
+    return errors
+
+
+def validate_candidate(candidate: DiagramCandidate) -> ValidationResult:
+    errors = _structure_errors(candidate.structure())
+    return ValidationResult(valid=not errors, errors=errors)
+
+
 def validate_diagram(diagram: str) -> ValidationResult:
     errors: List[str] = []
     lines = _extract_lines(diagram)
@@ -37,47 +69,8 @@ def validate_diagram(diagram: str) -> ValidationResult:
     if not MERMAID_HEADER_RE.match(lines[0]):
         errors.append("Diagram must start with ```mermaid")
 
-    # Identify top-level and child lines by indentation
-    top_level = [
-        line
-        for line in lines
-        if line.startswith("    ") and not line.startswith("      ")
-    ]
-    if len(top_level) != TOP_LEVEL_BRANCHES:
-        errors.append(
-            f"Top level branches {len(top_level)} does not match required {TOP_LEVEL_BRANCHES}"
-        )
-
-    # Ensure top-level labels match SECTION_LABELS order
-    if len(top_level) == TOP_LEVEL_BRANCHES:
-        for expected, actual in zip(SECTION_LABELS, top_level):
-            label = actual.strip()
-            if label != expected:
-                errors.append(f"Top-level branch '{label}' should be '{expected}'")
-
-    child_lines = [line for line in lines if line.startswith("      ")]
-    node_count = len(child_lines)
-    if node_count > MAX_TOTAL_NODES:
-        errors.append(f"Leaf node count {node_count} exceeds maximum {MAX_TOTAL_NODES}")
-
-    # Check distribution matches allowed vectors
-    if len(top_level) == TOP_LEVEL_BRANCHES:
-        for _ in top_level:
-            pass
-            # gather child lines following this label until next top-level
-        index_lookup = {label.strip(): idx for idx, label in enumerate(top_level)}
-        child_vector: List[int] = [0] * TOP_LEVEL_BRANCHES
-        current_label: str | None = None
-        for line in lines:
-            if line in top_level:
-                current_label = line.strip()
-            elif line.startswith("      ") and current_label is not None:
-                idx = index_lookup[current_label]
-                child_vector[idx] += 1
-
-        if child_vector and child_vector not in ALLOWED_CHILD_VECTORS:
-            errors.append(
-                f"Child vector {child_vector} not in allowed sets {ALLOWED_CHILD_VECTORS}"
-            )
-
+    body = [line for line in lines[1:] if not line.strip().startswith("```")]
+    if body and body[0].strip().lower().startswith("mindmap"):
+        body = body[1:]
+    errors.extend(_structure_errors(parse_mindmap(body)))
     return ValidationResult(valid=not errors, errors=errors)
@@ -3,18 +3,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict
 import json
 
 import numpy as np
 from scipy.optimize import differential_evolution
 
+from .batch_search import BatchDiagramSearch
 from .config import (
+    DEFAULT_CARD_CONTEXT,
     DEFAULT_SCORE_WEIGHTS,
-    KEY_ITEM_PRIORITY,
     SCORE_CACHE,
+    cache_path,
+    context_fingerprint,
 )
-from .diagram_generator import DiagramCandidate, generate_candidate
+
+DEFAULT_SAMPLE_SIZE = 200
+DEFAULT_SEED = 0
 
 
 @dataclass
@@ -50,57 +56,56 @@ class ScoreWeights:
         )
 
 
-def _candidate_metrics(candidate: DiagramCandidate) -> Tuple[float, float, float]:
-    """Return coverage, priority, balance metrics for a candidate."""
-    child_counts = candidate.child_vector()
-    top_level = sum(1 for count in child_counts if count > 0)
-    coverage = top_level / len(child_counts)
+def sample_candidate_metrics(
+    sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = DEFAULT_SEED
+) -> np.ndarray:
+    """Return coverage/priority/balance for a fixed sample of random candidates.
 
-    # Priority: sum priorities across selected children
-    priority_total = 0.0
-    max_total = 0.0
-    for label, children in candidate.children.items():
-        priorities = KEY_ITEM_PRIORITY.get(label, {})
-        priority_total += sum(priorities.get(child, 0.6) for child in children)
-        max_total += sum(sorted(priorities.values(), reverse=True)[: len(children)])
-    priority_score = 0.0
-    if max_total > 0:
-        priority_score = priority_total / max_total
+    The sample is drawn once per optimisation and reused for every objective
+    evaluation (common random numbers), so the objective is deterministic and
+    differences between weight vectors are not swamped by sampling noise.
+    """
 
-    # Balance: prefer even distribution (lower std)
-    if len(child_counts) > 1:
-        std = float(np.std(child_counts))
-        # normalise by max possible std (~max children)
-        balance = 1.0 / (1.0 + std)
-    else:
-        balance = 1.0
+    search = BatchDiagramSearch()
+    _, _, metrics, _ = search.sample_metrics(np.random.default_rng(seed), sample_size)
+    return metrics
 
-    return coverage, priority_score, balance
 
+def _evaluate(weights: np.ndarray, metrics: np.ndarray) -> np.ndarray:
+    """Return the negated robustness score for one or many weight vectors.
 
-def _evaluate(weights: np.ndarray, sample_size: int = 200) -> float:
+    ``weights`` has shape ``(3,)`` or ``(3, S)`` for a whole population.
+    """
     weights = np.maximum(weights, 1e-6)
-    weights = weights / weights.sum()
-
-    samples: List[DiagramCandidate] = [generate_candidate() for _ in range(sample_size)]
-    scores: List[float] = []
-    for candidate in samples:
-        coverage, priority_score, balance = _candidate_metrics(candidate)
-        score = (
-            weights[0] * coverage + weights[1] * priority_score + weights[2] * balance
-        )
-        scores.append(score)
+    weights = weights / weights.sum(axis=0)
+    scores = metrics @ weights
 
     # Try to maximise the worst-case (min) score for robustness
-    worst_case = min(scores)
-    average = sum(scores) / len(scores)
+    worst_case = scores.min(axis=0)
+    average = scores.mean(axis=0)
     combined = (worst_case * 0.6) + (average * 0.4)
     return -combined
 
 
-def optimise_score_weights() -> ScoreWeights:
+def _cache_file(sample_size: int, seed: int) -> Path:
+    return cache_path("score_weights", sample_size=sample_size, seed=seed)
+
+
+def optimise_score_weights(
+    sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = DEFAULT_SEED
+) -> ScoreWeights:
+    metrics = sample_candidate_metrics(sample_size, seed)
     bounds = [(0.1, 2.0)] * 3
-    result = differential_evolution(_evaluate, bounds, maxiter=150, tol=1e-6)
+    result = differential_evolution(
+        _evaluate,
+        bounds,
+        args=(metrics,),
+        maxiter=150,
+        tol=1e-6,
+        seed=seed,
+        vectorized=True,
+        updating="deferred",
+    )
     weights = np.maximum(result.x, 1e-6)
     weights = weights / weights.sum()
     optimised = ScoreWeights(
@@ -109,13 +114,19 @@ def optimise_score_weights() -> ScoreWeights:
         balance=float(weights[2]),
     )
 
-    # Cache to disk
-    SCORE_CACHE.write_text(json.dumps(optimised.to_dict(), indent=2))
+    # Cache to disk, keyed by card context and sampling settings
+    _cache_file(sample_size, seed).write_text(json.dumps(optimised.to_dict(), indent=2))
     return optimised
 
 
-def load_score_weights() -> ScoreWeights:
-    if SCORE_CACHE.exists():
-        data = json.loads(SCORE_CACHE.read_text())
-        return ScoreWeights.from_dict(data)
+def load_score_weights(
+    sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = DEFAULT_SEED
+) -> ScoreWeights:
+    paths = [_cache_file(sample_size, seed)]
+    if context_fingerprint() == context_fingerprint(DEFAULT_CARD_CONTEXT):
+        paths.append(SCORE_CACHE)
+    for path in paths:
+        if path.exists():
+            data = json.loads(path.read_text())
+            return ScoreWeights.from_dict(data)
     return ScoreWeights.from_dict(DEFAULT_SCORE_WEIGHTS)
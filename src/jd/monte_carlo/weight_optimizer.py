@@ -2,54 +2,104 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict
 import json
 
 import numpy as np
 from scipy.optimize import differential_evolution
 
 from .config import (
+    DEFAULT_CARD_CONTEXT,
     DEFAULT_SECTION_WEIGHTS,
-    SECTION_CONTENT,
-    SECTION_LABELS,
     WEIGHT_CACHE,
+    cache_path,
+    context_fingerprint,
+    get_card_context,
 )
 
+DEFAULT_SEED = 0
+DEFAULT_MAX_ITERATIONS = 150
 
-def _evaluate(weights: np.ndarray) -> float:
-    """Return negative fitness (differential_evolution minimises)."""
+
+def _evaluate(weights: np.ndarray, richness: np.ndarray) -> np.ndarray:
+    """Return negative fitness (differential_evolution minimises).
+
+    ``weights`` is either one parameter vector of shape ``(labels,)`` or a
+    whole population of shape ``(labels, S)``; the result has shape ``()`` or
+    ``(S,)`` accordingly.
+    """
     weights = np.maximum(weights, 1e-6)
-    weights = weights / weights.sum()
+    weights = weights / weights.sum(axis=0)
 
     # Encourage coverage by rewarding inclusion of richer sections
-    richness: List[int] = [len(SECTION_CONTENT[label]) for label in SECTION_LABELS]
-    coverage_score = float(np.dot(weights, richness))
+    coverage_score = richness @ weights
 
     # Encourage balance (penalise high variance)
-    balance_penalty = np.var(weights)
+    balance_penalty = np.var(weights, axis=0)
 
     # Multi-objective combination: higher is better so subtract penalty
     fitness = coverage_score - (balance_penalty * 2.5)
     return -fitness
 
 
-def optimise_weights(max_iterations: int = 150) -> Dict[str, float]:
-    bounds = [(0.1, 1.0)] * len(SECTION_LABELS)
-    result = differential_evolution(_evaluate, bounds, maxiter=max_iterations, tol=1e-6)
+def _cache_file(max_iterations: int, seed: int) -> Path:
+    return cache_path("weights", max_iterations=max_iterations, seed=seed)
+
+
+def optimise_weights(
+    max_iterations: int = DEFAULT_MAX_ITERATIONS, seed: int = DEFAULT_SEED
+) -> Dict[str, float]:
+    context = get_card_context()
+    section_labels = context.section_labels
+    richness = np.array(
+        [len(context.section_content.get(label, [])) for label in section_labels],
+        dtype=float,
+    )
+    bounds = [(0.1, 1.0)] * len(section_labels)
+    result = differential_evolution(
+        _evaluate,
+        bounds,
+        args=(richness,),
+        maxiter=max_iterations,
+        tol=1e-6,
+        seed=seed,
+        vectorized=True,
+        updating="deferred",
+    )
     raw = np.maximum(result.x, 1e-6)
     raw /= raw.sum()
-    weights = {label: float(weight) for label, weight in zip(SECTION_LABELS, raw)}
-    WEIGHT_CACHE.write_text(json.dumps(weights, indent=2))
+    weights = {label: float(weight) for label, weight in zip(section_labels, raw)}
+    _cache_file(max_iterations, seed).write_text(json.dumps(weights, indent=2))
     return weights
 
 
-def load_weights(force_recalculate: bool = False) -> Dict[str, float]:
-    if not force_recalculate and WEIGHT_CACHE.exists():
-        try:
-            return json.loads(WEIGHT_CACHE.read_text())
-        except json.JSONDecodeError:
-            pass
-    return optimise_weights()
+def _read_cache(path: Path) -> Dict[str, float] | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return None
+
+
+def load_weights(
+    force_recalculate: bool = False,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, float]:
+    if not force_recalculate:
+        cached = _read_cache(_cache_file(max_iterations, seed))
+        # The unkeyed legacy file only holds the default run's weights.
+        if (
+            cached is None
+            and (max_iterations, seed) == (DEFAULT_MAX_ITERATIONS, DEFAULT_SEED)
+            and context_fingerprint() == context_fingerprint(DEFAULT_CARD_CONTEXT)
+        ):
+            cached = _read_cache(WEIGHT_CACHE)
+        if cached is not None:
+            return cached
+    return optimise_weights(max_iterations=max_iterations, seed=seed)
 
 
 def default_weights() -> Dict[str, float]:
@@ -3,50 +3,56 @@
 To use ``verify_once``:
 * install ``openai`` (``pip install openai``)
 * export ``OPENAI_API_KEY`` in your environment
+
+or set ``WINDSURF_LLM_BACKEND=fake`` to run offline against the fake backend.
 """
 
 from __future__ import annotations
 
 import json
-import os
 from typing import Any, Dict
 
-try:  # pragma: no cover - optional dependency in some envs.
-    from openai import OpenAI
-except Exception:  # pragma: no cover - allow script to run without the package.
-    OpenAI = None  # type: ignore
-
 from windsurf.tools.legal_pinpoint_pipeline import (
     CaseSearchClient,
     LegalDocumentFetcher,
-    build_pinpoint_prompt,
+    pack_pinpoint_prompt,
     slice_candidate_paragraphs,
 )
+from windsurf.llm import get_client
+from windsurf.telemetry import report_run
+
+PROMPT_TOKEN_BUDGET = 1500
+KEYWORDS = ["volenti", "duty", "risk"]
 
 
-def _format_response(raw_content: str) -> Dict[str, Any]:
+def _format_response(raw_content: str, prompt_tokens: int) -> Dict[str, Any]:
     """Return a structured dictionary for easier inspection."""
 
-    return {"status": "OK", "raw": raw_content}
+    return {
+        "status": "OK",
+        "raw": raw_content,
+        "estimated_prompt_tokens": prompt_tokens,
+    }
 
 
-def verify_once(query: str, case_name: str, proposition: str) -> Dict[str, Any]:
-    """Execute the happy-path verification described in the user brief."""
+def verify_once(
+    query: str,
+    case_name: str,
+    proposition: str,
+    target_para: str | None = None,
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+) -> Dict[str, Any]:
+    """Execute the happy-path verification described in the user brief.
 
-    if OpenAI is None:
-        return {
-            "status": "NO_VERIFIED_AUTHORITY_FOUND",
-            "reason": "The 'openai' package is not installed.",
-        }
+    The prompt is packed to at most ``token_budget`` estimated tokens, keeping
+    ``target_para`` (when given) whole and trimming neighbouring paragraphs.
+    """
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return {
-            "status": "NO_VERIFIED_AUTHORITY_FOUND",
-            "reason": "OPENAI_API_KEY environment variable is required.",
-        }
+    client = get_client()
+    reason = client.unavailable_reason()
+    if reason:
+        return {"status": "NO_VERIFIED_AUTHORITY_FOUND", "reason": reason}
 
-    client = OpenAI()
     urls = CaseSearchClient().search_cases(query)
     if not urls:
         return {
@@ -57,7 +63,7 @@ def verify_once(query: str, case_name: str, proposition: str) -> Dict[str, Any]:
     paragraphs = LegalDocumentFetcher().fetch_and_normalise(urls[0])
     candidates = slice_candidate_paragraphs(
         paragraphs,
-        keywords=["volenti", "duty", "risk"],
+        keywords=KEYWORDS,
         window=2,
         max_total=6,
     )
@@ -67,13 +73,21 @@ def verify_once(query: str, case_name: str, proposition: str) -> Dict[str, Any]:
             "reason": "No paragraphs parsed.",
         }
 
-    prompt = build_pinpoint_prompt(candidates, case_name, proposition)
-    response = client.chat.completions.create(
+    packed = pack_pinpoint_prompt(
+        candidates,
+        case_name,
+        proposition,
+        token_budget=token_budget,
+        target_para=target_para,
+        keywords=KEYWORDS,
+    )
+    content = client.complete(
+        [{"role": "user", "content": packed.prompt}],
+        tool="app_verify",
         model="gpt-5",
         temperature=0,
-        messages=[{"role": "user", "content": prompt}],
     )
-    return _format_response(response.choices[0].message.content)
+    return _format_response(content, packed.estimated_tokens)
 
 
 if __name__ == "__main__":
@@ -83,3 +97,4 @@ if __name__ == "__main__":
         "Volenti acceptance test",
     )
     print(json.dumps(output, ensure_ascii=False, indent=2))
+    report_run()
@@ -0,0 +1,268 @@
+"""Content-addressed backups of card files, shared by every tool that edits cards.
+
+A ``BackupStore`` keeps each distinct file content once, as a blob named by
+its SHA-256 under ``<root>/objects/ab/cdef...``, and one JSON Lines manifest
+per run under ``<root>/runs/<run>.jsonl``::
+
+    {"path": "src/jd/cards_yaml/0001-....yml", "blob": "ab12...", "size": 5120,
+     "time": "2026-10-18T09:30:00Z"}
+
+Backing up a card whose bytes are already stored only appends a manifest
+line, so backup I/O and disk use grow with changed bytes rather than with
+the deck.  New blobs are cloned with a reflink where the filesystem supports
+it (copy-on-write, no data copied) and copied otherwise.  ``link="hardlink"``
+shares the card's inode instead; only use it when every writer replaces
+files atomically (``write_atomic``), since an in-place edit of the card
+would change the blob too.
+
+Retention works by manifest: ``prune(retain)`` keeps the newest runs and
+deletes blobs no remaining manifest refers to.  ``restore(run)`` puts every
+file back as it was before its first backup in that run, after backing up
+the current contents under a ``restore-...`` run so it can be undone.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from windsurf.paths import REPO_ROOT
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+def _utc_now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def run_id(prefix: str = "") -> str:
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return f"{prefix}{stamp}"
+
+
+def write_atomic(path: Path, data: bytes | str, encoding: str = "utf-8") -> None:
+    """Replace ``path`` with ``data`` via a temporary file and ``os.replace``."""
+
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - not on POSIX
+        return False
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(destination)
+        except FileNotFoundError:
+            pass
+        return False
+
+
+@dataclass(frozen=True)
+class BackupEntry:
+    path: str
+    blob: str
+    size: int
+    time: str
+
+
+class BackupStore:
+    """Blob store plus per-run manifests (see module docstring)."""
+
+    def __init__(self, root: Path, base: Path = REPO_ROOT, link: str = "auto") -> None:
+        if link not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link}")
+        self.root = Path(root)
+        self.base = Path(base)
+        self.link = link
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+        self._recorded: Set[Tuple[str, str, str]] = set()
+
+    # ---------------- Blobs ----------------
+    def blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _store_blob(self, source: Path, data: bytes, digest: str) -> None:
+        blob = self.blob_path(digest)
+        if blob.exists():
+            return
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".{blob.name}.{os.getpid()}.tmp")
+        linked = False
+        if self.link in ("auto", "reflink"):
+            linked = _reflink(source, tmp)
+        elif self.link == "hardlink":
+            try:
+                os.link(source, tmp)
+                linked = True
+            except OSError:
+                linked = False
+        # The source may have changed since it was read; keep what was hashed.
+        if linked and hashlib.sha256(tmp.read_bytes()).hexdigest() != digest:
+            os.unlink(tmp)
+            linked = False
+        if not linked:
+            tmp.write_bytes(data)
+        if not (linked and self.link == "hardlink"):
+            os.chmod(tmp, 0o444)
+        os.replace(tmp, blob)
+
+    def read_blob(self, digest: str) -> bytes:
+        data = self.blob_path(digest).read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup blob {digest} is corrupt")
+        return data
+
+    # ---------------- Manifests ----------------
+    def _relative(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.base.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _resolve(self, stored: str) -> Path:
+        path = Path(stored)
+        return path if path.is_absolute() else self.base / path
+
+    def manifest_path(self, run: str) -> Path:
+        return self.runs_dir / f"{run}.jsonl"
+
+    def add(self, path: Path, run: str) -> BackupEntry:
+        """Record the current contents of ``path`` in ``run``."""
+
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        self._store_blob(Path(path), data, digest)
+        entry = BackupEntry(self._relative(path), digest, len(data), _utc_now())
+        key = (run, entry.path, digest)
+        if key not in self._recorded:
+            self._recorded.add(key)
+            self.runs_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path(run), "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        return entry
+
+    def manifest(self, run: str) -> List[BackupEntry]:
+        path = self.manifest_path(run)
+        if not path.exists():
+            raise FileNotFoundError(f"No backup run named {run!r} in {self.runs_dir}")
+        entries = []
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entries.append(BackupEntry(**json.loads(line)))
+        return entries
+
+    def runs(self) -> List[str]:
+        """Run names, oldest first (by the time of their first entry)."""
+
+        if not self.runs_dir.exists():
+            return []
+
+        def started(path: Path) -> str:
+            with open(path, "r", encoding="utf-8") as fh:
+                first = fh.readline()
+            try:
+                return json.loads(first)["time"]
+            except (ValueError, KeyError):
+                return datetime.utcfromtimestamp(path.stat().st_mtime).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                )
+
+        manifests = sorted(
+            self.runs_dir.glob("*.jsonl"), key=lambda p: (started(p), p.name)
+        )
+        return [path.stem for path in manifests]
+
+    # ---------------- Restore and retention ----------------
+    def restore(
+        self, run: str, paths: Optional[Iterable[Path]] = None, dry_run: bool = False
+    ) -> List[Tuple[Path, bool]]:
+        """Put files back as they were before ``run`` first backed them up.
+
+        Returns ``(path, changed)`` per file; unchanged files are not written.
+        ``paths`` limits the restore to those files.
+        """
+
+        wanted = {self._relative(p) for p in paths} if paths is not None else None
+        first: Dict[str, BackupEntry] = {}
+        for entry in self.manifest(run):
+            if wanted is None or entry.path in wanted:
+                first.setdefault(entry.path, entry)
+
+        undo_run = run_id("restore-")
+        restored: List[Tuple[Path, bool]] = []
+        for stored, entry in first.items():
+            target = self._resolve(stored)
+            data = self.read_blob(entry.blob)
+            changed = not target.exists() or target.read_bytes() != data
+            if changed and not dry_run:
+                if target.exists():
+                    self.add(target, undo_run)
+                write_atomic(target, data)
+            restored.append((target, changed))
+        return restored
+
+    def prune(self, retain: int = 10) -> Dict[str, int]:
+        """Keep the newest ``retain`` runs and drop blobs nothing refers to."""
+
+        runs = self.runs()
+        dropped = runs[:-retain] if retain > 0 else runs
+        for run in dropped:
+            self.manifest_path(run).unlink()
+        live = {entry.blob for run in self.runs() for entry in self.manifest(run)}
+
+        removed = 0
+        freed = 0
+        if self.objects_dir.exists():
+            for blob in self.objects_dir.glob("*/*"):
+                if blob.name.startswith("."):
+                    continue
+                if blob.parent.name + blob.name not in live:
+                    freed += blob.stat().st_size
+                    os.chmod(
+                        blob, 0o644
+                    )  # blobs are read-only; Windows refuses to unlink them
+                    blob.unlink()
+                    removed += 1
+            for fanout in self.objects_dir.iterdir():
+                if fanout.is_dir() and not any(fanout.iterdir()):
+                    fanout.rmdir()
+        self._recorded = {key for key in self._recorded if key[0] not in dropped}
+        return {
+            "runs_removed": len(dropped),
+            "blobs_removed": removed,
+            "bytes_freed": freed,
+        }
+
+
+__all__ = ["BackupEntry", "BackupStore", "run_id", "write_atomic"]
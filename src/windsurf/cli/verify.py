@@ -1,11 +1,272 @@
-﻿from __future__ import annotations
+from __future__ import annotations
+
 import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from windsurf.tools.legal_pinpoint_pipeline import (
+    CaseSearchClient,
+    LegalDocumentFetcher,
+    PagedPdfExtractor,
+    Paragraph,
+    PinpointVerifier,
+    _build_default_session,
+)
+
+FIELD_ALIASES = {
+    "case_name": ("case_name", "case"),
+    "citation": ("citation",),
+    "target_para": ("target_para", "para", "pinpoint"),
+    "proposition": ("proposition", "prop"),
+    "query": ("query",),
+    "source_file": ("source_file", "source-file"),
+    "keywords": ("keywords",),
+}
+
+
+@dataclass
+class VerificationRequest:
+    """One row of the batch input file."""
+
+    index: int
+    case_name: str
+    citation: str
+    target_para: str
+    proposition: str
+    query: str
+    source_file: Optional[str] = None
+    keywords: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, index: int, row: Dict[str, Any]) -> "VerificationRequest":
+        values: Dict[str, Any] = {}
+        for name, aliases in FIELD_ALIASES.items():
+            values[name] = next(
+                (row[alias] for alias in aliases if row.get(alias) not in (None, "")),
+                None,
+            )
+        missing = [
+            name
+            for name in ("case_name", "target_para", "proposition")
+            if not values[name]
+        ]
+        if missing:
+            raise ValueError(f"row {index}: missing {', '.join(missing)}")
+        keywords = values["keywords"] or []
+        if isinstance(keywords, str):
+            keywords = [kw.strip() for kw in keywords.split(";") if kw.strip()]
+        return cls(
+            index=index,
+            case_name=str(values["case_name"]),
+            citation=str(values["citation"] or ""),
+            target_para=str(values["target_para"]),
+            proposition=str(values["proposition"]),
+            query=str(values["query"] or values["case_name"]),
+            source_file=values["source_file"],
+            keywords=list(keywords),
+        )
+
+
+def read_requests(path: Path) -> Iterator[VerificationRequest]:
+    """Yield requests from a JSONL or CSV file (chosen by extension)."""
+
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        if path.suffix.lower() == ".csv":
+            rows: Iterator[Dict[str, Any]] = csv.DictReader(handle)
+        else:
+            rows = (json.loads(line) for line in handle if line.strip())
+        for index, row in enumerate(rows, start=1):
+            yield VerificationRequest.from_row(index, row)
+
+
+class SharedCache:
+    """Thread-safe LRU memo that computes each key once, even under contention.
+
+    At most ``maxsize`` keys are kept; the least recently used is dropped
+    first.  A load that raises or returns an empty result is handed to the
+    callers already waiting on it and then forgotten, so the next call retries.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._loader = loader
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+
+    def __call__(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = Future()
+                self._entries[key] = entry
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+        if owner:
+            try:
+                result = self._loader(key)
+            except BaseException as exc:
+                self._forget(key, entry)
+                entry.set_exception(exc)
+            else:
+                if not result:
+                    self._forget(key, entry)
+                entry.set_result(result)
+        return entry.result()
+
+    def _forget(self, key: str, entry: Future) -> None:
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+
+class BatchVerifier:
+    """Run ``VerificationRequest`` rows through one shared ``PinpointVerifier``."""
+
+    def __init__(self, retriever=None, cache_size: int = 32) -> None:
+        session = _build_default_session()
+        self._retriever = retriever
+        # Rows already run on a thread pool; a process pool per PDF on top of
+        # that would fork from a threaded process, workers x CPUs times.
+        self._document_fetcher = LegalDocumentFetcher(
+            session=session, pdf_extractor=PagedPdfExtractor(workers=1)
+        )
+        self._search = SharedCache(CaseSearchClient(session=session).search_cases)
+        # Judgments are large; keep only the ``cache_size`` most recently used.
+        self._fetch = SharedCache(self._load_document, maxsize=cache_size)
+        self._verifier = PinpointVerifier(
+            searcher=self._search, fetcher=self._fetch, retriever=retriever
+        )
+
+    def _load_document(self, location: str) -> List[Paragraph]:
+        if location.startswith("file://"):
+            return self._document_fetcher.load_file(location[len("file://") :])
+        return self._document_fetcher.fetch_and_normalise(location)
+
+    def run(self, request: VerificationRequest) -> Dict[str, Any]:
+        started = time.perf_counter()
+        record: Dict[str, Any] = {
+            "index": request.index,
+            "case_name": request.case_name,
+            "pinpoint": request.target_para,
+        }
+        try:
+            verifier = self._verifier
+            if request.source_file:
+                location = f"file://{Path(request.source_file).resolve()}"
+                verifier = PinpointVerifier(
+                    searcher=lambda _query: [location],
+                    fetcher=self._fetch,
+                    retriever=self._retriever,
+                )
+            result = verifier.verify(
+                query=request.query,
+                case_name=request.case_name,
+                citation=request.citation,
+                target_para=request.target_para,
+                proposition=request.proposition,
+                keywords=request.keywords,
+            )
+        except Exception as exc:
+            record.update(status="error", error=str(exc), result=None)
+        else:
+            record.update(
+                status="verified" if result else "not_found",
+                result=asdict(result) if result else None,
+            )
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return record
+
+
+def run_batch(
+    requests: List[VerificationRequest],
+    out: TextIO,
+    workers: int = 4,
+    retriever=None,
+) -> Dict[str, int]:
+    """Verify ``requests`` in a thread pool, streaming JSONL records to ``out``."""
+
+    batch = BatchVerifier(retriever=retriever)
+    counts = {"verified": 0, "not_found": 0, "error": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(batch.run, request) for request in requests]
+        for future in as_completed(futures):
+            record = future.result()
+            counts[record["status"]] += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    return counts
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
-        prog="windsurf-verify", description="Verification runner"
+        prog="windsurf-verify",
+        description="Verify pinpoints listed in a JSONL or CSV file",
+    )
+    parser.add_argument(
+        "input",
+        help="JSONL/CSV with case, citation, para, proposition, query, "
+        "optional source_file and keywords (';'-separated in CSV)",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="Path for JSONL results (default: stdout)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent verifications"
+    )
+    parser.add_argument(
+        "--semantic",
+        action="store_true",
+        help="Select candidate paragraphs by semantic similarity (needs NumPy)",
     )
-    parser.parse_args(argv)
-    print("stub OK: wire to verifier")
-    return 0
+    parser.add_argument(
+        "--vector-cache",
+        default=None,
+        help="Directory for cached paragraph vectors (with --semantic)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        requests = list(read_requests(Path(args.input)))
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    retriever = None
+    if args.semantic:
+        from windsurf.tools.paragraph_index import SemanticRetriever
+
+        retriever = SemanticRetriever(cache_dir=args.vector_cache)
+
+    started = time.perf_counter()
+    if args.output == "-":
+        counts = run_batch(requests, sys.stdout, args.workers, retriever)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            counts = run_batch(requests, out, args.workers, retriever)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Verified {counts['verified']}/{len(requests)} "
+        f"(not found {counts['not_found']}, errors {counts['error']}) in {elapsed:0.1f}s",
+        file=sys.stderr,
+    )
+    return 0 if counts["verified"] == len(requests) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 # ruff: noqa: E402
 from windsurf.paths import REPO_ROOT, REPORTS_DIR, JD_CARDS_DIR
+
 #!/usr/bin/env python3
 """Pareto flashcard processor.
 
@@ -8,19 +9,22 @@ and scaffold generation. Designed for your Windsurf repo layout.
 """
 
 import argparse
+import copy
+import fnmatch
 import json
 import re
-import shutil
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Repo layout
 # ---------------------------------------------------------------------------
+from windsurf.backups import BackupStore, run_id, write_atomic
 from windsurf.paths import POLICY_PATH, SRC_ROOT
+from windsurf.profiling import Profiler
 
 # ---------------------------------------------------------------------------
 # Third-party deps
@@ -117,6 +121,7 @@ class Flashcard:
     updated: str = ""
     mnemonic: str = ""
     _raw: Dict = field(default_factory=dict)
+    _loaded: Dict = field(default_factory=dict)
     _errors: List[str] = field(default_factory=list)
     _warnings: List[str] = field(default_factory=list)
 
@@ -133,6 +138,17 @@ class FlashcardProcessor:
         "consideration",
         "intention to create legal relations",
     )
+    PIPELINE_STAGES = ("repair", "edit", "normalize", "validate")
+    PROFILED_STAGES = (
+        "process_card",
+        "run_card",
+        "load_card",
+        "repair_yaml",
+        "apply_curated_edits",
+        "normalize_card",
+        "check_authorities",
+        "save_card",
+    )
 
     def __init__(self, policy_path: Optional[str] = None) -> None:
         self.card_dirs = [d for d in CARD_DIRS if d.exists()]
@@ -145,8 +161,10 @@ class FlashcardProcessor:
         self._schema_validator_error = ""
         self._schema_validator_loaded = False
         self.backup_root = REPO_ROOT / "backups"
+        self._backup_store: Optional[BackupStore] = None
         self._current_backup_run: Optional[str] = None
         self._dry_run = False
+        self.profiler: Optional[Profiler] = None
 
         self._compiled_topic_patterns = {
             topic: [re.compile(pat, re.IGNORECASE) for pat in patterns]
@@ -178,6 +196,8 @@ class FlashcardProcessor:
             self._schema_validator_error = (
                 f"Warning: Failed to load schema validator: {exc}"
             )
+        if self._schema_validator is not None and self.profiler is not None:
+            self._schema_validator.instrument(self.profiler)
         return self._schema_validator
 
     def _add_validator_warning(self, card: Flashcard) -> None:
@@ -187,6 +207,22 @@ class FlashcardProcessor:
         ):
             card._warnings.append(self._schema_validator_error)
 
+    # ---------------- Profiling (opt-in) ----------------
+    def enable_profiling(self, profiler: Profiler) -> None:
+        """Time every stage in ``PROFILED_STAGES`` and every validator check.
+
+        The stage methods are replaced on this instance by timed wrappers,
+        so processors without a profiler pay nothing.
+        """
+
+        if self.profiler is not None:
+            return
+        self.profiler = profiler
+        for stage in self.PROFILED_STAGES:
+            setattr(self, stage, profiler.wrap(f"stage.{stage}", getattr(self, stage)))
+        if self._schema_validator is not None:
+            self._schema_validator.instrument(profiler)
+
     # ---------------- Persistence ----------------
     def load_card(self, path: Path) -> Flashcard:
         try:
@@ -201,6 +237,7 @@ class FlashcardProcessor:
             card.updated = data.get("updated", "") or ""
             card.mnemonic = (data.get("mnemonic") or "").strip()
             card._raw = data
+            card._loaded = copy.deepcopy(data)
             return card
         except Exception as exc:
             card = Flashcard(path=path)
@@ -211,44 +248,31 @@ class FlashcardProcessor:
         self._current_backup_run = backup_run
         self._dry_run = dry_run
 
-    def prune_backups(self, retain: int = 10) -> None:
-        if not self.backup_root.exists():
-            return
-        runs = sorted([p for p in self.backup_root.iterdir() if p.is_dir()])
-        if retain <= 0:
-            for run in runs:
-                shutil.rmtree(run, ignore_errors=True)
-            return
-        for run in runs[:-retain]:
-            shutil.rmtree(run, ignore_errors=True)
+    @property
+    def backup_store(self) -> BackupStore:
+        if self._backup_store is None or self._backup_store.root != self.backup_root:
+            self._backup_store = BackupStore(self.backup_root)
+        return self._backup_store
+
+    def prune_backups(self, retain: int = 10) -> Dict[str, int]:
+        return self.backup_store.prune(retain)
 
     def save_card(self, card: Flashcard, backup: bool = True) -> bool:
         if self._dry_run:
             return False
-        if not card.path.parent.exists():
-            card.path.parent.mkdir(parents=True, exist_ok=True)
-
-        if backup and card.path.exists():
-            run_folder = self._current_backup_run or datetime.utcnow().strftime(
-                "%Y%m%dT%H%M%SZ"
-            )
-            backup_dir = self.backup_root / run_folder
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            timestamp = datetime.utcnow().strftime("%H%M%S")
-            backup_path = (
-                backup_dir / f"{card.path.stem}-{timestamp}{card.path.suffix or '.yml'}"
-            )
-            shutil.copy2(card.path, backup_path)
 
         try:
-            with open(card.path, "w", encoding="utf-8") as fh:
-                yaml.safe_dump(
-                    card._raw,
-                    fh,
-                    default_flow_style=False,
-                    sort_keys=False,
-                    allow_unicode=True,
-                )
+            if backup and card.path.exists():
+                if self._current_backup_run is None:
+                    self._current_backup_run = run_id()
+                self.backup_store.add(card.path, self._current_backup_run)
+            text = yaml.safe_dump(
+                card._raw,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+            )
+            write_atomic(card.path, text)
             return True
         except Exception as exc:
             card._errors.append(f"Failed to save card: {exc}")
@@ -330,9 +354,7 @@ class FlashcardProcessor:
         return missing
 
     # ---------------- Transforms ----------------
-    def normalize_card(self, card: Flashcard) -> None:
-        validator = self._get_schema_validator()
-
+    def _card_document(self, card: Flashcard) -> Dict:
         card_data = dict(card._raw)
         card_data.setdefault("front", card.front)
         card_data.setdefault("back", card.back)
@@ -340,6 +362,14 @@ class FlashcardProcessor:
         card_data.setdefault("created", card.created)
         card_data.setdefault("updated", card.updated)
         card_data.setdefault("template", card._raw.get("template", "concept"))
+        return card_data
+
+    def validate_schema(
+        self, card: Flashcard, card_data: Optional[Dict] = None
+    ) -> None:
+        validator = self._get_schema_validator()
+        if card_data is None:
+            card_data = self._card_document(card)
 
         if validator is not None:
             result = validator.validate_card(card_data)
@@ -351,6 +381,10 @@ class FlashcardProcessor:
         if not card.front:
             card._errors.append("Front text is required")
 
+    def normalize_card(self, card: Flashcard) -> None:
+        card_data = self._card_document(card)
+        self.validate_schema(card, card_data)
+
         # squash whitespace
         card.front = " ".join((card.front or "").split())
         card.back = " ".join((card.back or "").split())
@@ -368,11 +402,6 @@ class FlashcardProcessor:
         if "template" not in card_data:
             card_data["template"] = "concept"
 
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        if not card.created:
-            card.created = timestamp
-        card.updated = timestamp
-
         # push back to raw
         card._raw.update(card_data)
         card._raw["front"] = card.front
@@ -381,6 +410,19 @@ class FlashcardProcessor:
         card._raw["created"] = card.created
         card._raw["updated"] = card.updated
 
+        # Only stamp cards whose content differs from what was loaded, so
+        # re-normalising an unchanged card leaves it byte-for-byte alone.
+        if self.has_changes(card):
+            timestamp = datetime.utcnow().isoformat() + "Z"
+            if not card.created:
+                card.created = card._raw["created"] = timestamp
+            card.updated = card._raw["updated"] = timestamp
+
+    def has_changes(self, card: Flashcard) -> bool:
+        """Whether the card's document differs from the one loaded from disk."""
+
+        return card._raw != card._loaded
+
     def repair_yaml(self, card: Flashcard) -> bool:
         repaired = False
         if "front" not in card._raw:
@@ -401,6 +443,7 @@ class FlashcardProcessor:
             and " v. " not in card.front
         ):
             card.front = card.front.replace(" v ", " v. ")
+            card._raw["front"] = card.front
             edited = True
         return edited
 
@@ -423,6 +466,24 @@ class FlashcardProcessor:
 
     # ---------------- Public interface ----------------
     def process_card(self, path: Path, apply_changes: bool = False) -> Dict:
+        return self.run_card(path, self.PIPELINE_STAGES, apply_changes)
+
+    def run_card(
+        self,
+        path: Path,
+        stages: Iterable[str] = PIPELINE_STAGES,
+        apply_changes: bool = False,
+    ) -> Dict:
+        """Load ``path`` once, apply ``stages`` in pipeline order, save at most once.
+
+        ``result["stages"]`` maps each requested stage to whether it changed
+        the card.  Valid cards whose document still equals the loaded one are
+        not written; they are marked ``result["skipped"]``.  Schema validation
+        runs inside ``normalize`` (before the text is squashed), so
+        ``validate`` only adds it when ``normalize`` is not requested.
+        """
+
+        stages = set(stages)
         card = self.load_card(path)
         if card._errors:
             return {
@@ -430,39 +491,55 @@ class FlashcardProcessor:
                 "status": "error",
                 "errors": card._errors,
                 "warnings": card._warnings,
+                "repairs": False,
+                "edits": False,
                 "valid": False,
+                "stages": {},
             }
 
-        repairs = self.repair_yaml(card)
-        edits = self.apply_curated_edits(card)
-        self.normalize_card(card)
-
-        combined = f"{card.front} {card.back}".strip()
-        content_lower = combined.lower()
-        is_contract = self.is_contract_card(card, content_lower, path.parent)
-
-        missing = self.check_authorities(card, combined, is_contract)
-        card._warnings.extend(missing)
-
-        if is_contract:
-            self._check_contract_requirements(card, content_lower)
+        changes: Dict[str, bool] = {}
+        if "repair" in stages:
+            changes["repair"] = self.repair_yaml(card)
+        if "edit" in stages:
+            changes["edit"] = self.apply_curated_edits(card)
+        if "normalize" in stages:
+            before = dict(card._raw)
+            self.normalize_card(card)
+            changes["normalize"] = card._raw != before
+        if "validate" in stages:
+            if "normalize" not in stages:
+                self.validate_schema(card)
+            combined = f"{card.front} {card.back}".strip()
+            content_lower = combined.lower()
+            is_contract = self.is_contract_card(card, content_lower, path.parent)
+
+            missing = self.check_authorities(card, combined, is_contract)
+            card._warnings.extend(missing)
+
+            if is_contract:
+                self._check_contract_requirements(card, content_lower)
+            changes["validate"] = False
 
         result: Dict[str, object] = {
             "path": str(path),
             "status": "valid" if not card._errors else "invalid",
             "errors": card._errors,
             "warnings": card._warnings,
-            "repairs": repairs,
-            "edits": edits,
+            "repairs": changes.get("repair", False),
+            "edits": changes.get("edit", False),
             "valid": not bool(card._errors),
+            "stages": changes,
         }
 
         if apply_changes and result["valid"]:
-            saved = self.save_card(card)
-            result["saved"] = saved
-            result["status"] = "saved" if saved else "error"
-            if not saved:
-                result["valid"] = False
+            if self.has_changes(card):
+                saved = self.save_card(card)
+                result["saved"] = saved
+                result["status"] = "saved" if saved else "error"
+                if not saved:
+                    result["valid"] = False
+            else:
+                result["skipped"] = True
 
         return result
 
@@ -489,21 +566,45 @@ def _print_result(card_path: Path, result: Dict, verbose: bool = False) -> None:
             print(f"  WARN: {warning}")
 
 
+def _stage_counts(results: List[Dict]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for result in results:
+        for stage, changed in (result.get("stages") or {}).items():
+            counts[stage] = counts.get(stage, 0) + bool(changed)
+    return counts
+
+
+def _write_counts(results: List[Dict]) -> Tuple[int, int]:
+    written = sum(1 for r in results if r.get("saved"))
+    skipped = sum(1 for r in results if r.get("skipped"))
+    return written, skipped
+
+
 def _print_summary(results: List[Dict]) -> None:
     print("\nProcessing complete!")
     print(f"Total cards: {len(results)}")
     print(f"Valid: {sum(1 for r in results if r.get('valid'))}")
     print(f"Errors: {sum(1 for r in results if r.get('errors'))}")
     print(f"Warnings: {sum(1 for r in results if r.get('warnings'))}")
+    counts = _stage_counts(results)
+    if counts:
+        print("Changed by stage: " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+    written, skipped = _write_counts(results)
+    if written or skipped:
+        print(f"Written: {written}, skipped (unchanged): {skipped}")
 
 
 def _write_json_report(results: List[Dict], destination: Path) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
+    written, skipped = _write_counts(results)
     payload = {
         "summary": {
             "processed": len(results),
             "pass": sum(1 for r in results if r.get("valid")),
             "fail": sum(1 for r in results if not r.get("valid")),
+            "changed_by_stage": _stage_counts(results),
+            "written": written,
+            "skipped": skipped,
         },
         "cards": results,
     }
@@ -528,8 +629,13 @@ def _write_markdown_report(results: List[Dict], destination: Path) -> None:
         lines.append(f"- Valid: {'Yes' if item['valid'] else 'No'}")
         lines.append(f"- Repairs: {bool(item.get('repairs'))}")
         lines.append(f"- Edits: {bool(item.get('edits'))}")
+        if item.get("stages"):
+            changed = [stage for stage, flag in item["stages"].items() if flag]
+            lines.append(f"- Changed by: {', '.join(changed) or 'None'}")
         if "saved" in item:
             lines.append(f"- Saved: {bool(item.get('saved'))}")
+        if item.get("skipped"):
+            lines.append("- Skipped: unchanged")
         if item.get("errors"):
             lines.append("- Errors:")
             lines.extend(f"  - {e}" for e in item["errors"])
@@ -547,6 +653,11 @@ def _write_markdown_report(results: List[Dict], destination: Path) -> None:
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
+def _report_path(value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else REPORTS_DIR / path.name
+
+
 def process_cards(
     processor: FlashcardProcessor,
     pattern: str,
@@ -554,35 +665,43 @@ def process_cards(
     verbose: bool = False,
     report_json: Optional[str] = None,
     report_md: Optional[str] = None,
+    profile: Optional[str] = None,
+    profile_top: int = 15,
+    stages: Optional[Iterable[str]] = None,
 ) -> int:
+    stages = tuple(stages or processor.PIPELINE_STAGES)
     cards = processor.find_cards(pattern)
     if not cards:
         print(f"No cards found matching pattern: {pattern}")
         return 1
 
-    print(f"Processing {len(cards)} cards...")
+    profiler: Optional[Profiler] = None
+    if profile:
+        profiler = Profiler()
+        processor.enable_profiling(profiler)
+
+    print(f"Processing {len(cards)} cards ({', '.join(stages)})...")
     results: List[Dict] = []
     for card_path in cards:
-        result = processor.process_card(card_path, apply_changes)
+        result = processor.run_card(card_path, stages, apply_changes)
         results.append(result)
         _print_result(card_path, result, verbose)
 
     _print_summary(results)
 
     if report_json:
-        _write_json_report(
-            results,
-            (
-                (REPORTS_DIR / Path(report_json).name) if not Path(report_json).is_absolute() else Path(report_json)
-            ),
-        )
+        _write_json_report(results, _report_path(report_json))
     if report_md:
-        _write_markdown_report(
-            results,
-            (
-                (REPORTS_DIR / Path(report_md).name) if not Path(report_md).is_absolute() else Path(report_md)
-            ),
+        _write_markdown_report(results, _report_path(report_md))
+    if profiler is not None and profile:
+        profiler.cards = len(cards)
+        destination = _report_path(profile)
+        profiler.write_json(
+            destination, pattern=pattern, apply=apply_changes, stages=list(stages)
         )
+        print(f"\nSlowest stages and checks (of {len(profiler.samples)}):")
+        print(profiler.format_table(profile_top))
+        print(f"Profile written to {destination}")
 
     return 0 if all(r.get("valid") for r in results) else 1
 
@@ -636,7 +755,9 @@ def normalize_cards(
             "edits": False,
             "valid": not bool(card._errors),
         }
-        if apply_changes and result["valid"]:
+        if apply_changes and result["valid"] and not processor.has_changes(card):
+            result["skipped"] = True
+        elif apply_changes and result["valid"]:
             saved = processor.save_card(card)
             result["saved"] = saved
             result["status"] = "saved" if saved else "error"
@@ -725,6 +846,119 @@ def edit_cards(
     )
 
 
+def scaffold_card_data(
+    name: str, card_type: str, policy: Optional[Dict] = None
+) -> Dict[str, object]:
+    """Template document for a new card, one entry per required policy field."""
+
+    policy = policy or {}
+    required_fields: Iterable[str] = policy.get("schema", {}).get(
+        "required_fields", ["front", "back", "tags"]
+    )
+
+    card_data: Dict[str, object] = {}
+    diagram_block = "\n".join(
+        [
+            "```mermaid",
+            "mindmap",
+            f"  REPO_ROOT(({name.strip()} scaffold))",
+            "    Step 1",
+            "    Step 2",
+            "    Step 3",
+            "    Step 4",
+            "```",
+        ]
+    )
+
+    anchors_block = {
+        "cases": [
+            "Placeholder v Placeholder (20XX) 123 CLR 456, 457",
+            "Example Pty Ltd v Sample [2024] VSCA 12 [45]",
+        ],
+        "statutes": [
+            "Wrongs Act 1958 (Vic) s 48",
+            "Wrongs Act 1958 (Vic) s 51",
+        ],
+        "notes": [
+            "Add policy nuance with pinpoint support [para XX].",
+        ],
+    }
+
+    tripwire_list = [
+        "Contractor misclassification vs employee status",
+        'Automatic "in course" assumption without analysis',
+        "Non-delegable duty confusion between categories",
+    ]
+
+    keywords = [
+        "placeholder",
+        "scaffold",
+        "wrongs-act",
+        "analysis",
+        "statutory-hook",
+        "tripwires",
+    ]
+
+    tags = ["MLS_H1"]
+    type_tag = re.sub(r"[^A-Za-z0-9]+", "_", card_type).strip("_")
+    if type_tag:
+        tags.append(type_tag)
+
+    for fld in required_fields:
+        if fld == "front":
+            card_data[fld] = f"{name.strip()}?"
+        elif fld == "back":
+            card_data[fld] = "\n".join(
+                [
+                    "Issue. <State the controversy needing resolution>",
+                    "",
+                    "Rule. <Summarise the governing tests and authorities>",
+                    "",
+                    "Application scaffold. <Lay out the analytical steps>",
+                    "",
+                    "Authorities map.",
+                    "- Placeholder authority v Placeholder (20XX) 123 CLR 456, 457",
+                    "- Example Pty Ltd v Sample [2024] VSCA 12 [45]",
+                    "",
+                    "Statutory hook.",
+                    "- Wrongs Act 1958 (Vic) Pt IV  [add pinpoint]",
+                    "- Wrongs Act 1958 (Vic) Pt VBA [add pinpoint]",
+                    "",
+                    "Tripwires.",
+                    "- Contractor misclassification vs employee status",
+                    '- Automatic "in course" assumption without analysis',
+                    "- Non-delegable duty confusion between categories",
+                    "",
+                    "Conclusion. <Close the loop on the scaffold and relief>",
+                ]
+            )
+        elif fld == "why_it_matters":
+            card_data[fld] = (
+                "Highlight how this scaffold wins time and marks under exam pressure."
+            )
+        elif fld == "mnemonic":
+            card_data[fld] = "Mnemonic to be confirmed"
+        elif fld == "diagram":
+            card_data[fld] = diagram_block
+        elif fld == "tripwires":
+            card_data[fld] = tripwire_list
+        elif fld == "anchors":
+            card_data[fld] = anchors_block
+        elif fld == "keywords":
+            card_data[fld] = keywords
+        elif fld == "reading_level":
+            card_data[fld] = policy.get("reading_level", {}).get(
+                "target", "Plain English (JD)"
+            )
+        elif fld == "tags":
+            card_data[fld] = tags
+        else:
+            card_data.setdefault(fld, "")
+
+    card_data.setdefault("template", "concept")
+    return card_data
+
+
 def scaffold_cards(
     processor: FlashcardProcessor,
     card_type: str,
@@ -739,10 +973,6 @@ def scaffold_cards(
         with open(policy_path, "r", encoding="utf-8") as fh:
             policy = yaml.safe_load(fh) or {}
 
-    required_fields: Iterable[str] = policy.get("schema", {}).get(
-        "required_fields", ["front", "back", "tags"]
-    )
-
     type_path = Path(card_type)
     if not type_path.is_absolute():
         within_jd = REPO_ROOT / "jd" / card_type
@@ -772,106 +1002,7 @@ def scaffold_cards(
         filename = f"{prefix}-{timestamp}-{slug}{suffix}.yml"
         file_path = target_dir / filename
 
-        card_data: Dict[str, object] = {}
-        diagram_block = "\n".join(
-            [
-                "```mermaid",
-                "mindmap",
-                f"  REPO_ROOT(({name.strip()} scaffold))",
-                "    Step 1",
-                "    Step 2",
-                "    Step 3",
-                "    Step 4",
-                "```",
-            ]
-        )
-
-        anchors_block = {
-            "cases": [
-                "Placeholder v Placeholder (20XX) 123 CLR 456, 457",
-                "Example Pty Ltd v Sample [2024] VSCA 12 [45]",
-            ],
-            "statutes": [
-                "Wrongs Act 1958 (Vic) s 48",
-                "Wrongs Act 1958 (Vic) s 51",
-            ],
-            "notes": [
-                "Add policy nuance with pinpoint support [para XX].",
-            ],
-        }
-
-        tripwire_list = [
-            "Contractor misclassification vs employee status",
-            'Automatic "in course" assumption without analysis',
-            "Non-delegable duty confusion between categories",
-        ]
-
-        keywords = [
-            "placeholder",
-            "scaffold",
-            "wrongs-act",
-            "analysis",
-            "statutory-hook",
-            "tripwires",
-        ]
-
-        tags = ["MLS_H1"]
-        type_tag = re.sub(r"[^A-Za-z0-9]+", "_", card_type).strip("_")
-        if type_tag:
-            tags.append(type_tag)
-
-        for fld in required_fields:
-            if fld == "front":
-                card_data[fld] = f"{name.strip()}?"
-            elif field == "back":
-                card_data[fld] = "\n".join(
-                    [
-                        "Issue. <State the controversy needing resolution>",
-                        "",
-                        "Rule. <Summarise the governing tests and authorities>",
-                        "",
-                        "Application scaffold. <Lay out the analytical steps>",
-                        "",
-                        "Authorities map.",
-                        "- Placeholder authority v Placeholder (20XX) 123 CLR 456, 457",
-                        "- Example Pty Ltd v Sample [2024] VSCA 12 [45]",
-                        "",
-                        "Statutory hook.",
-                        "- Wrongs Act 1958 (Vic) Pt IV  [add pinpoint]",
-                        "- Wrongs Act 1958 (Vic) Pt VBA [add pinpoint]",
-                        "",
-                        "Tripwires.",
-                        "- Contractor misclassification vs employee status",
-                        '- Automatic "in course" assumption without analysis',
-                        "- Non-delegable duty confusion between categories",
-                        "",
-                        "Conclusion. <Close the loop on the scaffold and relief>",
-                    ]
-                )
-            elif field == "why_it_matters":
-                card_data[fld] = (
-                    "Highlight how this scaffold wins time and marks under exam pressure."
-                )
-            elif field == "mnemonic":
-                card_data[fld] = "Mnemonic to be confirmed"
-            elif field == "diagram":
-                card_data[fld] = diagram_block
-            elif field == "tripwires":
-                card_data[fld] = tripwire_list
-            elif field == "anchors":
-                card_data[fld] = anchors_block
-            elif field == "keywords":
-                card_data[fld] = keywords
-            elif field == "reading_level":
-                card_data[fld] = policy.get("reading_level", {}).get(
-                    "target", "Plain English (JD)"
-                )
-            elif field == "tags":
-                card_data[fld] = tags
-            else:
-                card_data.setdefault(field, "")
-
-        card_data.setdefault("template", "concept")
+        card_data = scaffold_card_data(name, card_type, policy)
 
         with open(file_path, "w", encoding="utf-8") as fh:
             yaml.safe_dump(card_data, fh, sort_keys=False, allow_unicode=True)
@@ -884,6 +1015,56 @@ def scaffold_cards(
     return 0
 
 
+def restore_cards(
+    processor: FlashcardProcessor,
+    run: Optional[str],
+    pattern: str,
+    apply_changes: bool,
+    verbose: bool,
+) -> int:
+    store = processor.backup_store
+    if not run:
+        runs = store.runs()
+        if not runs:
+            print(f"No backup runs in {store.runs_dir}")
+            return 1
+        print(f"Backup runs in {store.runs_dir} (oldest first):")
+        for name in runs:
+            print(f"  {name}  ({len(store.manifest(name))} file(s))")
+        return 0
+
+    try:
+        entries = store.manifest(run)
+    except FileNotFoundError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    paths = [
+        store.base / entry.path
+        for entry in entries
+        if fnmatch.fnmatch(Path(entry.path).name, pattern)
+    ]
+    restored = store.restore(run, paths, dry_run=not apply_changes)
+    changed = 0
+    for path, differs in restored:
+        changed += differs
+        if differs:
+            print(f"{'RESTORED' if apply_changes else 'WOULD RESTORE'}: {path.name}")
+        elif verbose:
+            print(f"UNCHANGED: {path.name}")
+    verb = "Restored" if apply_changes else "Would restore"
+    print(f"\n{verb} {changed} of {len(restored)} file(s) from run {run}")
+    return 0
+
+
+def prune_backup_runs(processor: FlashcardProcessor, retain: int) -> int:
+    stats = processor.prune_backups(retain)
+    print(
+        f"Removed {stats['runs_removed']} run(s) and {stats['blobs_removed']} "
+        f"blob(s), freed {stats['bytes_freed'] / 1024:.1f} KB"
+    )
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # CLI plumbing
 # ---------------------------------------------------------------------------
@@ -896,6 +1077,20 @@ def process_command(args, processor: FlashcardProcessor) -> int:
             args.verbose,
             args.report_json,
             args.report_md,
+            args.profile,
+            args.profile_top,
+        )
+    if args.command == "run":
+        return process_cards(
+            processor,
+            args.pattern,
+            args.apply,
+            args.verbose,
+            args.report_json,
+            args.report_md,
+            args.profile,
+            args.profile_top,
+            args.stages,
         )
     if args.command == "normalize":
         return normalize_cards(processor, args.pattern, args.apply, args.verbose)
@@ -903,6 +1098,12 @@ def process_command(args, processor: FlashcardProcessor) -> int:
         return repair_cards(processor, args.pattern, args.apply, args.verbose)
     if args.command == "edit":
         return edit_cards(processor, args.pattern, args.apply, args.verbose)
+    if args.command == "restore":
+        return restore_cards(
+            processor, args.run, args.pattern, args.apply, args.verbose
+        )
+    if args.command == "prune-backups":
+        return prune_backup_runs(processor, args.retain)
     if args.command == "scaffold":
         return scaffold_cards(
             processor, args.type, args.name, args.count, args.prefix, args.verbose
@@ -911,6 +1112,47 @@ def process_command(args, processor: FlashcardProcessor) -> int:
     return 1
 
 
+def _parse_stages(value: str) -> List[str]:
+    stages = [stage.strip() for stage in value.split(",") if stage.strip()]
+    unknown = [s for s in stages if s not in FlashcardProcessor.PIPELINE_STAGES]
+    if unknown or not stages:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {', '.join(unknown) or value!r}; choose from "
+            + ",".join(FlashcardProcessor.PIPELINE_STAGES)
+        )
+    return stages
+
+
+def _add_report_arguments(subparser: argparse.ArgumentParser) -> None:
+    subparser.add_argument(
+        "--report-json",
+        nargs="?",
+        const="reports/flashcard_check.json",
+        default=None,
+        help="Write JSON summary report (default path if flag provided)",
+    )
+    subparser.add_argument(
+        "--report-md",
+        nargs="?",
+        const="reports/flashcard_check.md",
+        default=None,
+        help="Write Markdown summary report (default path if flag provided)",
+    )
+    subparser.add_argument(
+        "--profile",
+        nargs="?",
+        const="reports/profile.json",
+        default=None,
+        help="Time each stage and validator check; write JSON (default path if flag provided)",
+    )
+    subparser.add_argument(
+        "--profile-top",
+        type=int,
+        default=15,
+        help="Rows in the printed profile table (default: 15)",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Process flashcards through various stages."
@@ -932,20 +1174,32 @@ def build_parser() -> argparse.ArgumentParser:
     process_parser.add_argument(
         "--verbose", action="store_true", help="Show detailed output"
     )
-    process_parser.add_argument(
-        "--report-json",
-        nargs="?",
-        const="reports/flashcard_check.json",
-        default=None,
-        help="Write JSON summary report (default path if flag provided)",
+    _add_report_arguments(process_parser)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Load each card once, apply the chosen stages and save at most once",
     )
-    process_parser.add_argument(
-        "--report-md",
+    run_parser.add_argument(
+        "pattern",
         nargs="?",
-        const="reports/flashcard_check.md",
-        default=None,
-        help="Write Markdown summary report (default path if flag provided)",
+        default="*.yml",
+        help="File pattern to match (default: *.yml)",
+    )
+    run_parser.add_argument(
+        "--stages",
+        type=_parse_stages,
+        default=list(FlashcardProcessor.PIPELINE_STAGES),
+        help="Comma-separated stages, applied in pipeline order "
+        "(default: repair,edit,normalize,validate)",
+    )
+    run_parser.add_argument(
+        "--apply", action="store_true", help="Apply changes to files"
+    )
+    run_parser.add_argument(
+        "--verbose", action="store_true", help="Show detailed output"
     )
+    _add_report_arguments(run_parser)
 
     norm_parser = subparsers.add_parser(
         "normalize", help="Normalize card content and format"
@@ -995,6 +1249,30 @@ def build_parser() -> argparse.ArgumentParser:
         "--verbose", action="store_true", help="Show detailed output"
     )
 
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore cards from a backup run (lists runs without --run)"
+    )
+    restore_parser.add_argument(
+        "pattern",
+        nargs="?",
+        default="*.yml",
+        help="File name pattern to restore (default: *.yml)",
+    )
+    restore_parser.add_argument("--run", help="Backup run to restore")
+    restore_parser.add_argument(
+        "--apply", action="store_true", help="Write the restored files"
+    )
+    restore_parser.add_argument(
+        "--verbose", action="store_true", help="Show detailed output"
+    )
+
+    prune_parser = subparsers.add_parser(
+        "prune-backups", help="Keep the newest backup runs and drop unused blobs"
+    )
+    prune_parser.add_argument(
+        "--retain", type=int, default=10, help="Runs to keep (default: 10)"
+    )
+
     scaffold_parser = subparsers.add_parser(
         "scaffold", help="Generate new card templates"
     )
@@ -0,0 +1,275 @@
+"""Shared chat-completion client for the model-calling tools.
+
+``get_client()`` returns one ``LLMClient`` per configuration, so every tool
+in a process reuses the same SDK client and its pooled HTTP connections.
+The SDK is imported and the connection pool is created on first use, not at
+import time, so modules that call models stay importable without the
+``openai`` package.  Every call:
+
+* has a timeout (``LLMConfig.timeout`` unless overridden per call);
+* is retried with exponential backoff and full jitter on timeouts,
+  connection errors, 408/409/429 and 5xx responses (the SDK's own retries
+  are disabled so there is one retry policy);
+* is recorded by ``windsurf.telemetry`` with its attempt number.
+
+Set ``WINDSURF_LLM_BACKEND=fake`` (or pass ``backend="fake"``) to use
+``FakeBackend``, a deterministic local responder for offline tests and
+benchmarks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from windsurf.telemetry import create_completion
+
+DEFAULT_MODEL = "gpt-4o-mini"
+RETRYABLE_STATUS = frozenset({408, 409, 429})
+# Transport failures by class name, so neither ``openai`` nor ``httpx`` has to
+# be importable: the SDK's connection/timeout errors and httpx's base classes.
+RETRYABLE_ERROR_NAMES = frozenset(
+    {"APIConnectionError", "APITimeoutError", "TimeoutException", "TransportError"}
+)
+CHARS_PER_TOKEN = 4.0
+
+Messages = Sequence[Mapping[str, Any]]
+
+
+@dataclass(frozen=True)
+class LLMConfig:
+    model: str = DEFAULT_MODEL
+    backend: str = "openai"
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    timeout: float = 60.0
+    max_retries: int = 3
+    backoff_base: float = 1.0
+    backoff_max: float = 8.0
+    max_connections: int = 20
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "LLMConfig":
+        config = cls(
+            model=os.environ.get("OPENAI_MODEL", DEFAULT_MODEL),
+            backend=os.environ.get("WINDSURF_LLM_BACKEND", "openai"),
+            api_key=os.environ.get("OPENAI_API_KEY") or os.environ.get("API_KEY"),
+            base_url=os.environ.get("OPENAI_BASE") or None,
+            timeout=float(os.environ.get("WINDSURF_LLM_TIMEOUT", "60")),
+        )
+        return replace(config, **overrides)
+
+
+class FakeBackend:
+    """Deterministic stand-in for ``OpenAI().chat.completions``.
+
+    The reply is ``responder(messages)`` when a responder is given, otherwise
+    a JSON object derived from a hash of the request, so the same prompt
+    always gets the same answer.  ``latency`` (seconds) is slept per call to
+    make benchmarks realistic.  ``calls`` keeps every request's parameters.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[Messages], str]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.responder = responder
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **params: Any) -> Any:
+        with self._lock:
+            self.calls.append(params)
+        messages = params.get("messages") or []
+        if self.latency:
+            time.sleep(self.latency)
+        if self.responder is not None:
+            content = self.responder(messages)
+        else:
+            digest = hashlib.sha256(
+                json.dumps(messages, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            content = json.dumps({"fake": True, "digest": digest[:16]})
+        prompt_chars = sum(len(str(m.get("content") or "")) for m in messages)
+        usage = SimpleNamespace(
+            prompt_tokens=int(prompt_chars / CHARS_PER_TOKEN),
+            completion_tokens=int(len(content) / CHARS_PER_TOKEN),
+        )
+        message = SimpleNamespace(content=content, role="assistant")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="stop")],
+            usage=usage,
+            model=params.get("model"),
+        )
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failed call is worth retrying.
+
+    Only transport failures are: timeouts, connection errors and responses
+    with a status in ``RETRYABLE_STATUS`` or 5xx.  Anything else (bad
+    requests, auth, a missing SDK, bugs) surfaces on the first attempt.
+    """
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+class LLMClient:
+    """Pooled, retrying chat-completion client (see module docstring)."""
+
+    def __init__(
+        self,
+        config: Optional[LLMConfig] = None,
+        backend: Any = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.config = config or LLMConfig.from_env()
+        self._backend = backend
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def unavailable_reason(self) -> Optional[str]:
+        """Why calls cannot be made with this configuration, or ``None``."""
+
+        if self._backend is not None or self.config.backend == "fake":
+            return None
+        try:
+            import openai  # noqa: F401
+        except Exception:
+            return "The 'openai' package is not installed."
+        if not (self.config.api_key or os.environ.get("OPENAI_API_KEY")):
+            return "OPENAI_API_KEY environment variable is required."
+        return None
+
+    @property
+    def backend(self) -> Any:
+        """The SDK client (or fake), created on first use."""
+
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._build_backend()
+        return self._backend
+
+    def _build_backend(self) -> Any:
+        if self.config.backend == "fake":
+            return FakeBackend()
+        if self.config.backend != "openai":
+            raise ValueError(f"Unknown LLM backend: {self.config.backend}")
+        try:
+            from openai import OpenAI  # type: ignore
+        except Exception as exc:
+            raise RuntimeError(
+                "OpenAI SDK not available. Install with `pip install openai`."
+            ) from exc
+        kwargs: Dict[str, Any] = {"timeout": self.config.timeout, "max_retries": 0}
+        if self.config.api_key:
+            kwargs["api_key"] = self.config.api_key
+        if self.config.base_url:
+            kwargs["base_url"] = self.config.base_url
+        try:
+            import httpx  # installed with the SDK
+
+            kwargs["http_client"] = httpx.Client(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_connections,
+                ),
+            )
+        except Exception:  # pragma: no cover - the SDK falls back to its own pool
+            pass
+        return OpenAI(**kwargs)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (1-based)."""
+
+        ceiling = min(
+            self.config.backoff_max, self.config.backoff_base * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
+
+    def create(
+        self,
+        messages: Messages,
+        *,
+        tool: str,
+        model: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **params: Any,
+    ) -> Any:
+        """Call the chat completion endpoint and return the raw response."""
+
+        retries = self.config.max_retries if max_retries is None else max_retries
+        request = {
+            "model": model or self.config.model,
+            "messages": list(messages),
+            "timeout": timeout or self.config.timeout,
+            **params,
+        }
+        backend = self.backend  # configuration errors raise here, not in the retry loop
+        attempt = 1
+        while True:
+            try:
+                return create_completion(backend, tool=tool, attempt=attempt, **request)
+            except Exception as exc:
+                if attempt > retries or not is_retryable(exc):
+                    raise
+                self._sleep(self.backoff_delay(attempt))
+                attempt += 1
+
+    def complete(self, messages: Messages, *, tool: str, **params: Any) -> str:
+        """Like ``create`` but return the first choice's message text."""
+
+        response = self.create(messages, tool=tool, **params)
+        return response.choices[0].message.content or ""
+
+
+_CLIENTS: Dict[LLMConfig, LLMClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(**overrides: Any) -> LLMClient:
+    """Return the shared client for the environment config plus ``overrides``."""
+
+    config = LLMConfig.from_env(**overrides)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(config)
+        if client is None:
+            client = _CLIENTS[config] = LLMClient(config)
+    return client
+
+
+def reset_clients() -> None:
+    """Forget the shared clients (tests and benchmarks switch backends)."""
+
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+
+
+__all__ = [
+    "FakeBackend",
+    "LLMClient",
+    "LLMConfig",
+    "get_client",
+    "is_retryable",
+    "reset_clients",
+]
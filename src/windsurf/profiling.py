@@ -0,0 +1,107 @@
+"""Opt-in wall-clock profiling of pipeline stages and validator checks.
+
+``Profiler.wrap(name, fn)`` returns ``fn`` timed into the sample list for
+``name``.  Instrumentation works by swapping callables for their wrapped
+versions (``FlashcardProcessor.enable_profiling`` and
+``SchemaValidator.instrument``), so nothing is timed, and nothing is
+checked per call, unless profiling was switched on.  ``summary`` reports,
+per name, the call count, cumulative time, time per card and the
+p50/p95/max of single calls; ``write_json`` saves it (``reports/profile.json``
+from ``processor.py process --profile``) and ``format_table`` prints the
+top entries::
+
+    python -m windsurf.flashcards.processor process --profile --profile-top 10
+
+Values that checks compute lazily and share (for example the sentence split
+of the card back) are charged to whichever check asks for them first.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct
+    lower, upper = math.floor(k), math.ceil(k)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+class Profiler:
+    """Collects per-call durations by name (see module docstring)."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.cards = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.samples[name].append(seconds)
+
+    def wrap(self, name: str, fn: F) -> F:
+        samples = self.samples[name]
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(clock() - start)
+
+        return timed  # type: ignore[return-value]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-name statistics in milliseconds, largest cumulative time first."""
+
+        rows: Dict[str, Dict[str, float]] = {}
+        for name, values in self.samples.items():
+            if not values:
+                continue
+            total = sum(values)
+            rows[name] = {
+                "calls": len(values),
+                "total_ms": round(total * 1000, 3),
+                "per_card_ms": (
+                    round(total * 1000 / self.cards, 3) if self.cards else 0.0
+                ),
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 3),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 3),
+                "max_ms": round(max(values) * 1000, 3),
+            }
+        return dict(sorted(rows.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def write_json(self, destination: Path, **meta: Any) -> Dict[str, Any]:
+        payload = {"cards": self.cards, **meta, "timings": self.summary()}
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return payload
+
+    def format_table(self, top: Optional[int] = 15) -> str:
+        summary = self.summary()
+        header = (
+            f"{'name':<36} {'calls':>6} {'total ms':>10} {'per card':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+        )
+        lines = [header]
+        for name, row in list(summary.items())[:top]:
+            lines.append(
+                f"{name:<36} {row['calls']:>6} {row['total_ms']:>10.2f} "
+                f"{row['per_card_ms']:>9.3f} {row['p50_ms']:>8.3f} "
+                f"{row['p95_ms']:>8.3f} {row['max_ms']:>8.3f}"
+            )
+        return "\n".join(lines)
+
+
+__all__ = ["Profiler"]
@@ -0,0 +1,229 @@
+"""Per-call token, latency and cost telemetry for model-calling tools.
+
+Every chat completion made through ``create_completion`` appends one JSON
+line to ``METRICS_PATH`` (``reports/llm_metrics.jsonl`` unless
+``WINDSURF_METRICS_PATH`` is set)::
+
+    {"run": "...", "tool": "grade_cards", "model": "gpt-4o-mini",
+     "attempt": 1, "status": "ok", "latency_ms": 812.4,
+     "prompt_tokens": 1734, "completion_tokens": 211, "cost_usd": 0.2334}
+
+Token counts come from the response ``usage`` block; endpoints that do not
+return one are estimated from character counts and flagged ``estimated``.
+Failed calls are recorded with ``status: "error"`` and re-raised, so retries
+show up as extra attempts.  ``summarise`` folds the records of one run into
+per-tool p50/p95 latency, token totals and estimated cost (priced with the
+simulator's ``TOKEN_PRICE_PER_1K_*``); ``python -m windsurf.telemetry``
+prints it for the latest run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from windsurf.paths import REPORTS_DIR
+from windsurf.tools.simulate_prompt_strategies import (
+    TOKEN_PRICE_PER_1K_IN,
+    TOKEN_PRICE_PER_1K_OUT,
+)
+
+METRICS_PATH = Path(
+    os.environ.get("WINDSURF_METRICS_PATH", REPORTS_DIR / "llm_metrics.jsonl")
+)
+RUN_ID = os.environ.get("WINDSURF_RUN_ID") or (
+    time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+)
+CHARS_PER_TOKEN = 4.0
+
+_WRITE_LOCK = threading.Lock()
+
+
+def estimate_cost(prompt_tokens: float, completion_tokens: float) -> float:
+    return (prompt_tokens / 1000.0) * TOKEN_PRICE_PER_1K_IN + (
+        completion_tokens / 1000.0
+    ) * TOKEN_PRICE_PER_1K_OUT
+
+
+def _message_chars(messages: Sequence[Mapping[str, Any]]) -> int:
+    return sum(len(str(message.get("content") or "")) for message in messages)
+
+
+def _usage(response: Any, messages: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    usage = getattr(response, "usage", None)
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if prompt is not None and completion is not None:
+        return {"prompt_tokens": int(prompt), "completion_tokens": int(completion)}
+    try:
+        content = response.choices[0].message.content or ""
+    except Exception:
+        content = ""
+    return {
+        "prompt_tokens": math.ceil(_message_chars(messages) / CHARS_PER_TOKEN),
+        "completion_tokens": math.ceil(len(content) / CHARS_PER_TOKEN),
+        "estimated": True,
+    }
+
+
+def record(entry: Dict[str, Any], path: Optional[Path] = None) -> None:
+    """Append ``entry`` to the metrics file, stamped with the run id."""
+
+    target = Path(path or METRICS_PATH)
+    line = json.dumps({"run": RUN_ID, "ts": time.time(), **entry}, ensure_ascii=False)
+    with _WRITE_LOCK:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+def create_completion(
+    client: Any, *, tool: str, attempt: int = 1, **params: Any
+) -> Any:
+    """Call ``client.chat.completions.create(**params)`` and record the call."""
+
+    messages = params.get("messages") or []
+    entry: Dict[str, Any] = {
+        "tool": tool,
+        "model": params.get("model"),
+        "attempt": attempt,
+    }
+    start = time.perf_counter()
+    try:
+        response = client.chat.completions.create(**params)
+    except Exception as exc:
+        entry.update(
+            status="error",
+            error=type(exc).__name__,
+            latency_ms=round((time.perf_counter() - start) * 1000, 1),
+            prompt_tokens=math.ceil(_message_chars(messages) / CHARS_PER_TOKEN),
+            completion_tokens=0,
+            cost_usd=0.0,
+        )
+        record(entry)
+        raise
+    entry.update(status="ok", latency_ms=round((time.perf_counter() - start) * 1000, 1))
+    entry.update(_usage(response, messages))
+    entry["cost_usd"] = round(
+        estimate_cost(entry["prompt_tokens"], entry["completion_tokens"]), 6
+    )
+    record(entry)
+    return response
+
+
+def read_records(path: Optional[Path] = None) -> Iterable[Dict[str, Any]]:
+    target = Path(path or METRICS_PATH)
+    if not target.exists():
+        return
+    with target.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(item, dict):
+                yield item
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct
+    lower, upper = math.floor(k), math.ceil(k)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarise(
+    records: Iterable[Mapping[str, Any]], run: Optional[str] = None
+) -> Dict[str, Dict[str, float]]:
+    """Per-tool totals for ``run`` (all runs when ``None``), plus ``"total"``."""
+
+    latencies: Dict[str, List[float]] = {}
+    totals: Dict[str, Dict[str, float]] = {}
+    for item in records:
+        if run is not None and item.get("run") != run:
+            continue
+        for key in (str(item.get("tool", "unknown")), "total"):
+            bucket = totals.setdefault(
+                key,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                },
+            )
+            bucket["calls"] += 1
+            bucket["errors"] += item.get("status") == "error"
+            bucket["retries"] += int(item.get("attempt") or 1) > 1
+            bucket["prompt_tokens"] += int(item.get("prompt_tokens") or 0)
+            bucket["completion_tokens"] += int(item.get("completion_tokens") or 0)
+            bucket["cost_usd"] += float(item.get("cost_usd") or 0.0)
+            latencies.setdefault(key, []).append(float(item.get("latency_ms") or 0.0))
+    for key, bucket in totals.items():
+        bucket["p50_latency_ms"] = round(_percentile(latencies[key], 0.50), 1)
+        bucket["p95_latency_ms"] = round(_percentile(latencies[key], 0.95), 1)
+        bucket["cost_usd"] = round(bucket["cost_usd"], 4)
+    return totals
+
+
+def format_summary(summary: Mapping[str, Mapping[str, float]]) -> str:
+    header = (
+        f"{'tool':<24} {'calls':>6} {'errors':>6} {'retries':>7} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'prompt':>9} {'compl.':>8} {'cost $':>8}"
+    )
+    lines = [header]
+    for tool in sorted(summary, key=lambda name: (name == "total", name)):
+        row = summary[tool]
+        lines.append(
+            f"{tool:<24} {row['calls']:>6} {row['errors']:>6} {row['retries']:>7} "
+            f"{row['p50_latency_ms']:>9.1f} {row['p95_latency_ms']:>9.1f} "
+            f"{row['prompt_tokens']:>9} {row['completion_tokens']:>8} {row['cost_usd']:>8.4f}"
+        )
+    return "\n".join(lines)
+
+
+def report_run(
+    path: Optional[Path] = None, run: str = RUN_ID
+) -> Dict[str, Dict[str, float]]:
+    """Print the summary of ``run`` (this process by default) and return it."""
+
+    summary = summarise(read_records(path), run)
+    if summary:
+        print(f"\nModel usage for run {run}:")
+        print(format_summary(summary))
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarise model call telemetry")
+    parser.add_argument("--metrics", type=Path, default=METRICS_PATH)
+    parser.add_argument("--run", help="Run id (default: latest run in the file)")
+    parser.add_argument("--all", action="store_true", help="Summarise every run")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args(argv)
+
+    records = list(read_records(args.metrics))
+    run = args.run
+    if run is None and not args.all and records:
+        run = str(records[-1].get("run"))
+    summary = summarise(records, None if args.all else run)
+    if not summary:
+        print(f"No model calls recorded in {args.metrics}")
+        return 1
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
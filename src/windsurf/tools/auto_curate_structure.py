@@ -4,25 +4,30 @@ import os, json, re, argparse, traceback
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
-from openai import OpenAI
+from windsurf.llm import LLMClient, get_client
+from windsurf.telemetry import report_run
 
 # ---------- Paths ----------
-ROOT = Path(__file__).resolve().parents[3] if (
-    Path(__file__).parts[-3:] == ("windsurf", "tools", "auto_curate_structure.py")
-) else Path.cwd()
+ROOT = (
+    Path(__file__).resolve().parents[3]
+    if (Path(__file__).parts[-3:] == ("windsurf", "tools", "auto_curate_structure.py"))
+    else Path.cwd()
+)
 
 CARDS_DIR = ROOT / "src" / "jd" / "cards_yaml"
-REPORTS_DIR = ROOT / "reports"; REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-OUT_DIR = REPORTS_DIR / "auto_curate"; OUT_DIR.mkdir(parents=True, exist_ok=True)
+REPORTS_DIR = ROOT / "reports"
+REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+OUT_DIR = REPORTS_DIR / "auto_curate"
+OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # ---------- Config ----------
 MODEL = os.environ.get("WINDSURF_GRADE_MODEL", "gpt-4o-mini")
 MAX_TOKENS = int(os.environ.get("WINDSURF_MAX_OUTPUT_TOKENS", "2000"))
 
 ALLOWED_CHILD_VECTORS = [
-    [1,3,3,2,3],  # sums 12
-    [2,2,2,1,5],  # sums 12
-    [2,3,3,3,1],  # sums 12
+    [1, 3, 3, 2, 3],  # sums 12
+    [2, 2, 2, 1, 5],  # sums 12
+    [2, 3, 3, 3, 1],  # sums 12
 ]
 
 # ---------- Prompts ----------
@@ -108,37 +113,66 @@ FULL YAML (verbatim):
 <<<END CARD>>>
 """
 
+
 # ---------- Helpers ----------
 def _read(p: Path) -> str:
     return p.read_text(encoding="utf-8").replace("\r\n", "\n")
 
+
 def _indent_block(block: str, spaces: int = 2) -> str:
     pad = " " * spaces
-    return "\n".join(pad + line if line.strip() else line for line in block.splitlines())
+    return "\n".join(
+        pad + line if line.strip() else line for line in block.splitlines()
+    )
+
+
+TRIPWIRES_RE = re.compile(r"(?ms)^\s*tripwires:\s*\n(?:\s*-\s.*\n)+")
+DIAGRAM_RE = re.compile(r"(?ms)^\s*diagram:\s*\|[-+]?\s*\n(?:[ \t].*\n)*")
 
-TRIPWIRES_RE = re.compile(r'(?ms)^\s*tripwires:\s*\n(?:\s*-\s.*\n)+')
-DIAGRAM_RE   = re.compile(r'(?ms)^\s*diagram:\s*\|[-+]?\s*\n(?:[ \t].*\n)*')
 
 def apply_patch(original: str, trip_yaml: str, diagram_yaml: str) -> str:
     new_text = original
-    if not trip_yaml.endswith("\n"): trip_yaml += "\n"
-    if not diagram_yaml.endswith("\n"): diagram_yaml += "\n"
-
-    new_text = TRIPWIRES_RE.sub(trip_yaml, new_text, count=1) if TRIPWIRES_RE.search(new_text) else (
-        (new_text + ("\n" if not new_text.endswith("\n") else "") + "\n" + trip_yaml)
+    if not trip_yaml.endswith("\n"):
+        trip_yaml += "\n"
+    if not diagram_yaml.endswith("\n"):
+        diagram_yaml += "\n"
+
+    new_text = (
+        TRIPWIRES_RE.sub(trip_yaml, new_text, count=1)
+        if TRIPWIRES_RE.search(new_text)
+        else (
+            (
+                new_text
+                + ("\n" if not new_text.endswith("\n") else "")
+                + "\n"
+                + trip_yaml
+            )
+        )
     )
-    new_text = DIAGRAM_RE.sub(diagram_yaml, new_text, count=1) if DIAGRAM_RE.search(new_text) else (
-        (new_text + ("\n" if not new_text.endswith("\n") else "") + "\n" + diagram_yaml)
+    new_text = (
+        DIAGRAM_RE.sub(diagram_yaml, new_text, count=1)
+        if DIAGRAM_RE.search(new_text)
+        else (
+            (
+                new_text
+                + ("\n" if not new_text.endswith("\n") else "")
+                + "\n"
+                + diagram_yaml
+            )
+        )
     )
     return new_text
 
+
 def summarise_delta(before: str, after: str) -> Dict[str, Any]:
     b, a = before.splitlines(), after.splitlines()
-    added   = sum(1 for ln in a if ln not in b)
+    added = sum(1 for ln in a if ln not in b)
     removed = sum(1 for ln in b if ln not in a)
     return {"lines_added": added, "lines_removed": removed}
 
-_CTRL = re.compile(r'[\u0000-\u0008\u000B-\u000C\u000E-\u001F\u007F\u0080-\u009F]')
+
+_CTRL = re.compile(r"[\u0000-\u0008\u000B-\u000C\u000E-\u001F\u007F\u0080-\u009F]")
+
 
 def _sanitize_mermaid_text(diag_block: str) -> str:
     """
@@ -166,7 +200,7 @@ def _sanitize_mermaid_text(diag_block: str) -> str:
     # Ensure mindmap header exists and is on its own line (final pass done by _force_mindmap_line)
     if "mindmap" not in inner:
         inner = "mindmap\n" + inner
-    inner = re.sub(r'(?im)^\s*mindmap\s*$', 'mindmap', inner, count=1)
+    inner = re.sub(r"(?im)^\s*mindmap\s*$", "mindmap", inner, count=1)
 
     # Remove leading "- " bullets from child lines ONLY (don’t touch inline hyphens)
     fixed_lines = []
@@ -175,7 +209,9 @@ def _sanitize_mermaid_text(diag_block: str) -> str:
         if stripped.startswith("- "):
             indent_len = len(ln) - len(stripped)
             prefix = ln[:indent_len]
-            fixed_lines.append(prefix + stripped[2:])  # drop the bullet, keep indentation
+            fixed_lines.append(
+                prefix + stripped[2:]
+            )  # drop the bullet, keep indentation
         else:
             fixed_lines.append(ln)
     inner = "\n".join(fixed_lines)
@@ -185,21 +221,27 @@ def _sanitize_mermaid_text(diag_block: str) -> str:
     inner = inner.replace("Wrongs Act (Vic)", "WA (Vic)")
 
     # Tag persuasive authorities if mentioned (idempotent)
-    inner = re.sub(r"(Entick(?:\s+v\s+Carrington)?)\b(?!\s*\(persuasive\))", r"\1 (persuasive)", inner)
+    inner = re.sub(
+        r"(Entick(?:\s+v\s+Carrington)?)\b(?!\s*\(persuasive\))",
+        r"\1 (persuasive)",
+        inner,
+    )
     inner = re.sub(r"(Wagon Mound)\b(?!\s*\(persuasive\))", r"\1 (persuasive)", inner)
 
     # Force root title arrow if this is the protected-interests card
     inner = re.sub(
-        r'^(?P<indent>\s*)root\(\((?P<title>.*?Protected interests.*?roadmap.*?)\)\)',
+        r"^(?P<indent>\s*)root\(\((?P<title>.*?Protected interests.*?roadmap.*?)\)\)",
         lambda m: f"{m.group('indent')}root((Protected interests \u2192 roadmap))",
         inner,
-        flags=re.M
+        flags=re.M,
     )
 
     # Rebuild fenced block
     return "```mermaid\n" + inner.strip() + "\n```"
 
-BRANCH_RE = re.compile(r'^\s*([A-E])\.\s')
+
+BRANCH_RE = re.compile(r"^\s*([A-E])\.\s")
+
 
 def _parse_mermaid_child_vector(diag_text: str) -> Tuple[List[int], int, int]:
     """
@@ -221,7 +263,7 @@ def _parse_mermaid_child_vector(diag_text: str) -> Tuple[List[int], int, int]:
     # find start of mindmap section
     if "mindmap" in text:
         text = text.split("mindmap", 1)[1]
-    vec = [0,0,0,0,0]
+    vec = [0, 0, 0, 0, 0]
     branches = 0
     cur = -1
     cur_indent = 0
@@ -230,7 +272,7 @@ def _parse_mermaid_child_vector(diag_text: str) -> Tuple[List[int], int, int]:
             continue
         m = BRANCH_RE.match(raw)
         if m:
-            cur = ord(m.group(1)) - ord('A')
+            cur = ord(m.group(1)) - ord("A")
             branches += 1
             cur_indent = len(raw) - len(raw.lstrip(" "))
             continue
@@ -242,8 +284,10 @@ def _parse_mermaid_child_vector(diag_text: str) -> Tuple[List[int], int, int]:
                 vec[cur] += 1
     return vec, sum(vec), branches
 
+
 def _choose_target_vector(cur_vec: List[int]) -> List[int]:
-    best = None; best_score = (10**9, 10**9)
+    best = None
+    best_score = (10**9, 10**9)
     for cand in ALLOWED_CHILD_VECTORS:
         reductions = sum(max(0, cur_vec[i] - cand[i]) for i in range(5))
         l1 = sum(abs(cur_vec[i] - cand[i]) for i in range(5))
@@ -252,22 +296,28 @@ def _choose_target_vector(cur_vec: List[int]) -> List[int]:
             best_score, best = score, cand
     return best or ALLOWED_CHILD_VECTORS[0]
 
-def _call_openai_json(client: OpenAI, model: str, sys_prompt: str, user_prompt: str) -> Dict[str, Any]:
+
+def _call_openai_json(
+    client: LLMClient, model: str, sys_prompt: str, user_prompt: str
+) -> Dict[str, Any]:
     try:
-        resp = client.chat.completions.create(
+        content = client.complete(
+            [
+                {"role": "system", "content": sys_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tool="auto_curate_structure",
             model=model,
             temperature=0,
             response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": sys_prompt},
-                      {"role": "user",   "content": user_prompt}],
             max_tokens=MAX_TOKENS,
         )
-        content = resp.choices[0].message.content or "{}"
-        return json.loads(content)
+        return json.loads(content or "{}")
     except Exception:
         print("[fatal] model call failed:\n" + traceback.format_exc())
         raise
 
+
 # ---------- Target discovery ----------
 def load_targets(args) -> List[Path]:
     if args.only:
@@ -283,6 +333,7 @@ def load_targets(args) -> List[Path]:
             targets.append(ROOT / r["card"])
     return sorted(set(targets))
 
+
 def _force_mindmap_line(block: str) -> str:
     """
     Ensure 'mindmap' is on its own line inside the fenced mermaid block.
@@ -293,21 +344,30 @@ def _force_mindmap_line(block: str) -> str:
     inner = m.group(1) if m else block
 
     # Put 'mindmap' on its own line at the start of the inner payload
-    inner = re.sub(r'(?im)^\s*mindmap\s*', 'mindmap\n', inner, count=1)
+    inner = re.sub(r"(?im)^\s*mindmap\s*", "mindmap\n", inner, count=1)
 
     # Rebuild fenced block
     return "```mermaid\n" + inner.strip() + "\n```"
 
+
 # ---------- Main ----------
 def main() -> int:
-    ap = argparse.ArgumentParser(description="Auto-curate diagram + tripwires from full YAML.")
+    ap = argparse.ArgumentParser(
+        description="Auto-curate diagram + tripwires from full YAML."
+    )
     ap.add_argument("--model", default=None, help="Override model name")
-    ap.add_argument("--apply", action="store_true", help="Apply patches to YAML files (in-place).")
-    ap.add_argument("--all", action="store_true", help="Run on all cards, not just failing ones.")
-    ap.add_argument("--only", help="Run on a single YAML file (absolute or relative path)")
+    ap.add_argument(
+        "--apply", action="store_true", help="Apply patches to YAML files (in-place)."
+    )
+    ap.add_argument(
+        "--all", action="store_true", help="Run on all cards, not just failing ones."
+    )
+    ap.add_argument(
+        "--only", help="Run on a single YAML file (absolute or relative path)"
+    )
     args = ap.parse_args()
 
-    client = OpenAI()
+    client = get_client()
     model = args.model or MODEL
 
     targets = load_targets(args)
@@ -322,8 +382,12 @@ def main() -> int:
         original = _read(p)
 
         # ---- First pass
-        data = _call_openai_json(client, model, SYSTEM_PROMPT,
-                                 USER_TEMPLATE.format(card_path=str(p), card_text=original))
+        data = _call_openai_json(
+            client,
+            model,
+            SYSTEM_PROMPT,
+            USER_TEMPLATE.format(card_path=str(p), card_text=original),
+        )
 
         tw = data.get("tripwires_new", []) or []
         raw_block = (data.get("diagram_new_mermaid") or "").strip()
@@ -331,7 +395,9 @@ def main() -> int:
             print("  [warn] model returned empty diagram.")
             continue
         diag_block = _sanitize_mermaid_text(raw_block)
-        diag_block = _force_mindmap_line(diag_block)  # ensure 'mindmap' is on its own line
+        diag_block = _force_mindmap_line(
+            diag_block
+        )  # ensure 'mindmap' is on its own line
 
         # recompute meta from (sanitised) text
         vec_text, sum_text, branches_text = _parse_mermaid_child_vector(diag_block)
@@ -341,15 +407,20 @@ def main() -> int:
         if need_repair:
             target_vec = _choose_target_vector(vec_text)
             repair_prompt = REPAIR_PROMPT_TEMPLATE.format(
-                cur_vec=vec_text, cur_sum=sum_text, target_vec=target_vec,
-                card_path=str(p), card_text=original,
+                cur_vec=vec_text,
+                cur_sum=sum_text,
+                target_vec=target_vec,
+                card_path=str(p),
+                card_text=original,
                 prev_json=json.dumps(data, indent=2),
             )
             data = _call_openai_json(client, model, SYSTEM_PROMPT, repair_prompt)
             tw = data.get("tripwires_new", []) or []
             raw_block = (data.get("diagram_new_mermaid") or "").strip()
             diag_block = _sanitize_mermaid_text(raw_block)
-            diag_block = _force_mindmap_line(diag_block)  # ensure proper line break again
+            diag_block = _force_mindmap_line(
+                diag_block
+            )  # ensure proper line break again
             vec_text, sum_text, branches_text = _parse_mermaid_child_vector(diag_block)
 
         # ---- Final validation (from text, not model meta)
@@ -369,7 +440,9 @@ def main() -> int:
 
         # ---- Save suggestions
         base = p.stem
-        (OUT_DIR / f"{base}.suggestion.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+        (OUT_DIR / f"{base}.suggestion.json").write_text(
+            json.dumps(data, indent=2), encoding="utf-8"
+        )
         md = []
         md.append(f"# {p.name} — Auto-curated structure\n")
         md.append("## Tripwires (exactly four)\n")
@@ -377,34 +450,55 @@ def main() -> int:
             md.append(f"{i}. {t}")
         if data.get("tripwires_rationale"):
             md.append("\n### Rationale\n- " + "\n- ".join(data["tripwires_rationale"]))
-        md.append("\n## Diagram (Mermaid • 5 branches • exactly 12 children • ≤18 total nodes)\n")
+        md.append(
+            "\n## Diagram (Mermaid • 5 branches • exactly 12 children • ≤18 total nodes)\n"
+        )
         md.append(diag_block)
         md.append("\n### Meta (recomputed from diagram text)\n\n")
-        md.append(json.dumps({
-            "top_level_branches_text": branches_text,
-            "child_vector_text": vec_text,
-            "children_sum_text": sum_text,
-            "total_nodes_text": total_nodes_text
-        }, indent=2))
+        md.append(
+            json.dumps(
+                {
+                    "top_level_branches_text": branches_text,
+                    "child_vector_text": vec_text,
+                    "children_sum_text": sum_text,
+                    "total_nodes_text": total_nodes_text,
+                },
+                indent=2,
+            )
+        )
         md.append("\n### Coverage notes\n")
         md.append(json.dumps(data.get("coverage", {}), indent=2))
-        (OUT_DIR / f"{base}.suggestion.md").write_text("\n".join(md) + "\n", encoding="utf-8")
+        (OUT_DIR / f"{base}.suggestion.md").write_text(
+            "\n".join(md) + "\n", encoding="utf-8"
+        )
 
         # ---- Apply if compliant
-        if (args.apply and len(tw) == 4 and branches_text == 5 and sum_text == 12 and total_nodes_text <= 18):
+        if (
+            args.apply
+            and len(tw) == 4
+            and branches_text == 5
+            and sum_text == 12
+            and total_nodes_text <= 18
+        ):
             patched = apply_patch(original, trip_yaml, diagram_yaml)
             delta = summarise_delta(original, patched)
-            (OUT_DIR / f"{base}.patched.preview.yml").write_text(patched, encoding="utf-8")
+            (OUT_DIR / f"{base}.patched.preview.yml").write_text(
+                patched, encoding="utf-8"
+            )
             Path(p).write_text(patched, encoding="utf-8")
             print(f"  [applied] tripwires+diagram patched ({delta})")
         else:
-            print("  [saved] suggestion files; validator not satisfied (need 5 branches, =12 children, ≤18 total).")
+            print(
+                "  [saved] suggestion files; validator not satisfied (need 5 branches, =12 children, ≤18 total)."
+            )
 
+    report_run()
     if failures:
         print(f"[done] Completed with {failures} model error(s).")
         return 1
     print("[done] Suggestions generated.")
     return 0
 
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -14,13 +14,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-try:  # pragma: no cover - exercised in integration only
-    from openai import OpenAI  # type: ignore
-except Exception as exc:  # pragma: no cover - exercised in integration only
-    raise RuntimeError(
-        "OpenAI SDK not available. Install with `pip install openai`."
-    ) from exc
-
+from windsurf.llm import get_client
+from windsurf.telemetry import report_run
 
 # ---------------------------------------------------------------------------
 # Configuration knobs (tuned for reliability)
@@ -134,23 +129,22 @@ def pick_hot_pages(pages: Sequence[str], max_pages: int = MAX_PAGES) -> List[str
 # ---------------------------------------------------------------------------
 # Model wrapper
 # ---------------------------------------------------------------------------
-_client = OpenAI()
-
-
-def ask_model(prompt: str, *, model: str = MODEL, max_tokens: int = MAX_TOKENS_FULL) -> str:
+def ask_model(
+    prompt: str, *, model: str = MODEL, max_tokens: int = MAX_TOKENS_FULL
+) -> str:
     """Call the chat completion endpoint and return the raw JSON string."""
 
-    response = _client.chat.completions.create(
-        model=model,
-        messages=[
+    return get_client().complete(
+        [
             {"role": "system", "content": "You are an Australian torts case auditor."},
             {"role": "user", "content": prompt},
         ],
+        tool="base_case_briefs",
+        model=model,
         response_format={"type": "json_object"},
         temperature=0,
         max_tokens=max_tokens,
     )
-    return response.choices[0].message.content or ""
 
 
 def parse_json_or_raise(raw: str) -> Dict[str, Any]:
@@ -207,7 +201,16 @@ def run_case(doc: Dict[str, Any]) -> None:
     try:
         data, meta = query_case(filename, sample)
         log_jsonl(OK_PATH, {"file": filename, "data": data})
-        log_jsonl(STATUS_LOG, {"file": filename, "status": "ok", "attempt": meta.attempt})
+        log_jsonl(
+            STATUS_LOG,
+            {
+                "file": filename,
+                "status": "ok",
+                "attempt": meta.attempt,
+                "sample_len": len(sample),
+                "raw_len": meta.raw_len,
+            },
+        )
     except Exception as exc:  # Broad by design – we log & continue.
         log_jsonl(
             FAIL_PATH,
@@ -220,7 +223,12 @@ def run_case(doc: Dict[str, Any]) -> None:
         )
         log_jsonl(
             STATUS_LOG,
-            {"file": filename, "status": "fail", "error": str(exc)},
+            {
+                "file": filename,
+                "status": "fail",
+                "error": str(exc),
+                "sample_len": len(sample),
+            },
         )
 
 
@@ -252,7 +260,7 @@ def load_documents() -> List[Dict[str, Any]]:
         if not fallback.exists():
             raise RuntimeError(
                 "No document loader found. Provide `load_case_pdfs()` or create "
-                "outputs/cases.jsonl with objects: {\"filename\": str, \"pages\": [str, ...]}"
+                'outputs/cases.jsonl with objects: {"filename": str, "pages": [str, ...]}'
             )
         return _load_docs_from_jsonl(fallback)
 
@@ -270,6 +278,7 @@ def main() -> None:
         if filename in done_ok:
             continue
         run_case(doc)
+    report_run()
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
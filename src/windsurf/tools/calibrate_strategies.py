@@ -0,0 +1,301 @@
+"""Calibrate prompt ``Strategy`` parameters from base case brief run logs.
+
+``base_case_briefs`` appends one record per processed case to
+``batch_status.log`` (the attempt level that succeeded plus the excerpt and
+response lengths) and the failures to ``failed_responses.jsonl``.  This
+module streams both logs once, rebuilds the token counts of every attempt
+that was actually sent, and fits their distributions:
+
+* ``normal`` matches the sample mean and standard deviation; the simulator
+  draws from a normal clamped at zero;
+* ``lognormal`` fits ``log(tokens)``; the simulator draws from that
+  lognormal, so the right skew of excerpt lengths carries into the p95 cost.
+
+Either fit is reported as the mean and standard deviation of the fitted
+distribution, which together with ``Calibration.fit`` determine it.  Both
+keep only running sums, so memory does not grow with the log.  The
+per-attempt failure rate is the maximum likelihood estimate for the retry
+ladder (failed attempts over attempts sent).  ``calibrated_strategy`` writes
+the fit, including its distribution, into a ``Strategy`` for ``simulate``
+and the sweep::
+
+    python -m windsurf.tools.calibrate_strategies outputs --fit lognormal \\
+        --base 1 --save outputs/calibration.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+from .simulate_prompt_strategies import (
+    Strategy,
+    default_strategies,
+    pretty_print,
+    simulate,
+)
+
+STATUS_LOG_NAME = "batch_status.log"
+FAILED_LOG_NAME = "failed_responses.jsonl"
+
+# Attempt ladder used by ``base_case_briefs.query_case``, in order.  Each
+# level records the prompt template and the excerpt cap in characters.
+ATTEMPT_LEVELS: Dict[str, tuple[str, int]] = {
+    "full/4k": ("full", 4000),
+    "full/2.5k": ("full", 2500),
+    "min/2.5k": ("min", 2500),
+}
+CHARS_PER_TOKEN = 4.0
+# Template, system message and file name, in tokens (approximate).
+PROMPT_OVERHEAD_TOKENS = {"full": 135.0, "min": 80.0}
+FITS = ("normal", "lognormal")
+# Calibration files written before the fits were named by distribution.
+_FIT_ALIASES = {"empirical": "normal"}
+
+
+def stream_jsonl(path: Path) -> Iterator[Dict[str, object]]:
+    """Yield the JSON objects in ``path`` one line at a time."""
+
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+@dataclass
+class RunningFit:
+    """Running sums for the normal and lognormal fits of positive samples."""
+
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    log_total: float = 0.0
+    log_total_sq: float = 0.0
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            return
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        log_value = math.log(value)
+        self.log_total += log_value
+        self.log_total_sq += log_value * log_value
+
+    def moments(self, fit: str = "normal") -> tuple[float, float]:
+        """Return ``(mean, sd)`` of the fitted distribution."""
+
+        if fit not in FITS:
+            raise ValueError(f"Unknown fit: {fit}")
+        if self.count == 0:
+            return 0.0, 0.0
+        if fit == "normal":
+            mean = self.total / self.count
+            variance = self.total_sq / self.count - mean * mean
+        else:
+            mu = self.log_total / self.count
+            sigma_sq = max(self.log_total_sq / self.count - mu * mu, 0.0)
+            mean = math.exp(mu + sigma_sq / 2)
+            variance = mean * mean * (math.exp(sigma_sq) - 1)
+        return mean, math.sqrt(max(variance, 0.0))
+
+
+@dataclass
+class Calibration:
+    """Token and failure statistics fitted from one run's logs."""
+
+    fit: str
+    cases: int
+    attempts: int
+    failed_attempts: int
+    failed_cases: int
+    prompt_tokens_mean: float
+    prompt_tokens_sd: float
+    completion_tokens_mean: float
+    completion_tokens_sd: float
+    failure_rate: float
+    max_retries: int = len(ATTEMPT_LEVELS) - 1
+    attempt_levels: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Calibration":
+        data = dict(data)
+        data["fit"] = _FIT_ALIASES.get(str(data.get("fit")), data.get("fit"))
+        return cls(**data)  # type: ignore[arg-type]
+
+
+def _prompt_tokens(level: str, sample_len: int) -> float:
+    template, cap = ATTEMPT_LEVELS[level]
+    return PROMPT_OVERHEAD_TOKENS[template] + min(sample_len, cap) / CHARS_PER_TOKEN
+
+
+def calibrate(
+    status_log: Path, failed_log: Optional[Path] = None, fit: str = "normal"
+) -> Calibration:
+    """Fit token and failure statistics from a run's status and failure logs.
+
+    Every record in ``status_log`` is a case that was processed.  A case that
+    succeeded at level *n* of the ladder sent *n* attempts, of which *n - 1*
+    failed; a failed case sent and failed every level.  Older status logs
+    lack ``sample_len`` on failures, so it is taken from ``failed_log``,
+    matched in order because ``run_case`` writes the two records in pairs.
+    """
+
+    if fit not in FITS:
+        raise ValueError(f"Unknown fit: {fit}")
+    levels = list(ATTEMPT_LEVELS)
+    failures = stream_jsonl(failed_log) if failed_log is not None else iter(())
+    prompt = RunningFit()
+    completion = RunningFit()
+    counts = {level: 0 for level in levels}
+    cases = attempts = failed_attempts = failed_cases = 0
+
+    for record in stream_jsonl(status_log):
+        status = record.get("status")
+        if status == "ok" and record.get("attempt") in ATTEMPT_LEVELS:
+            sent = levels[: levels.index(str(record["attempt"])) + 1]
+            counts[sent[-1]] += 1
+            raw_len = record.get("raw_len")
+            if isinstance(raw_len, (int, float)):
+                completion.add(raw_len / CHARS_PER_TOKEN)
+        elif status == "fail":
+            sent = levels
+            failed_cases += 1
+            record = {**next(failures, {}), **record}
+        else:
+            continue
+        cases += 1
+        attempts += len(sent)
+        failed_attempts += len(sent) - (status == "ok")
+        sample_len = record.get("sample_len")
+        if isinstance(sample_len, (int, float)):
+            for level in sent:
+                prompt.add(_prompt_tokens(level, int(sample_len)))
+
+    prompt_mean, prompt_sd = prompt.moments(fit)
+    completion_mean, completion_sd = completion.moments(fit)
+    return Calibration(
+        fit=fit,
+        cases=cases,
+        attempts=attempts,
+        failed_attempts=failed_attempts,
+        failed_cases=failed_cases,
+        prompt_tokens_mean=prompt_mean,
+        prompt_tokens_sd=prompt_sd,
+        completion_tokens_mean=completion_mean,
+        completion_tokens_sd=completion_sd,
+        failure_rate=failed_attempts / attempts if attempts else 0.0,
+        attempt_levels=counts,
+    )
+
+
+def calibrate_directory(out_dir: Path, fit: str = "normal") -> Calibration:
+    """``calibrate`` the logs that ``base_case_briefs`` writes to ``out_dir``."""
+
+    out_dir = Path(out_dir)
+    return calibrate(out_dir / STATUS_LOG_NAME, out_dir / FAILED_LOG_NAME, fit)
+
+
+def calibrated_strategy(
+    base: Strategy, calibration: Calibration, cases: Optional[int] = None
+) -> Strategy:
+    """Return ``base`` with token and failure parameters from ``calibration``.
+
+    The case token draws follow the fitted distribution.  Fields without
+    observations (for example completion lengths in logs
+    written before ``raw_len`` was recorded) keep the values from ``base``.
+    """
+
+    overrides: Dict[str, object] = {
+        "name": f"{base.name} (calibrated, {calibration.fit})",
+        "max_retries": calibration.max_retries,
+        "token_distribution": calibration.fit,
+    }
+    if calibration.attempts:
+        overrides["failure_rate"] = calibration.failure_rate
+    if calibration.prompt_tokens_mean > 0:
+        overrides["prompt_tokens_mean"] = calibration.prompt_tokens_mean
+        overrides["prompt_tokens_sd"] = calibration.prompt_tokens_sd
+    if calibration.completion_tokens_mean > 0:
+        overrides["completion_tokens_mean"] = calibration.completion_tokens_mean
+        overrides["completion_tokens_sd"] = calibration.completion_tokens_sd
+    if cases is not None:
+        overrides["cases"] = cases
+    return replace(base, **overrides)
+
+
+def load_calibration(path: Path) -> Calibration:
+    return Calibration.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    bases = default_strategies()
+    parser = argparse.ArgumentParser(
+        description="Fit simulator parameters from base case brief logs"
+    )
+    parser.add_argument(
+        "out_dir",
+        type=Path,
+        nargs="?",
+        default=Path("outputs"),
+        help=f"Directory holding {STATUS_LOG_NAME} and {FAILED_LOG_NAME}",
+    )
+    parser.add_argument("--fit", choices=FITS, default="normal")
+    parser.add_argument(
+        "--base",
+        type=int,
+        default=1,
+        choices=range(1, len(bases) + 1),
+        help="; ".join(f"{i}: {s.name}" for i, s in enumerate(bases, start=1)),
+    )
+    parser.add_argument(
+        "--cases", type=int, help="Cases in the next run (default: base strategy)"
+    )
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--budget", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="Write the calibration as JSON")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate_directory(args.out_dir, args.fit)
+    if not calibration.cases:
+        print(f"No processed cases found in {args.out_dir / STATUS_LOG_NAME}")
+        return 1
+    if args.save:
+        args.save.write_text(
+            json.dumps(calibration.to_dict(), indent=2), encoding="utf-8"
+        )
+
+    print(
+        f"{calibration.cases} cases, {calibration.attempts} attempts, "
+        f"{calibration.failed_cases} failed cases"
+    )
+    for level, count in calibration.attempt_levels.items():
+        print(f"  {level:<10} {count}")
+    print(
+        f"Prompt tokens {calibration.prompt_tokens_mean:.0f} ± {calibration.prompt_tokens_sd:.0f}, "
+        f"completion tokens {calibration.completion_tokens_mean:.0f} ± "
+        f"{calibration.completion_tokens_sd:.0f}, failure rate {calibration.failure_rate:.3f}"
+    )
+    strategy = calibrated_strategy(bases[args.base - 1], calibration, args.cases)
+    pretty_print(
+        [simulate(strategy, runs=args.runs, budget=args.budget, seed=args.seed)]
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,13 +4,15 @@ import json, os, sys, time, traceback, re, hashlib
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
-from tenacity import retry, stop_after_attempt, wait_exponential
-from openai import OpenAI
+from windsurf.llm import LLMClient, get_client
+from windsurf.telemetry import report_run
 
 # ---------- Paths ----------
-ROOT = Path(__file__).resolve().parents[3] if (
-    Path(__file__).parts[-3:] == ("windsurf", "tools", "grade_cards.py")
-) else Path.cwd()
+ROOT = (
+    Path(__file__).resolve().parents[3]
+    if (Path(__file__).parts[-3:] == ("windsurf", "tools", "grade_cards.py"))
+    else Path.cwd()
+)
 
 CARDS_DIR = ROOT / "src" / "jd" / "cards_yaml"
 CARDS_GLOB = CARDS_DIR / "*.yml"
@@ -23,7 +25,9 @@ META_PATH = REPORTS_DIR / "model_eval_meta.json"
 
 STATUTES_DIR = ROOT / "src" / "jd" / "statutes"
 WRONGS_ACT_FILE = STATUTES_DIR / "wa1958111.txt"
-WRONGS_ACT_TEXT = WRONGS_ACT_FILE.read_text(encoding="utf-8") if WRONGS_ACT_FILE.exists() else ""
+WRONGS_ACT_TEXT = (
+    WRONGS_ACT_FILE.read_text(encoding="utf-8") if WRONGS_ACT_FILE.exists() else ""
+)
 
 # ---------- Settings ----------
 MODEL = os.environ.get("WINDSURF_GRADE_MODEL", "gpt-4o-mini")
@@ -93,10 +97,12 @@ Rules: No hallucinated citations; minimal fixes; prefer HCA/Vic; mark UK/PC as p
 CRITICAL: At the TOP LEVEL of the JSON object include "overall_score_10": a number between 0 and 10.
 """
 
+
 # ---------- Helpers: IO ----------
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
+
 def load_meta() -> Dict[str, Any]:
     if META_PATH.exists():
         try:
@@ -105,12 +111,13 @@ def load_meta() -> Dict[str, Any]:
             return {}
     return {}
 
+
 def save_meta(meta: Dict[str, Any]) -> None:
     META_PATH.write_text(json.dumps(meta, indent=2), encoding="utf-8")
 
+
 # ---------- Model ----------
-@retry(wait=wait_exponential(multiplier=1, min=1, max=8), stop=stop_after_attempt(4))
-def call_model(client: OpenAI, card_text: str) -> str:
+def call_model(client: LLMClient, card_text: str) -> str:
     statute_block = WRONGS_ACT_TEXT[:4000] if WRONGS_ACT_TEXT else ""
     user_content = f"""Please audit the following card.
 Return ONE JSON object first, then notes.
@@ -124,29 +131,39 @@ Card:
 <<<
 {card_text}
 >>>"""
-    resp = client.chat.completions.create(
-        model=MODEL,
-        temperature=0,
-        response_format={"type": "json_object"},
-        messages=[
+    content = client.complete(
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_content},
         ],
+        tool="grade_cards",
+        model=MODEL,
+        temperature=0,
+        response_format={"type": "json_object"},
         max_tokens=MAX_OUTPUT_TOKENS,
     )
-    return resp.choices[0].message.content or "{}"
+    return content or "{}"
+
 
 def _coerce_score(obj: Dict[str, Any]) -> float | None:
-    for path in [("overall_score_10",), ("audit","overall_score_10"), ("result","overall_score_10")]:
+    for path in [
+        ("overall_score_10",),
+        ("audit", "overall_score_10"),
+        ("result", "overall_score_10"),
+    ]:
         cur = obj
         try:
-            for k in path: cur = cur[k]
-            if isinstance(cur, (int, float)): return float(cur)
-            if isinstance(cur, str): return float(cur)
+            for k in path:
+                cur = cur[k]
+            if isinstance(cur, (int, float)):
+                return float(cur)
+            if isinstance(cur, str):
+                return float(cur)
         except Exception:
             pass
     return None
 
+
 # ---------- Checklist aggregation ----------
 def _norm_statute_label(s: str) -> str:
     s2 = s.replace("Wrongs Act", "").replace("(Vic)", "").replace("Part", "Pt").strip()
@@ -155,6 +172,7 @@ def _norm_statute_label(s: str) -> str:
     s2 = s2.replace("Pt VB", "Pt VBA")  # treat VB/VBA together for your summary tick
     return s2
 
+
 def _extract_statutes_present(card: Dict[str, Any]) -> List[str]:
     items = []
     for it in card.get("statute_check", []) or []:
@@ -164,9 +182,11 @@ def _extract_statutes_present(card: Dict[str, Any]) -> List[str]:
     seen, out = set(), []
     for x in items:
         if x not in seen:
-            seen.add(x); out.append(x)
+            seen.add(x)
+            out.append(x)
     return out
 
+
 def _extract_anchors_present(card: Dict[str, Any]) -> List[str]:
     items = []
     for it in card.get("anchors_check", []) or []:
@@ -176,9 +196,11 @@ def _extract_anchors_present(card: Dict[str, Any]) -> List[str]:
     seen, out = set(), []
     for x in items:
         if x not in seen:
-            seen.add(x); out.append(x)
+            seen.add(x)
+            out.append(x)
     return out
 
+
 def _tripwires_info(card: Dict[str, Any]) -> Tuple[bool, List[str], int]:
     tw = card.get("tripwires", {}) or {}
     count = int(tw.get("current_count") or 0)
@@ -188,6 +210,7 @@ def _tripwires_info(card: Dict[str, Any]) -> Tuple[bool, List[str], int]:
     ok = (count == 4) and (len(uniq) == 4)
     return ok, tw_list, count
 
+
 def _diagram_ok(card: Dict[str, Any]) -> Tuple[bool, Dict[str, int]]:
     dg = card.get("diagram_check", {}) or {}
     top = int(dg.get("top_level_branches") or 0)
@@ -195,10 +218,14 @@ def _diagram_ok(card: Dict[str, Any]) -> Tuple[bool, Dict[str, int]]:
     ok = (dg.get("status") == "ok") and (top == 5) and (total <= 12)
     return ok, {"top_branches": top, "total_nodes": total}
 
+
 def _hash_list(items: List[str]) -> str:
     return hashlib.md5("|".join(items).encode("utf-8")).hexdigest() if items else ""
 
-def _compute_delta(prev_meta: Dict[str, Any], card_id: str, now_meta: Dict[str, Any]) -> List[str]:
+
+def _compute_delta(
+    prev_meta: Dict[str, Any], card_id: str, now_meta: Dict[str, Any]
+) -> List[str]:
     bits: List[str] = []
     prev = prev_meta.get(card_id, {})
 
@@ -209,20 +236,36 @@ def _compute_delta(prev_meta: Dict[str, Any], card_id: str, now_meta: Dict[str,
             # Normalise a touch for readability
             def nn(x: str) -> str:
                 return _norm_statute_label(x) if label == "statutes" else x
-            bits.append(label + " " + " ".join(["+"+nn(x) for x in add] + ["-"+nn(x) for x in rem]))
 
-    list_delta("statutes", now_meta.get("statutes_present", []), prev.get("statutes_present", []))
-    list_delta("anchors",  now_meta.get("anchors_present",  []), prev.get("anchors_present",  []))
+            bits.append(
+                label
+                + " "
+                + " ".join(["+" + nn(x) for x in add] + ["-" + nn(x) for x in rem])
+            )
+
+    list_delta(
+        "statutes",
+        now_meta.get("statutes_present", []),
+        prev.get("statutes_present", []),
+    )
+    list_delta(
+        "anchors", now_meta.get("anchors_present", []), prev.get("anchors_present", [])
+    )
 
-    if now_meta.get("tripwires_hash") and now_meta["tripwires_hash"] != prev.get("tripwires_hash"):
+    if now_meta.get("tripwires_hash") and now_meta["tripwires_hash"] != prev.get(
+        "tripwires_hash"
+    ):
         bits.append("tripwires Δ")
 
     return bits
 
-def build_checklist_note(card: Dict[str, Any], prev_meta: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+
+def build_checklist_note(
+    card: Dict[str, Any], prev_meta: Dict[str, Any]
+) -> Tuple[str, Dict[str, Any]]:
     # Gather current
     statutes_present = _extract_statutes_present(card)
-    anchors_present  = _extract_anchors_present(card)
+    anchors_present = _extract_anchors_present(card)
     tripwires_ok, tw_list, tw_count = _tripwires_info(card)
     diagram_ok, diag_info = _diagram_ok(card)
 
@@ -241,12 +284,14 @@ def build_checklist_note(card: Dict[str, Any], prev_meta: Dict[str, Any]) -> Tup
 
     # Spotlight the core four (presence, not completeness)
     core = ["s 48", "s 49", "s 51", "s 52"]
-    core_found = [c for c in core if any(c in _norm_statute_label(s) for s in statutes_present)]
+    core_found = [
+        c for c in core if any(c in _norm_statute_label(s) for s in statutes_present)
+    ]
     core_ok = bool(core_found)
     core_str = ",".join(c.replace(" ", "") for c in core_found) if core_found else "—"
 
     # Pt XI / Pt VBA quick flags
-    has_pt_xi  = any("Pt XI"  in _norm_statute_label(s) for s in statutes_present)
+    has_pt_xi = any("Pt XI" in _norm_statute_label(s) for s in statutes_present)
     has_pt_vba = any("Pt VBA" in _norm_statute_label(s) for s in statutes_present)
 
     anchors_str = ", ".join(anchors_present) if anchors_present else "—"
@@ -264,6 +309,7 @@ def build_checklist_note(card: Dict[str, Any], prev_meta: Dict[str, Any]) -> Tup
     persisted = {card_id: cur_meta}
     return note, persisted
 
+
 # ---------- Main ----------
 def main() -> int:
     print(f"[info] ROOT: {ROOT}")
@@ -278,7 +324,7 @@ def main() -> int:
         print("[error] No cards found. Check CARDS_DIR.")
         return 2
 
-    client = OpenAI()
+    client = get_client()
     results: List[Dict[str, Any]] = []
     failures = 0
 
@@ -324,10 +370,18 @@ def main() -> int:
     missing_scores = 0
     for r in results:
         score = _coerce_score(r)
-        score_disp = f"{int(score) if isinstance(score, float) and score.is_integer() else score}" if isinstance(score, (int,float)) else "—"
+        score_disp = (
+            f"{int(score) if isinstance(score, float) and score.is_integer() else score}"
+            if isinstance(score, (int, float))
+            else "—"
+        )
         if score is None:
             missing_scores += 1
-        pass_flag = "✅" if isinstance(score, (int,float)) and score >= PASS_THRESHOLD else "❌"
+        pass_flag = (
+            "✅"
+            if isinstance(score, (int, float)) and score >= PASS_THRESHOLD
+            else "❌"
+        )
 
         # Checklist note (replaces boilerplate)
         note, per_card_meta = build_checklist_note(r, prev_meta_all)
@@ -345,9 +399,12 @@ def main() -> int:
     print(f"[done] Wrote: {md_path}")
     print(f"[done] Wrote meta: {META_PATH}")
     if missing_scores:
-        print(f"[warn] {missing_scores} card(s) had no 'overall_score_10' — showed '—' in the table.")
+        print(
+            f"[warn] {missing_scores} card(s) had no 'overall_score_10' — showed '—' in the table."
+        )
     if failures:
         print(f"[warn] {failures} card(s) failed; see errors above.")
+    report_run()
 
     # Guard-rails (fail CI if obvious problems)
     zero_like = [r for r in results if _coerce_score(r) in (None, 0.0)]
@@ -357,5 +414,6 @@ def main() -> int:
 
     return 0
 
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -7,11 +7,15 @@ user brief:
    a ranked list of candidate URLs.
 2. ``LegalDocumentFetcher`` downloads a judgment (HTML or PDF) and normalises it
    into ``Paragraph`` instances while preserving bracketed paragraph markers.
+   PDFs are handed to ``PagedPdfExtractor`` which reads page ranges across a
+   process pool and records the page each paragraph starts on.
 3. ``slice_candidate_paragraphs`` narrows the document to a handful of
    paragraphs around keyword hits in order to keep token usage low when the
    paragraphs are handed to an LLM.
 4. ``build_pinpoint_prompt`` produces a deterministic instruction string that
    forces the model to verify the pinpoint using the provided paragraphs only.
+   ``pack_pinpoint_prompt`` does the same within a token budget and reports
+   the estimated prompt size.
 
 All functionality is synchronous and dependency free beyond the standard Python
 libraries listed in ``requirements.txt``.  The public API favours pure
@@ -21,13 +25,30 @@ OpenAI function-calling loop.
 
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from html import unescape
 from html.parser import HTMLParser
-from typing import Iterable, List, Sequence
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
 from urllib.parse import urlencode, urljoin
 import logging
+import os
 import re
+import sys
 
 try:  # ``requests`` keeps the API ergonomic but is optional.
     import requests  # type: ignore
@@ -50,12 +71,97 @@ except Exception:  # pragma: no cover - pdfminer is optional.
 LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Paragraph:
-    """A normalised paragraph extracted from a judgment."""
+    """A normalised paragraph extracted from a judgment.
+
+    ``page`` is the 1-based PDF page holding the paragraph marker and
+    ``offset`` the character offset of the marker within that page's
+    normalised text.  HTML sources have no pages, so ``page`` stays ``None``
+    and ``offset`` is relative to the whole document.
+    """
 
     para_no: str
     text: str
+    page: int | None = None
+    offset: int | None = None
+
+
+class ParagraphTable(Sequence[Paragraph]):
+    """Compact, read-only store for the paragraphs of one judgment.
+
+    Paragraph bodies live in one contiguous string addressed by an offsets
+    array.  Markers are unique within a judgment, so they are kept as a plain
+    list of strings, interned with ``sys.intern`` so ``[1]`` to ``[400]`` are
+    shared by every live table without a pool of their own.  Indexing materialises a ``Paragraph`` on demand, so the table can be passed
+    anywhere a ``Sequence[Paragraph]`` is expected, while ``text_at`` and
+    ``iter_text`` read bodies without building objects.
+    """
+
+    __slots__ = ("_text", "_bounds", "_markers", "_pages", "_page_offsets")
+
+    def __init__(self, paragraphs: Iterable[Paragraph] = ()) -> None:
+        bodies: List[str] = []
+        self._markers: List[str] = []
+        self._bounds = array("I", [0])
+        self._pages = array("i")
+        self._page_offsets = array("i")
+        cursor = 0
+        for para in paragraphs:
+            bodies.append(para.text)
+            cursor += len(para.text)
+            self._bounds.append(cursor)
+            self._markers.append(sys.intern(para.para_no))
+            self._pages.append(-1 if para.page is None else para.page)
+            self._page_offsets.append(-1 if para.offset is None else para.offset)
+        self._text = "".join(bodies)
+
+    def __len__(self) -> int:
+        return len(self._markers)
+
+    @overload
+    def __getitem__(self, index: int) -> Paragraph: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Paragraph]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ParagraphTable index out of range")
+        page = self._pages[index]
+        offset = self._page_offsets[index]
+        return Paragraph(
+            para_no=self.para_no_at(index),
+            text=self.text_at(index),
+            page=None if page < 0 else page,
+            offset=None if offset < 0 else offset,
+        )
+
+    def para_no_at(self, index: int) -> str:
+        return self._markers[index]
+
+    def text_at(self, index: int) -> str:
+        return self._text[self._bounds[index] : self._bounds[index + 1]]
+
+    def iter_text(self) -> Iterator[str]:
+        """Yield paragraph bodies in document order."""
+
+        bounds = self._bounds
+        text = self._text
+        for idx in range(len(self)):
+            yield text[bounds[idx] : bounds[idx + 1]]
+
+    def index_of(self, para_no: str) -> int:
+        """Return the position of ``para_no`` or raise ``ValueError``."""
+
+        try:
+            return self._markers.index(para_no)
+        except ValueError:
+            raise ValueError(f"{para_no} is not in the table") from None
 
 
 @dataclass(frozen=True)
@@ -71,11 +177,35 @@ class PinpointResult:
 
 
 class PinpointVerifier:
-    """Orchestrate search, fetch and quote selection for batch verification."""
+    """Orchestrate search, fetch and quote selection for batch verification.
+
+    ``retriever`` optionally replaces keyword slicing for candidate selection.
+    It is called as ``retriever(paragraphs, proposition, keywords=...,
+    max_total=...)`` and must return paragraphs in document order; see
+    ``windsurf.tools.paragraph_index.SemanticRetriever``.
+
+    ``stop_window`` lets the fetcher stop reading that many paragraphs past
+    the target (see ``LegalDocumentFetcher.fetch_and_normalise``), which keeps
+    the neighbours candidate selection looks at.  It defaults to
+    ``CANDIDATE_WINDOW`` with the default fetcher; a custom fetcher is passed
+    ``stop_after=`` only when ``stop_window`` is given.
+    """
 
-    def __init__(self, searcher=None, fetcher=None) -> None:
+    def __init__(
+        self,
+        searcher=None,
+        fetcher=None,
+        retriever=None,
+        stop_window: int | None = None,
+    ) -> None:
+        if fetcher is None:
+            fetcher = LegalDocumentFetcher().fetch_and_normalise
+            if stop_window is None:
+                stop_window = CANDIDATE_WINDOW
         self._searcher = searcher or CaseSearchClient().search_cases
-        self._fetcher = fetcher or LegalDocumentFetcher().fetch_and_normalise
+        self._fetcher = fetcher
+        self._retriever = retriever
+        self._stop_window = stop_window
 
     def verify(
         self,
@@ -89,20 +219,31 @@ class PinpointVerifier:
     ) -> PinpointResult | None:
         """Return a ``PinpointResult`` when a matching paragraph is found."""
 
+        stop_after = None
+        if self._stop_window is not None:
+            stop_after = _marker_after(target_para, self._stop_window)
         urls = self._searcher(query)
         for url in urls:
             try:
-                paragraphs = self._fetcher(url)
+                if stop_after is None:
+                    paragraphs = self._fetcher(url)
+                else:
+                    paragraphs = self._fetcher(url, stop_after=stop_after)
             except (
                 Exception
             ):  # pragma: no cover - network/parse errors handled upstream.
                 continue
-            candidates = slice_candidate_paragraphs(
-                paragraphs,
-                keywords=keywords or [],
-                window=2,
-                max_total=6,
-            )
+            if self._retriever is not None:
+                candidates = self._retriever(
+                    paragraphs, proposition, keywords=keywords or [], max_total=6
+                )
+            else:
+                candidates = slice_candidate_paragraphs(
+                    paragraphs,
+                    keywords=keywords or [],
+                    window=CANDIDATE_WINDOW,
+                    max_total=6,
+                )
             target = next(
                 (para for para in candidates if para.para_no == target_para), None
             )
@@ -170,15 +311,133 @@ class CaseSearchClient:
         return [urljoin(self.SEARCH_ENDPOINT, link) for link in parser.links]
 
 
+PARA_PATTERN = re.compile(r"(\[\d{1,4}[A-Za-z]?\])")
+# Paragraphs kept on either side of a keyword hit or target paragraph.
+CANDIDATE_WINDOW = 2
+
+_PdfSource = Union[bytes, str]
+
+
+class PagedPdfExtractor:
+    """Extract paragraphs from a PDF, reading it one page range at a time.
+
+    With PyMuPDF available the document is cut into chunks of
+    ``pages_per_chunk`` pages and each chunk is read in a worker process.
+    Every worker opens the document once when it starts, and chunks are
+    submitted at most ``workers`` ahead of the one being consumed, in document
+    order, so when ``stop_after`` names a paragraph marker no more chunks are
+    read once that paragraph (and the marker that closes it) has been seen.
+    Documents that fit in a single chunk are read in-process to avoid the pool
+    start-up cost.  ``extract_file`` hands workers the path instead of the
+    bytes.
+    pdfminer is used as a sequential fallback; its form-feed page separators
+    still allow page numbers to be recorded.
+    """
+
+    def __init__(self, workers: int | None = None, pages_per_chunk: int = 8) -> None:
+        if pages_per_chunk < 1:
+            raise ValueError("pages_per_chunk must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_chunk = pages_per_chunk
+
+    def extract(self, data: bytes, stop_after: str | None = None) -> List[Paragraph]:
+        """Return paragraphs from ``data`` with their page and page offset."""
+
+        return _split_paragraphs(self._iter_pages(data, stop_after))
+
+    def extract_file(
+        self, path: str | os.PathLike, stop_after: str | None = None
+    ) -> List[Paragraph]:
+        """Like ``extract`` for a PDF on disk, which workers open themselves."""
+
+        return _split_paragraphs(self._iter_pages(os.fspath(path), stop_after))
+
+    def _iter_pages(self, source: _PdfSource, stop_after: str | None) -> Iterable[str]:
+        scan = _MarkerScan(stop_after)
+        pages = self._read_pages(source)
+        try:
+            for page_text in pages:
+                cleaned = _normalise_whitespace(page_text)
+                yield cleaned
+                if scan.feed(cleaned):
+                    LOGGER.debug("Stopping PDF extraction after %s", stop_after)
+                    return
+        finally:
+            pages.close()
+
+    def _read_pages(self, source: _PdfSource) -> Iterable[str]:
+        if fitz is not None:  # pragma: no cover - PyMuPDF is optional in CI.
+            yield from self._read_pages_fitz(source)
+        elif extract_text is not None:
+            from io import BytesIO
+
+            if isinstance(source, bytes):
+                source = BytesIO(source)
+            yield from extract_text(source).split("\f")
+        else:  # pragma: no cover - executed only when both libs missing.
+            raise RuntimeError(
+                "No PDF extraction backend available. Install PyMuPDF or pdfminer.six."
+            )
+
+    def _read_pages_fitz(self, source: _PdfSource) -> Iterable[str]:  # pragma: no cover
+        with _open_pdf(source) as doc:
+            page_count = doc.page_count
+            if page_count <= self.pages_per_chunk or self.workers <= 1:
+                for index in range(page_count):
+                    yield doc[index].get_text("text")
+                return
+
+        ranges = iter(
+            [
+                (start, min(start + self.pages_per_chunk, page_count))
+                for start in range(0, page_count, self.pages_per_chunk)
+            ]
+        )
+        workers = min(self.workers, -(-page_count // self.pages_per_chunk))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_open_worker_document,
+            initargs=(source,),
+        )
+        try:
+            pending: Deque[Future] = deque(
+                executor.submit(_extract_worker_pages, start, stop)
+                for start, stop in _take(ranges, workers)
+            )
+            while pending:
+                texts = pending.popleft().result()
+                for start, stop in _take(ranges, 1):
+                    pending.append(executor.submit(_extract_worker_pages, start, stop))
+                yield from texts
+        finally:
+            # Reached on exhaustion and when the consumer stops early; chunks
+            # already queued are dropped rather than parsed.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 class LegalDocumentFetcher:
     """Fetch and normalise AustLII/BAILII/JADE documents into paragraphs."""
 
-    PARA_PATTERN = re.compile(r"(\[\d{1,4}[A-Za-z]?\])")
+    PARA_PATTERN = PARA_PATTERN
 
-    def __init__(self, session: object | None = None) -> None:
+    def __init__(
+        self,
+        session: object | None = None,
+        pdf_extractor: PagedPdfExtractor | None = None,
+    ) -> None:
         self.session = session or _build_default_session()
+        self.pdf_extractor = pdf_extractor or PagedPdfExtractor()
+
+    def fetch_and_normalise(
+        self, url: str, stop_after: str | None = None
+    ) -> List[Paragraph]:
+        """Fetch ``url`` and return its paragraphs.
+
+        ``stop_after`` is a paragraph marker such as ``"[12]"``.  For PDFs the
+        extraction stops once that paragraph is complete, so the result may
+        omit the rest of the judgment.
+        """
 
-    def fetch_and_normalise(self, url: str) -> List[Paragraph]:
         LOGGER.debug("Fetching document url=%s", url)
         try:
             response = self.session.get(url, timeout=60)
@@ -188,9 +447,22 @@ class LegalDocumentFetcher:
             return []
         content_type = response.headers.get("content-type", "").lower()
         if "pdf" in content_type or url.lower().endswith(".pdf"):
-            return self._extract_from_pdf(response.content)
+            return self._extract_from_pdf(response.content, stop_after=stop_after)
         return self.parse_html(response.text)
 
+    def load_file(
+        self, path: str | os.PathLike, stop_after: str | None = None
+    ) -> List[Paragraph]:
+        """Return the paragraphs of a local judgment (PDF by suffix, else HTML).
+
+        ``stop_after`` applies to PDFs as in ``fetch_and_normalise``.
+        """
+
+        path = Path(path)
+        if path.suffix.lower() == ".pdf":
+            return self.pdf_extractor.extract_file(path, stop_after=stop_after)
+        return self.parse_html(path.read_text(encoding="utf-8"))
+
     def parse_html(self, html: str) -> List[Paragraph]:
         """Normalise HTML text while preserving paragraph numbers."""
 
@@ -199,36 +471,17 @@ class LegalDocumentFetcher:
         text = extractor.get_text()
         return self._extract_paragraphs(text)
 
-    def _extract_from_pdf(self, data: bytes) -> List[Paragraph]:
+    def _extract_from_pdf(
+        self, data: bytes, stop_after: str | None = None
+    ) -> List[Paragraph]:
         """Extract and normalise PDF content using PyMuPDF or pdfminer."""
 
-        if fitz is not None:  # pragma: no cover - PyMuPDF is optional in CI.
-            with fitz.open(stream=data, filetype="pdf") as doc:
-                pages = [page.get_text("text") for page in doc]
-            text = "\n".join(pages)
-        elif extract_text is not None:
-            from io import BytesIO
-
-            text = extract_text(BytesIO(data))
-        else:  # pragma: no cover - executed only when both libs missing.
-            raise RuntimeError(
-                "No PDF extraction backend available. Install PyMuPDF or pdfminer.six."
-            )
-        return self._extract_paragraphs(text)
+        return self.pdf_extractor.extract(data, stop_after=stop_after)
 
     def _extract_paragraphs(self, raw_text: str) -> List[Paragraph]:
-        cleaned = re.sub(r"\s+", " ", raw_text.replace("\xa0", " ")).strip()
-        if not cleaned:
-            return []
-        parts = self.PARA_PATTERN.split(cleaned)
-        paragraphs: List[Paragraph] = []
-        for idx in range(1, len(parts), 2):
-            para_no = parts[idx].strip()
-            if not para_no:
-                continue
-            body = parts[idx + 1].strip() if idx + 1 < len(parts) else ""
-            if body:
-                paragraphs.append(Paragraph(para_no=para_no, text=body))
+        paragraphs = _split_paragraphs([_normalise_whitespace(raw_text)])
+        for para in paragraphs:
+            para.page = None
         return paragraphs
 
 
@@ -256,9 +509,14 @@ def slice_candidate_paragraphs(
     if not keywords_lower:
         return list(paragraphs[:max_total])
 
+    if isinstance(paragraphs, ParagraphTable):
+        texts: Iterable[str] = paragraphs.iter_text()
+    else:
+        texts = (para.text for para in paragraphs)
+
     selected: List[int] = []
-    for idx, para in enumerate(paragraphs):
-        text_lower = para.text.lower()
+    for idx, text in enumerate(texts):
+        text_lower = text.lower()
         if any(keyword in text_lower for keyword in keywords_lower):
             for neighbour in range(idx - window, idx + window + 1):
                 if 0 <= neighbour < len(paragraphs) and neighbour not in selected:
@@ -269,17 +527,133 @@ def slice_candidate_paragraphs(
     return sliced[:max_total]
 
 
+@dataclass(frozen=True)
+class PackedPrompt:
+    """A pinpoint prompt together with what was packed into it."""
+
+    prompt: str
+    estimated_tokens: int
+    para_nos: List[str]
+    truncated: List[str]
+    over_budget: bool = False
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token for English)."""
+
+    return -(-len(text) // 4)
+
+
+ELLIPSIS = "[...]"
+
+
 def build_pinpoint_prompt(
     paragraphs: Sequence[Paragraph],
     case_name: str,
     proposition: str,
+    *,
+    token_budget: int | None = None,
+    target_para: str | None = None,
+    keywords: Iterable[str] | None = None,
 ) -> str:
-    """Create a deterministic prompt instructing the model to verify a pinpoint."""
+    """Create a deterministic prompt instructing the model to verify a pinpoint.
+
+    Without ``token_budget`` every paragraph is included in full.  With a
+    budget the paragraphs are packed by ``pack_pinpoint_prompt``.
+    """
+
+    if token_budget is None:
+        if not paragraphs:
+            raise ValueError("No paragraphs supplied for pinpoint verification.")
+        para_lines = [f"{para.para_no} {para.text}" for para in paragraphs]
+        return _render_prompt(case_name, proposition, para_lines)
+    return pack_pinpoint_prompt(
+        paragraphs,
+        case_name,
+        proposition,
+        token_budget=token_budget,
+        target_para=target_para,
+        keywords=keywords,
+    ).prompt
+
+
+def pack_pinpoint_prompt(
+    paragraphs: Sequence[Paragraph],
+    case_name: str,
+    proposition: str,
+    *,
+    token_budget: int,
+    target_para: str | None = None,
+    keywords: Iterable[str] | None = None,
+    min_excerpt_tokens: int = 24,
+) -> PackedPrompt:
+    """Pack candidate paragraphs into a prompt of at most ``token_budget`` tokens.
+
+    The target paragraph is always kept whole.  The remaining candidates are
+    ranked by keyword hits and then by distance from the target; each is
+    included in full while it fits, otherwise cut down to an excerpt around
+    its first keyword hit marked with ``[...]``.  Candidates that cannot get
+    ``min_excerpt_tokens`` are dropped.  Paragraphs keep document order in the
+    prompt.  ``over_budget`` is set when the instructions plus the target
+    alone exceed the budget.
+    """
 
     if not paragraphs:
         raise ValueError("No paragraphs supplied for pinpoint verification.")
 
-    para_lines = [f"{para.para_no} {para.text}" for para in paragraphs]
+    keywords_lower = [kw.lower() for kw in keywords or [] if kw]
+    header_tokens = estimate_tokens(_render_prompt(case_name, proposition, []))
+    remaining = token_budget - header_tokens
+    lines: Dict[int, str] = {}
+    truncated: List[str] = []
+
+    target_idx = next(
+        (idx for idx, para in enumerate(paragraphs) if para.para_no == target_para),
+        None,
+    )
+    if target_idx is not None:
+        target = paragraphs[target_idx]
+        lines[target_idx] = f"{target.para_no} {target.text}"
+        remaining -= estimate_tokens(lines[target_idx]) + 1
+
+    def rank(idx: int) -> tuple:
+        text_lower = paragraphs[idx].text.lower()
+        hits = sum(text_lower.count(keyword) for keyword in keywords_lower)
+        distance = abs(idx - target_idx) if target_idx is not None else 0
+        return (-hits, distance, idx)
+
+    others = sorted(
+        (idx for idx in range(len(paragraphs)) if idx != target_idx), key=rank
+    )
+    for idx in others:
+        para = paragraphs[idx]
+        line = f"{para.para_no} {para.text}"
+        cost = estimate_tokens(line) + 1
+        if cost <= remaining:
+            lines[idx] = line
+            remaining -= cost
+            continue
+        allowance = remaining - estimate_tokens(para.para_no) - 2
+        if allowance < min_excerpt_tokens:
+            continue
+        excerpt = _excerpt_around(para.text, keywords_lower, max_chars=allowance * 4)
+        lines[idx] = f"{para.para_no} {excerpt}"
+        remaining -= estimate_tokens(lines[idx]) + 1
+        truncated.append(para.para_no)
+
+    ordered = sorted(lines)
+    para_nos = [paragraphs[idx].para_no for idx in ordered]
+    prompt = _render_prompt(case_name, proposition, [lines[idx] for idx in ordered])
+    return PackedPrompt(
+        prompt=prompt,
+        estimated_tokens=estimate_tokens(prompt),
+        para_nos=para_nos,
+        truncated=[para_no for para_no in para_nos if para_no in truncated],
+        over_budget=remaining < 0,
+    )
+
+
+def _render_prompt(case_name: str, proposition: str, para_lines: List[str]) -> str:
     para_blob = "\n".join(para_lines)
     return (
         "You verify legal pinpoints.\n"
@@ -294,6 +668,33 @@ def build_pinpoint_prompt(
     )
 
 
+def _excerpt_around(text: str, keywords_lower: Sequence[str], max_chars: int) -> str:
+    """Return at most ``max_chars`` of ``text`` centred on the first keyword hit."""
+
+    marker_room = 2 * (len(ELLIPSIS) + 1)
+    max_chars = max(max_chars - marker_room, 1)
+    if len(text) <= max_chars:
+        return text
+    text_lower = text.lower()
+    hits = [pos for pos in (text_lower.find(kw) for kw in keywords_lower) if pos >= 0]
+    centre = min(hits) if hits else 0
+    start = max(0, min(centre - max_chars // 2, len(text) - max_chars))
+    end = start + max_chars
+    # Snap to word boundaries so the excerpt never splits a word.
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < end else start
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+    excerpt = text[start:end].strip()
+    if start > 0:
+        excerpt = f"{ELLIPSIS} {excerpt}"
+    if end < len(text):
+        excerpt = f"{excerpt} {ELLIPSIS}"
+    return excerpt
+
+
 def build_tool_specification() -> List[dict]:
     """Return a minimal tool specification for OpenAI function-calling."""
 
@@ -327,16 +728,124 @@ def build_tool_specification() -> List[dict]:
 
 __all__ = [
     "Paragraph",
+    "ParagraphTable",
     "PinpointResult",
     "PinpointVerifier",
     "CaseSearchClient",
     "LegalDocumentFetcher",
+    "PagedPdfExtractor",
     "slice_candidate_paragraphs",
+    "PackedPrompt",
+    "estimate_tokens",
     "build_pinpoint_prompt",
+    "pack_pinpoint_prompt",
     "build_tool_specification",
 ]
 
 
+def _normalise_whitespace(text: str) -> str:
+    return re.sub(r"\s+", " ", text.replace("\xa0", " ")).strip()
+
+
+def _marker_after(para_no: str, count: int) -> Optional[str]:
+    """The marker ``count`` paragraphs after ``para_no`` (``"[12A]"`` -> ``"[14]"``)."""
+
+    match = re.match(r"\[(\d+)", para_no.strip())
+    if match is None:
+        return None
+    return f"[{int(match.group(1)) + count}]"
+
+
+def _take(items: Iterator, count: int) -> List:
+    return [item for _, item in zip(range(count), items)]
+
+
+def _open_pdf(source: _PdfSource):
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+_WORKER_DOCUMENT = None
+
+
+def _open_worker_document(source: _PdfSource) -> None:
+    """Pool initializer: open the document once for every chunk this worker reads."""
+
+    global _WORKER_DOCUMENT
+    _WORKER_DOCUMENT = _open_pdf(source)
+
+
+def _extract_worker_pages(start: int, stop: int) -> List[str]:
+    """Return raw text for pages ``start``..``stop - 1`` (pool worker entry)."""
+
+    return [_WORKER_DOCUMENT[index].get_text("text") for index in range(start, stop)]
+
+
+def _split_paragraphs(pages: Iterable[str]) -> List[Paragraph]:
+    """Split normalised page texts into paragraphs keeping page positions.
+
+    Pages are joined with a single space, which matches collapsing the
+    whitespace of the concatenated document, so paragraph bodies are the
+    same as a whole-document split.  Paragraphs may run across pages; they are
+    attributed to the page holding their marker.
+    """
+
+    page_starts: List[int] = []
+    chunks: List[str] = []
+    cursor = 0
+    for page_text in pages:
+        if not page_text:
+            page_starts.append(cursor)
+            continue
+        if chunks:
+            cursor += 1
+        page_starts.append(cursor)
+        chunks.append(page_text)
+        cursor += len(page_text)
+    text = " ".join(chunks)
+    if not text:
+        return []
+
+    markers = list(PARA_PATTERN.finditer(text))
+    paragraphs: List[Paragraph] = []
+    for idx, match in enumerate(markers):
+        end = markers[idx + 1].start() if idx + 1 < len(markers) else len(text)
+        body = text[match.end() : end].strip()
+        if not body:
+            continue
+        page_index = bisect_right(page_starts, match.start()) - 1
+        paragraphs.append(
+            Paragraph(
+                para_no=match.group(1),
+                text=body,
+                page=page_index + 1,
+                offset=match.start() - page_starts[page_index],
+            )
+        )
+    return paragraphs
+
+
+class _MarkerScan:
+    """Track paragraph markers across pages to decide when to stop early."""
+
+    def __init__(self, target: Optional[str]) -> None:
+        self.target = target
+        self.seen_target = False
+
+    def feed(self, page_text: str) -> bool:
+        """Return ``True`` once the target paragraph has been closed."""
+
+        if self.target is None:
+            return False
+        for match in PARA_PATTERN.finditer(page_text):
+            if self.seen_target:
+                return True
+            if match.group(1) == self.target:
+                self.seen_target = True
+        return False
+
+
 def _build_default_session() -> object:
     if requests is not None:
         return requests.Session()
@@ -0,0 +1,179 @@
+"""Structural model and checks for Mermaid mindmap diagrams.
+
+Both the card ``SchemaValidator`` and the Monte Carlo diagram optimiser need
+the same facts about a mindmap: its branches, the children under each branch
+and the node counts.  ``MindmapStructure`` holds those facts.  It can be
+parsed from diagram text in one pass (``parse_mindmap``) or built directly
+from an in-memory candidate, and ``structure_errors`` applies the policy
+limits to it without re-rendering or re-parsing anything.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Optional, Sequence
+import re
+
+_FENCE_RE = re.compile(r"```\s*(\w+)\s*(.*?)```", re.DOTALL)
+# Characters Mermaid's mindmap lexer reads as node shape delimiters.
+_SHAPE_CHARS = frozenset('()[]{}"')
+
+
+@dataclass
+class MindmapStructure:
+    """Branches of a mindmap and the descendants under each branch.
+
+    ``root`` is ``None`` when the diagram has several top-level nodes and no
+    single root node.  ``total_nodes`` counts every node line, including the
+    root and the branch labels.
+    """
+
+    root: Optional[str]
+    branches: List[str]
+    children: List[List[str]] = field(default_factory=list)
+    total_nodes: int = 0
+
+    @classmethod
+    def from_branches(
+        cls,
+        root: Optional[str],
+        branches: Sequence[str],
+        children: Mapping[str, Sequence[str]],
+    ) -> "MindmapStructure":
+        kids = [list(children.get(label, [])) for label in branches]
+        total = (1 if root is not None else 0) + len(branches) + sum(map(len, kids))
+        return cls(root, list(branches), kids, total)
+
+    @property
+    def child_vector(self) -> List[int]:
+        return [len(kids) for kids in self.children]
+
+    @property
+    def child_count(self) -> int:
+        return sum(self.child_vector)
+
+
+def render_node(label: str, open_: str = "", close: str = "") -> str:
+    """Mermaid text for a node showing ``label``, quoted when it needs to be.
+
+    ``open_``/``close`` give the node shape (``"(("``/``"))"`` for a circle);
+    without one, a label is written bare unless it contains shape delimiters,
+    in which case it is quoted inside a square node (``["Trespass (Vic)"]``),
+    since bare text cannot carry them.
+    """
+
+    if not _SHAPE_CHARS.intersection(label):
+        return f"{open_}{label}{close}"
+    quoted = '"' + label.replace('"', "#quot;") + '"'
+    if not open_:
+        open_, close = "[", "]"
+    return f"{open_}{quoted}{close}"
+
+
+def extract_mermaid_block(text: str) -> Optional[tuple[str, str]]:
+    """Return ``(language, body)`` of the first fenced block in ``text``."""
+
+    fence = _FENCE_RE.search(text)
+    if not fence:
+        return None
+    return fence.group(1).strip().lower(), fence.group(2)
+
+
+def parse_mindmap(node_lines: Iterable[str]) -> MindmapStructure:
+    """Build a ``MindmapStructure`` from the node lines of a mindmap body.
+
+    ``node_lines`` excludes the ``mindmap`` declaration.  Nesting follows
+    indentation.  A single top-level node with children is the root and its
+    children are the branches; otherwise the top-level nodes are the branches.
+    """
+
+    labels: List[str] = []
+    parents: List[int] = []
+    stack: List[tuple[int, int]] = []  # (indent, node index)
+    for line in node_lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        indent = len(line) - len(line.lstrip())
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        parents.append(stack[-1][1] if stack else -1)
+        stack.append((indent, len(labels)))
+        labels.append(stripped)
+
+    top = [idx for idx, parent in enumerate(parents) if parent == -1]
+    root: Optional[int] = None
+    if len(top) == 1 and len(labels) > 1:
+        root = top[0]
+        branch_ids = [idx for idx, parent in enumerate(parents) if parent == root]
+    else:
+        branch_ids = top
+
+    slot = {node: position for position, node in enumerate(branch_ids)}
+    children: List[List[str]] = [[] for _ in branch_ids]
+    branch_of: dict[int, int] = {}
+    for idx, parent in enumerate(parents):
+        if idx in slot:
+            branch_of[idx] = slot[idx]
+        elif parent in branch_of:
+            branch_of[idx] = branch_of[parent]
+            children[branch_of[idx]].append(labels[idx])
+
+    return MindmapStructure(
+        root=labels[root] if root is not None else None,
+        branches=[labels[idx] for idx in branch_ids],
+        children=children,
+        total_nodes=len(labels),
+    )
+
+
+def structure_errors(
+    structure: MindmapStructure,
+    *,
+    max_total_nodes: int = 0,
+    max_child_nodes: int = 0,
+    min_branches: int = 0,
+    max_branches: int = 0,
+    expected_branches: Optional[Sequence[str]] = None,
+    allowed_child_vectors: Optional[Sequence[Sequence[int]]] = None,
+) -> List[str]:
+    """Return policy violations for ``structure``; zero limits are skipped."""
+
+    errors: List[str] = []
+    if max_total_nodes and structure.total_nodes > max_total_nodes:
+        errors.append(
+            f"Mindmap contains {structure.total_nodes} nodes but maximum is {max_total_nodes}"
+        )
+    if max_child_nodes and structure.child_count > max_child_nodes:
+        errors.append(
+            f"Mindmap contains {structure.child_count} child nodes but maximum is {max_child_nodes}"
+        )
+    found = len(structure.branches)
+    if min_branches and found < min_branches:
+        errors.append(
+            f"Mindmap must have at least {min_branches} top-level branches (found {found})"
+        )
+    if max_branches and found > max_branches:
+        errors.append(
+            f"Mindmap must have no more than {max_branches} top-level branches (found {found})"
+        )
+    if expected_branches is not None and found == len(expected_branches):
+        for expected, actual in zip(expected_branches, structure.branches):
+            if actual != expected:
+                errors.append(f"Top-level branch '{actual}' should be '{expected}'")
+    if allowed_child_vectors is not None:
+        vector = structure.child_vector
+        if not any(list(allowed) == vector for allowed in allowed_child_vectors):
+            errors.append(
+                f"Child vector {vector} not in allowed sets {[list(v) for v in allowed_child_vectors]}"
+            )
+    return errors
+
+
+__all__ = [
+    "MindmapStructure",
+    "extract_mermaid_block",
+    "parse_mindmap",
+    "render_node",
+    "structure_errors",
+]
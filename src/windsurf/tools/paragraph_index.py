@@ -0,0 +1,329 @@
+"""Paragraph-level vector index for semantic pinpoint candidate selection.
+
+``slice_candidate_paragraphs`` only keeps paragraphs that contain one of the
+caller's keywords verbatim, so a paraphrased proposition can miss the
+paragraph it is pinned to.  This module adds an optional retrieval stage:
+
+1. ``HashedTfidfEncoder`` turns paragraphs into L2-normalised TF-IDF vectors
+   using the hashing trick (unigrams and bigrams), so no vocabulary has to be
+   fitted or stored.  Any CPU-only embedding model can be plugged in instead
+   through the ``encoder`` argument of ``SemanticRetriever``.
+2. ``ParagraphIndex`` holds one vector per paragraph in a NumPy matrix and
+   ranks paragraphs against a proposition with a single matrix-vector product.
+3. ``SemanticRetriever`` builds (or loads from its disk cache) the index for a
+   judgment and returns the top-k paragraphs in document order.  Instances are
+   callables accepted by ``PinpointVerifier(retriever=...)``.
+
+NumPy is required for this module only; the rest of the pipeline keeps working
+without it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+import functools
+import hashlib
+import logging
+import re
+import threading
+import zlib
+
+try:  # NumPy is optional for the pipeline as a whole.
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - exercised only without NumPy.
+    np = None
+
+from .legal_pinpoint_pipeline import Paragraph, ParagraphTable
+
+
+LOGGER = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "their there this to was were which with".split()
+)
+
+Encoder = Callable[[Sequence[str]], "np.ndarray"]
+
+
+def _require_numpy() -> None:
+    if np is None:  # pragma: no cover - exercised only without NumPy.
+        raise RuntimeError(
+            "Semantic retrieval requires NumPy. Install it with `pip install numpy`."
+        )
+
+
+def _tokenise(text: str) -> List[str]:
+    return [tok for tok in _TOKEN_RE.findall(text.lower()) if tok not in _STOPWORDS]
+
+
+class HashedTfidfEncoder:
+    """Hashing-trick TF-IDF encoder fitted on the paragraphs of one judgment.
+
+    Tokens and adjacent-token bigrams are hashed with CRC32 (stable across
+    processes, unlike ``hash``) into ``n_features`` buckets.  Term frequencies
+    are dampened with ``1 + log(tf)`` and weighted by a smoothed IDF computed
+    over the judgment's paragraphs.
+    """
+
+    def __init__(self, n_features: int = 2048) -> None:
+        _require_numpy()
+        if n_features < 1:
+            raise ValueError("n_features must be positive")
+        self.n_features = n_features
+
+    @property
+    def fingerprint(self) -> str:
+        return f"hashed-tfidf-{self.n_features}"
+
+    def term_counts(self, texts: Sequence[str]) -> "np.ndarray":
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _tokenise(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                counts[row, zlib.crc32(feature.encode("utf-8")) % self.n_features] += 1
+        return counts
+
+    def fit_transform(self, texts: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return ``(matrix, idf)`` for ``texts``."""
+
+        counts = self.term_counts(texts)
+        doc_freq = np.count_nonzero(counts, axis=0)
+        idf = np.log((1.0 + len(texts)) / (1.0 + doc_freq)).astype(np.float32) + 1.0
+        return _normalise_rows(self._weight(counts, idf)), idf
+
+    def transform(self, texts: Sequence[str], idf: "np.ndarray") -> "np.ndarray":
+        return _normalise_rows(self._weight(self.term_counts(texts), idf))
+
+    @staticmethod
+    def _weight(counts: "np.ndarray", idf: "np.ndarray") -> "np.ndarray":
+        tf = np.zeros_like(counts)
+        mask = counts > 0
+        tf[mask] = 1.0 + np.log(counts[mask])
+        return tf * idf
+
+
+def encoder_fingerprint(encoder: Encoder, version: Optional[str] = None) -> str:
+    """Cache identity of a custom ``encoder``.
+
+    An encoder exposing a string ``fingerprint`` (as ``HashedTfidfEncoder``
+    does) names itself.  Otherwise the identity is the encoder's module and
+    qualified name plus ``version`` when given, or else its settings: the
+    arguments bound by ``functools.partial``, a function's defaults and
+    closure, or an encoder object's attributes.  Pass ``version`` for
+    encoders whose settings have no stable ``repr`` (e.g. loaded models), and
+    change it whenever the vectors they produce change.
+    """
+
+    own = getattr(encoder, "fingerprint", None)
+    if isinstance(own, str):
+        return own if version is None else f"{own}@{version}"
+    target: Any = encoder
+    settings: List[object] = []
+    while isinstance(target, functools.partial):
+        settings.extend([target.args, sorted(target.keywords.items())])
+        target = target.func
+    owner = getattr(target, "__self__", None)
+    if owner is not None and not isinstance(owner, type):
+        settings.append(_object_settings(owner))
+        target = target.__func__
+    if not hasattr(target, "__qualname__"):
+        settings.append(_object_settings(target))
+        target = type(target)
+    name = f"{getattr(target, '__module__', '?')}.{target.__qualname__}"
+    if version is not None:
+        return f"{name}@{version}"
+    settings.extend(
+        [
+            getattr(target, "__defaults__", None),
+            getattr(target, "__kwdefaults__", None),
+            [cell.cell_contents for cell in getattr(target, "__closure__", None) or ()],
+        ]
+    )
+    return f"{name}:{hashlib.sha1(repr(settings).encode('utf-8')).hexdigest()[:16]}"
+
+
+def _object_settings(obj: object) -> object:
+    state = getattr(obj, "__dict__", None)
+    return sorted(state.items()) if isinstance(state, dict) else repr(obj)
+
+
+def _normalise_rows(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class ParagraphIndex:
+    """One vector per paragraph, ranked by cosine similarity to a query."""
+
+    def __init__(
+        self,
+        matrix: "np.ndarray",
+        query_encoder: Callable[[str], "np.ndarray"],
+    ) -> None:
+        self.matrix = matrix
+        self._query_encoder = query_encoder
+
+    def __len__(self) -> int:
+        return int(self.matrix.shape[0])
+
+    def scores(self, query: str) -> "np.ndarray":
+        """Return the cosine similarity of every paragraph to ``query``."""
+
+        return self.matrix @ self._query_encoder(query)
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """Return the indices of the ``k`` best paragraphs, best first."""
+
+        if k <= 0 or not len(self):
+            return []
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        return [int(i) for i in best[np.argsort(-scores[best], kind="stable")]]
+
+
+class SemanticRetriever:
+    """Select pinpoint candidates by semantic similarity to the proposition.
+
+    Indexes are keyed by a hash of the judgment's paragraphs and the encoder
+    fingerprint (see ``encoder_fingerprint``; ``encoder_version`` overrides
+    the settings part for custom encoders).  The most recent ``memory_size`` indexes are kept in memory
+    and, when ``cache_dir`` is set, every index is also written there as an
+    ``.npz`` file so repeated verification runs skip re-encoding.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        encoder: Optional[Encoder] = None,
+        n_features: int = 2048,
+        memory_size: int = 8,
+        encoder_version: Optional[str] = None,
+    ) -> None:
+        _require_numpy()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._tfidf = HashedTfidfEncoder(n_features) if encoder is None else None
+        self._encoder = encoder
+        self._encoder_version = encoder_version
+        self._memory: "OrderedDict[str, ParagraphIndex]" = OrderedDict()
+        self._memory_size = memory_size
+        self._lock = threading.Lock()
+
+    @property
+    def fingerprint(self) -> str:
+        return encoder_fingerprint(self._tfidf or self._encoder, self._encoder_version)
+
+    def __call__(
+        self,
+        paragraphs: Sequence[Paragraph],
+        proposition: str,
+        *,
+        keywords: Iterable[str] | None = None,
+        max_total: int = 6,
+    ) -> List[Paragraph]:
+        """Return up to ``max_total`` paragraphs in document order.
+
+        ``keywords`` are folded into the query so that explicit search terms
+        still pull their paragraphs up the ranking.
+        """
+
+        if not paragraphs:
+            return []
+        query = " ".join([proposition, *(kw for kw in keywords or [] if kw)])
+        index = self.index_for(paragraphs)
+        selected = sorted(index.top_k(query, max_total))
+        return [paragraphs[i] for i in selected]
+
+    def index_for(self, paragraphs: Sequence[Paragraph]) -> ParagraphIndex:
+        texts = _paragraph_texts(paragraphs)
+        key = self._cache_key(paragraphs, texts)
+        with self._lock:
+            index = self._memory.get(key)
+            if index is not None:
+                self._memory.move_to_end(key)
+                return index
+
+        index = self._load(key) or self._build(key, texts)
+        with self._lock:
+            self._memory[key] = index
+            if len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+        return index
+
+    def _cache_key(self, paragraphs: Sequence[Paragraph], texts: Sequence[str]) -> str:
+        digest = hashlib.sha1(self.fingerprint.encode("utf-8"))
+        for para_no, text in zip(_paragraph_markers(paragraphs), texts):
+            digest.update(para_no.encode("utf-8"))
+            digest.update(b"\x1f")
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\x1e")
+        return digest.hexdigest()
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.npz"
+
+    def _load(self, key: str) -> Optional[ParagraphIndex]:
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                matrix = data["matrix"]
+                idf = data["idf"] if "idf" in data.files else None
+        except Exception as exc:  # corrupt cache entries are rebuilt.
+            LOGGER.warning("Ignoring unreadable vector cache %s: %s", path, exc)
+            return None
+        return ParagraphIndex(matrix, self._query_encoder(idf))
+
+    def _build(self, key: str, texts: Sequence[str]) -> ParagraphIndex:
+        if self._tfidf is not None:
+            matrix, idf = self._tfidf.fit_transform(texts)
+        else:
+            matrix, idf = _normalise_rows(np.asarray(self._encoder(texts))), None
+        path = self._cache_path(key)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            arrays = (
+                {"matrix": matrix} if idf is None else {"matrix": matrix, "idf": idf}
+            )
+            np.savez(path, **arrays)
+        return ParagraphIndex(matrix, self._query_encoder(idf))
+
+    def _query_encoder(
+        self, idf: Optional["np.ndarray"]
+    ) -> Callable[[str], "np.ndarray"]:
+        if self._tfidf is not None:
+            tfidf = self._tfidf
+            if idf is None:
+                raise ValueError("Cached TF-IDF index is missing its IDF vector")
+            return lambda query: tfidf.transform([query], idf)[0]
+        encoder = self._encoder
+        return lambda query: _normalise_rows(np.asarray(encoder([query])))[0]
+
+
+def _paragraph_texts(paragraphs: Sequence[Paragraph]) -> List[str]:
+    if isinstance(paragraphs, ParagraphTable):
+        return list(paragraphs.iter_text())
+    return [para.text for para in paragraphs]
+
+
+def _paragraph_markers(paragraphs: Sequence[Paragraph]) -> Iterable[str]:
+    if isinstance(paragraphs, ParagraphTable):
+        return (paragraphs.para_no_at(i) for i in range(len(paragraphs)))
+    return (para.para_no for para in paragraphs)
+
+
+__all__ = [
+    "HashedTfidfEncoder",
+    "ParagraphIndex",
+    "SemanticRetriever",
+    "encoder_fingerprint",
+]
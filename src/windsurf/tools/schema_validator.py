@@ -1,18 +1,50 @@
+"""Flashcard validation against ``cards_policy.yml``.
+
+The policy is compiled once into a ``PolicyPlan``: the ordered list of checks
+to run, each with its thresholds already resolved, and without the checks
+whose policy switches are off.  The plan is plain data, so it can be pickled
+to pool workers or cached on disk under its ``policy_hash``; ``load_plan_file``
+reuses a cached plan without parsing the policy YAML again.
+``SchemaValidator`` binds the plan to one closure per check, so
+``validate_card`` does no policy lookups.
+"""
+
 from __future__ import annotations
 
+import hashlib
 import itertools
+import json
 import math
+import os
 import re
+import string
 from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 try:  # pragma: no cover - exercised via runtime checks
     import yaml  # type: ignore
 except ImportError:  # pragma: no cover - fallback for restricted environments
     from . import yaml_fallback as yaml  # type: ignore
 
+from .mindmap import (
+    MindmapStructure,
+    extract_mermaid_block,
+    parse_mindmap,
+    structure_errors,
+)
+
+# Bump when ``compile_policy`` changes so cached plans are rebuilt.
+PLAN_VERSION = 2
+PLAN_CACHE_ENV = "WINDSURF_POLICY_PLAN_CACHE"
+# All-caps words that need no expansion when the policy does not list any
+# under ``back.abbreviations.allowed_without_expansion``.
+DEFAULT_ALLOWED_ABBREVIATIONS = frozenset(
+    {"HCA", "AGLC", "JD", "LLB", "NSW", "VIC", "SA", "WA", "QLD", "ACT"}
+)
+
 
 @dataclass
 class ValidationResult:
@@ -43,273 +75,689 @@ class AuthorityDiscipline:
     max_per_step: int
 
 
-class PolicyLoader:
-    """Utility for loading and caching policy files."""
+# ----------------------------------------------------------------------
+# Compiled policy plan
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class RuleSpec:
+    """One check to run and its resolved thresholds."""
 
-    _cache: Dict[Path, Dict] = {}
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
 
-    @classmethod
-    def load(cls, path: Path) -> Dict:
-        resolved = path.resolve()
-        if resolved in cls._cache:
-            return cls._cache[resolved]
-        with open(resolved, "r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
-        cls._cache[resolved] = data
+
+@dataclass
+class PolicyPlan:
+    """A policy compiled into the checks ``validate_card`` runs, in order."""
+
+    policy_hash: str
+    policy: Dict[str, Any]
+    headings: List[Tuple[str, str]]
+    diagram_limits: Dict[str, int]
+    rules: List[RuleSpec]
+
+    @property
+    def rule_names(self) -> List[str]:
+        return [rule.name for rule in self.rules]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["version"] = PLAN_VERSION
         return data
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PolicyPlan":
+        return cls(
+            policy_hash=str(data["policy_hash"]),
+            policy=dict(data["policy"]),
+            headings=[
+                (str(pattern), str(label)) for pattern, label in data["headings"]
+            ],
+            diagram_limits={k: int(v) for k, v in data["diagram_limits"].items()},
+            rules=[RuleSpec(str(r["name"]), dict(r["params"])) for r in data["rules"]],
+        )
+
+
+def _section(policy: Mapping[str, Any], name: str) -> Dict[str, Any]:
+    value = policy.get(name)
+    return value if isinstance(value, dict) else {}
+
+
+def _heading_label(pattern: str) -> str:
+    stripped = pattern.strip("^").replace("\\.", ".")
+    return re.sub(r"\\", "", stripped)
+
+
+def policy_hash(policy: Mapping[str, Any]) -> str:
+    """Hash of the policy content (and ``PLAN_VERSION``) keying compiled plans."""
+
+    canonical = json.dumps(policy, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(f"{PLAN_VERSION}\0{canonical}".encode("utf-8")).hexdigest()
+
+
+def compile_policy(policy: Mapping[str, Any], key: Optional[str] = None) -> PolicyPlan:
+    """Resolve every threshold in ``policy`` and list the enabled checks.
+
+    Checks are listed in the order their messages have always been reported.
+    A check is left out when its switch is off or it has nothing to check
+    (no required fields, no placeholder patterns, no uncertainty token, or
+    ``back.abbreviations.expand_on_first_use: false``); sub-checks behind
+    boolean switches are resolved to plain flags.
+    """
+
+    schema = _section(policy, "schema")
+    back = _section(policy, "back")
+    anchors = _section(policy, "anchors")
+    statutes = _section(policy, "statutes")
+    authorities = _section(policy, "authorities")
+    keywords = _section(policy, "keywords")
+    diagram = _section(policy, "diagram")
+    tripwires = _section(policy, "tripwires")
+    lint = _section(policy, "lint")
+    tags = _section(policy, "tags")
+    authority_cfg = back.get("authority_per_step") or {}
+    abbreviations = back.get("abbreviations") or {}
+    token = lint.get("allow_explicit_uncertainty_token")
+    token = token if isinstance(token, str) else None
+
+    headings = []
+    for raw_pattern in back.get("required_headings_regex", []) or []:
+        pattern_text = str(raw_pattern).replace("\\\\", "\\")
+        headings.append((pattern_text, _heading_label(pattern_text)))
+
+    rules: List[RuleSpec] = []
+
+    def add(name: str, **params: Any) -> None:
+        rules.append(RuleSpec(name, params))
+
+    required_fields = [str(name) for name in schema.get("required_fields", []) or []]
+    if required_fields:
+        add("required_fields", fields=required_fields)
+    add("tags", required=sorted({str(tag) for tag in tags.get("required", []) or []}))
+    add(
+        "keywords",
+        min_count=int(keywords.get("min", 0)),
+        max_count=int(keywords.get("max", 0) or 0),
+        recommended=list(
+            dict.fromkeys(
+                str(keyword).lower()
+                for keyword in keywords.get("recommended_include_if_relevant", []) or []
+            )
+        ),
+    )
+    add(
+        "tripwires",
+        min_count=int(tripwires.get("min", 0)),
+        max_count=int(tripwires.get("max", 0) or 0),
+        duplicate_threshold=(
+            float(tripwires.get("duplicate_similarity_threshold", 0.8))
+            if tripwires.get("enforce_distinctness", True)
+            else None
+        ),
+    )
+    add(
+        "anchors",
+        min_items=int(anchors.get("min_items", 0)),
+        max_items=int(anchors.get("max_items", 0) or 0),
+        each_item_max_words=int(anchors.get("each_item_max_words", 10**6)),
+        require_reference=bool(
+            anchors.get("require_case_or_statute_ref_per_item", False)
+        ),
+        uk_requires_note=bool(anchors.get("uk_or_persuasive_requires_note", False)),
+    )
+    if headings:
+        add(
+            "back_headings",
+            forbid_duplicates=bool(lint.get("forbid_duplicate_section_headers", False)),
+            allow_missing=bool(
+                back.get("allow_missing_blocks_if_not_applicable", False)
+            ),
+        )
+    add(
+        "back_word_counts",
+        min_words=int(back.get("min_words", 0) or 0),
+        max_words=int(back.get("max_words", 10**6) or 10**6),
+        max_sentence_words=int(back.get("max_sentence_words", 10**6) or 10**6),
+    )
+    add(
+        "authorities",
+        lead_required=bool(authority_cfg.get("lead_required", False)),
+        fallback_allowed=bool(authority_cfg.get("fallback_allowed", False)),
+        max_per_step=int(authority_cfg.get("max_per_step", 1)),
+        priority_order=[
+            str(name) for name in authorities.get("priority_order", []) or []
+        ],
+        require_citation=bool(
+            authorities.get("require_year_and_neutral_or_report_cite", False)
+        ),
+        uncertainty_token=token,
+    )
+    add(
+        "statutes",
+        operational_sections=bool(
+            statutes.get("include_only_operational_sections", False)
+        ),
+        victoria_first=bool(statutes.get("prefer_victoria_first", False)),
+        commonwealth_if_engaged=bool(
+            statutes.get("require_commonwealth_if_engaged", False)
+        ),
+    )
+    add(
+        "diagram",
+        structural=bool(diagram),
+        require_mermaid=bool(diagram.get("must_be_valid_mermaid", False)),
+        require_mindmap=diagram.get("type") == "mindmap",
+        discourage_mirroring=bool(diagram.get("discourage_heading_mirroring", False)),
+    )
+    if abbreviations.get("expand_on_first_use", True):
+        allowed = abbreviations.get("allowed_without_expansion")
+        if allowed is None:
+            allowed = DEFAULT_ALLOWED_ABBREVIATIONS
+        add("abbreviations", allowed=sorted({str(word) for word in allowed}))
+    if token:
+        add("uncertainty_token", token=token)
+    placeholders = [
+        str(pattern) for pattern in lint.get("forbid_placeholder_text_regex", []) or []
+    ]
+    if placeholders:
+        add("placeholder_text", patterns=placeholders)
+    add(
+        "repeated_sentences",
+        threshold=float(
+            lint.get("forbid_repeated_sentences_similarity_threshold", 0.8)
+        ),
+    )
+
+    return PolicyPlan(
+        policy_hash=key or policy_hash(policy),
+        policy=dict(policy),
+        headings=headings,
+        diagram_limits={
+            "max_total_nodes": int(diagram.get("max_total_nodes", 0) or 0),
+            "min_branches": int(diagram.get("top_level_branches_min", 0) or 0),
+            "max_branches": int(diagram.get("top_level_branches_max", 0) or 0),
+        },
+        rules=rules,
+    )
+
+
+_PLANS: Dict[str, PolicyPlan] = {}
+
+
+def _plan_cache_dir(cache_dir: str | Path | None) -> Optional[Path]:
+    if cache_dir is not None:
+        return Path(cache_dir)
+    env = os.environ.get(PLAN_CACHE_ENV)
+    return Path(env) if env else None
+
+
+def _read_cached_plan(cache_dir: Optional[Path], key: str) -> Optional[PolicyPlan]:
+    if cache_dir is None:
+        return None
+    path = cache_dir / f"{key}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != PLAN_VERSION:
+            return None
+        return PolicyPlan.from_dict(data)
+    except (
+        OSError,
+        ValueError,
+        KeyError,
+        TypeError,
+    ):  # missing or stale entries are rebuilt
+        return None
+
+
+def _write_cached_plan(cache_dir: Optional[Path], plan: PolicyPlan) -> None:
+    """Best effort: a plan that cannot be cached is still used in-process."""
+
+    if cache_dir is None:
+        return
+    path = cache_dir / f"{plan.policy_hash}.json"
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        text = json.dumps(plan.to_dict(), ensure_ascii=False, default=str)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_plan(
+    policy: Mapping[str, Any], cache_dir: str | Path | None = None
+) -> PolicyPlan:
+    """Return the compiled plan for ``policy``, compiling it at most once.
+
+    Plans are memoised per process by ``policy_hash``; with ``cache_dir`` (or
+    ``$WINDSURF_POLICY_PLAN_CACHE``) they are also shared across processes as
+    ``<policy_hash>.json``.
+    """
+
+    key = policy_hash(policy)
+    plan = _PLANS.get(key)
+    if plan is None:
+        directory = _plan_cache_dir(cache_dir)
+        plan = _read_cached_plan(directory, key)
+        if plan is None:
+            plan = compile_policy(policy, key)
+            _write_cached_plan(directory, plan)
+        _PLANS[key] = plan
+    return plan
+
+
+def load_plan_file(path: str | Path, cache_dir: str | Path | None = None) -> PolicyPlan:
+    """Like ``load_plan`` for a policy file, keyed by the file's bytes.
+
+    A cached plan carries the parsed policy, so a hit skips the YAML parse.
+    """
+
+    raw = Path(path).read_bytes()
+    key = hashlib.sha1(f"{PLAN_VERSION}\0".encode("utf-8") + raw).hexdigest()
+    plan = _PLANS.get(key)
+    if plan is None:
+        directory = _plan_cache_dir(cache_dir)
+        plan = _read_cached_plan(directory, key)
+        if plan is None:
+            plan = compile_policy(yaml.safe_load(raw.decode("utf-8")) or {}, key)
+            _write_cached_plan(directory, plan)
+        _PLANS[key] = plan
+    return plan
+
+
+class _HeadingMatcher:
+    """Which required heading, if any, a line starts with.
+
+    The policy patterns are joined into one alternation (tried in policy
+    order, so the first matching heading still wins); patterns that cannot
+    be combined are tried one by one.
+    """
+
+    def __init__(self, headings: List[HeadingRequirement]) -> None:
+        self.headings = headings
+        self._labels = {f"h{idx}": req.label for idx, req in enumerate(headings)}
+        self._combined: Optional[re.Pattern] = None
+        if headings:
+            alternatives = "|".join(
+                f"(?P<h{idx}>{req.pattern.pattern})" for idx, req in enumerate(headings)
+            )
+            try:
+                self._combined = re.compile(alternatives, re.IGNORECASE)
+            except re.error:  # own group names or back-references
+                self._combined = None
+
+    def label(self, line: str) -> Optional[str]:
+        if self._combined is not None:
+            match = self._combined.match(line)
+            return None if match is None else self._labels[match.lastgroup or ""]
+        for req in self.headings:
+            if req.pattern.match(line):
+                return req.label
+        return None
+
+
+_SENTENCE_SPLIT_RE = re.compile(r"[\.\?\!]")
+_WORD_RE = re.compile(r"[A-Za-z0-9']+")
+_SIMILARITY_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CAPS_RE = re.compile(r"\b([A-Z]{2,})\b")
+# "ABBR (Long form)"; "Long form (ABBR)" is found from its "(ABBR)".
+_ABBREVIATION_FIRST_RE = re.compile(r"\b([A-Z]{2,})\s*\([A-Za-z][A-Za-z\s'-]{3,}\)")
+_PARENTHESISED_ABBREVIATION_RE = re.compile(r"\(([A-Z]{2,})\)")
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+_LONG_FORM_CHARS = _ASCII_LETTERS | {"'", "-"}
+
+
+def _token_vector(text: str) -> Tuple[Counter, float]:
+    tokens = Counter(_SIMILARITY_TOKEN_RE.findall(text.lower()))
+    return tokens, math.sqrt(sum(count * count for count in tokens.values()))
+
+
+@dataclass
+class Sentence:
+    """One ``[.?!]``-delimited segment: stripped text, word count, token vector."""
+
+    text: str
+    words: int
+    tokens: Counter
+    norm: float
+
+    def similarity(self, other: "Sentence") -> float:
+        """Cosine similarity of the token counts (``0.0`` when either is empty)."""
+
+        if not self.norm or not other.norm:
+            return 0.0
+        small, large = sorted((self.tokens, other.tokens), key=len)
+        dot = sum(
+            count * large[token] for token, count in small.items() if token in large
+        )
+        return dot / (self.norm * other.norm)
+
+
+def split_sentences(text: str) -> List[Sentence]:
+    """Every segment of ``text`` split on ``.``, ``?`` and ``!``, empty ones included."""
+
+    sentences = []
+    for segment in _SENTENCE_SPLIT_RE.split(text):
+        tokens, norm = _token_vector(segment)
+        sentences.append(
+            Sentence(segment.strip(), len(_WORD_RE.findall(segment)), tokens, norm)
+        )
+    return sentences
+
+
+class BackTextAnalysis:
+    """A card's ``back`` text, tokenised once and shared by every check.
+
+    Sections (split on the policy headings, one regex match per line) are
+    built eagerly; sentences, the word count and the all-caps tokens with
+    their first offsets are computed on first use, so checks the plan leaves
+    out cost nothing.
+    """
+
+    def __init__(self, text: str, headings: Optional[_HeadingMatcher] = None) -> None:
+        self.text = text
+        self.sections: Dict[str, str] = {}
+        self.section_lines: Dict[str, List[str]] = {}
+        self.heading_count: Dict[str, int] = defaultdict(int)
+        if text and headings is not None:
+            self._split_sections(headings)
+
+    def _split_sections(self, headings: _HeadingMatcher) -> None:
+        current: Optional[str] = None
+        buffer: List[str] = []
+        for raw_line in self.text.splitlines():
+            label = headings.label(raw_line.strip())
+            if label is None:
+                if current is not None:
+                    buffer.append(raw_line)
+                continue
+            if current is not None:
+                self._close_section(current, buffer)
+            current = label
+            self.heading_count[current] += 1
+            buffer = []
+        if current is not None:
+            self._close_section(current, buffer)
+
+    def _close_section(self, label: str, buffer: List[str]) -> None:
+        self.sections[label] = "\n".join(buffer).strip()
+        self.section_lines[label] = [line.strip() for line in buffer if line.strip()]
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def sentences(self) -> List[Sentence]:
+        return split_sentences(self.text)
+
+    @cached_property
+    def word_count(self) -> int:
+        # Words never contain ``.?!``, so the per-sentence counts add up.
+        return sum(sentence.words for sentence in self.sentences)
+
+    @cached_property
+    def caps(self) -> Dict[str, int]:
+        """Each all-caps token (two or more letters) and its first offset."""
+
+        first: Dict[str, int] = {}
+        for match in _CAPS_RE.finditer(self.text):
+            first.setdefault(match.group(1), match.start())
+        return first
+
+    @cached_property
+    def abbreviation_definitions(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Spans of every ``Long form (ABBR)`` / ``ABBR (Long form)``, by ABBR."""
+
+        text = self.text
+        spans: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for match in _ABBREVIATION_FIRST_RE.finditer(text):
+            spans[match.group(1)].append(match.span())
+        # A long form is the run of letters, spaces, apostrophes and hyphens
+        # before "(ABBR)", starting at a letter and at least four characters
+        # long.  Walking back from each "(" keeps this linear; a regex
+        # anchored on the long form backtracks over every run of words.
+        for match in _PARENTHESISED_ABBREVIATION_RE.finditer(text):
+            start = match.start()
+            while start and (
+                text[start - 1].isspace() or text[start - 1] in _LONG_FORM_CHARS
+            ):
+                start -= 1
+            while start < match.start() and text[start] not in _ASCII_LETTERS:
+                start += 1
+            if match.start() - start >= 4:
+                spans[match.group(1)].append((start, match.end()))
+        return spans
+
+    def defines_at(self, abbreviation: str, index: int) -> bool:
+        """Whether a definition of ``abbreviation`` covers offset ``index``."""
+
+        return any(
+            start <= index <= end
+            for start, end in self.abbreviation_definitions.get(abbreviation, ())
+        )
+
+
+Check = Callable[[Dict, BackTextAnalysis, ValidationResult], None]
+
 
 class SchemaValidator:
     """Validator that enforces the v2a flashcard policy."""
 
-    def __init__(self, policy: str | Path, policy_data: Optional[Dict] = None):
+    def __init__(
+        self,
+        policy: str | Path,
+        policy_data: Optional[Dict] = None,
+        *,
+        plan: Optional[PolicyPlan] = None,
+        cache_dir: str | Path | None = None,
+    ):
         self._policy_path = Path(policy)
-        self.policy = policy_data or PolicyLoader.load(self._policy_path)
-
-        schema = self.policy.get("schema", {})
-        back = self.policy.get("back", {})
-        anchors = self.policy.get("anchors", {})
-        statutes = self.policy.get("statutes", {})
-        authorities = self.policy.get("authorities", {})
-        keywords = self.policy.get("keywords", {})
-        diagram = self.policy.get("diagram", {})
-        tripwires = self.policy.get("tripwires", {})
-        lint = self.policy.get("lint", {})
-        tags = self.policy.get("tags", {})
-
-        self.required_fields: List[str] = list(schema.get("required_fields", []))
-        self.back_required_headings: List[HeadingRequirement] = []
-        for raw_pattern in back.get("required_headings_regex", []):
-            pattern_text = raw_pattern.replace("\\\\", "\\")
-            self.back_required_headings.append(
-                HeadingRequirement(
-                    pattern=re.compile(pattern_text, re.IGNORECASE),
-                    label=self._extract_heading_label(pattern_text),
-                )
+        if plan is None:
+            if policy_data:
+                plan = load_plan(policy_data, cache_dir)
+            else:
+                plan = load_plan_file(self._policy_path, cache_dir)
+        self.plan = plan
+        self.policy = plan.policy
+        self.required_fields: List[str] = list(
+            next(
+                (r.params["fields"] for r in plan.rules if r.name == "required_fields"),
+                [],
             )
-        self.back_min_words = int(back.get("min_words", 0) or 0)
-        self.back_max_words = int(back.get("max_words", 10**6) or 10**6)
-        self.back_max_sentence_words = int(
-            back.get("max_sentence_words", 10**6) or 10**6
-        )
-        authority_cfg = back.get("authority_per_step", {})
-        self.back_allow_missing_blocks = bool(
-            back.get("allow_missing_blocks_if_not_applicable", False)
         )
-        self.authority_rules = AuthorityDiscipline(
-            lead_required=bool(authority_cfg.get("lead_required", False)),
-            fallback_allowed=bool(authority_cfg.get("fallback_allowed", False)),
-            max_per_step=int(authority_cfg.get("max_per_step", 1)),
-        )
-        self.anchors_policy = anchors
-        self.statutes_policy = statutes
-        self.authorities_policy = authorities
-        self.keywords_policy = keywords
-        self.diagram_policy = diagram
-        self.tripwires_policy = tripwires
-        self.lint_policy = lint
-        self.tags_policy = tags
-        self.placeholder_regexes = [
-            re.compile(pat, re.IGNORECASE)
-            for pat in lint.get("forbid_placeholder_text_regex", [])
+        self.back_required_headings: List[HeadingRequirement] = [
+            HeadingRequirement(pattern=re.compile(pattern, re.IGNORECASE), label=label)
+            for pattern, label in plan.headings
         ]
-        allow_token = lint.get("allow_explicit_uncertainty_token")
-        self.allowed_uncertainty_token = (
-            allow_token if isinstance(allow_token, str) else None
-        )
-        self.priority_order = authorities.get("priority_order", [])
-        self.priority_index = {
-            name: idx for idx, name in enumerate(self.priority_order)
-        }
-        self.recommended_keywords = keywords.get("recommended_include_if_relevant", [])
+        self._headings = _HeadingMatcher(self.back_required_headings)
+        self.diagram_limits = dict(plan.diagram_limits)
+        self._checks: List[Tuple[str, Check]] = [
+            (rule.name, getattr(self, f"_rule_{rule.name}")(**rule.params))
+            for rule in plan.rules
+        ]
+        self._instrumented = False
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def validate_card(self, card: Dict) -> ValidationResult:
         result = ValidationResult()
-        self._check_required_fields(card, result)
-        self._check_tags(card, result)
-        self._check_keywords(card, result)
-        self._check_tripwires(card, result)
-        self._check_anchors(card, result)
-
-        back_text = str(card.get("back", ""))
-        sections, heading_count = self._parse_back_sections(back_text)
-        self._check_back_headings(back_text, sections, heading_count, result)
-        self._check_back_word_counts(back_text, result)
-        self._check_authorities(sections.get("Authorities map."), result)
-        self._check_statutes(sections.get("Statutory hook."), back_text, result)
-        self._check_diagram(card.get("diagram"), sections, result)
-        self._check_abbreviations(back_text, result)
+        back = self.analyse_back(str(card.get("back", "")))
+        for _name, check in self._checks:
+            check(card, back, result)
+        return result
 
-        if (
-            self.allowed_uncertainty_token
-            and self.allowed_uncertainty_token in back_text
-        ):
-            result.add_warning(
-                "Back includes explicit uncertainty token; ensure follow-up research"
-            )
+    def analyse_back(self, back_text: str) -> BackTextAnalysis:
+        """Split ``back_text`` on this policy's headings for the checks."""
 
-        self._check_placeholder_text(card, result)
-        self._check_repeated_sentences(card, result)
-        return result
+        return BackTextAnalysis(back_text, self._headings)
+
+    def instrument(self, profiler: Any) -> None:
+        """Time every bound check and the back analysis with ``profiler``.
+
+        ``profiler`` is a ``windsurf.profiling.Profiler``; checks are
+        recorded as ``check.<rule name>``.  Uninstrumented validators run the
+        plain closures.
+        """
+
+        if self._instrumented:
+            return
+        self._instrumented = True
+        self._checks = [
+            (name, profiler.wrap(f"check.{name}", check))
+            for name, check in self._checks
+        ]
+        self.analyse_back = profiler.wrap("check.analyse_back", self.analyse_back)  # type: ignore[method-assign]
 
     # ------------------------------------------------------------------
     # Required fields
     # ------------------------------------------------------------------
-    def _check_required_fields(self, card: Dict, result: ValidationResult) -> None:
-        for fld in self.required_fields:
-            value = card.get(fld)
-            if value is None:
-                result.add_error(f"Missing required field: {field}")
-                continue
-            if isinstance(value, str) and not value.strip():
-                result.add_error(f"Field '{field}' must not be empty")
-            elif isinstance(value, (list, tuple, set)) and not any(
-                str(item).strip() for item in value
-            ):
-                result.add_error(f"Field '{field}' must contain at least one value")
+    def _rule_required_fields(self, fields: List[str]) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            for fld in fields:
+                value = card.get(fld)
+                if value is None:
+                    result.add_error(f"Missing required field: {fld}")
+                    continue
+                if isinstance(value, str) and not value.strip():
+                    result.add_error(f"Field '{fld}' must not be empty")
+                elif isinstance(value, (list, tuple, set)) and not any(
+                    str(item).strip() for item in value
+                ):
+                    result.add_error(f"Field '{fld}' must contain at least one value")
+
+        return check
 
     # ------------------------------------------------------------------
     # Back sections
     # ------------------------------------------------------------------
-    def _parse_back_sections(
-        self, back_text: str
-    ) -> Tuple[Dict[str, str], Dict[str, int]]:
-        sections: Dict[str, str] = {}
-        heading_counts: Dict[str, int] = defaultdict(int)
-        if not back_text:
-            return sections, heading_counts
-
-        current_label: Optional[str] = None
-        buffer: List[str] = []
-        lines = back_text.splitlines()
-
-        for raw_line in lines:
-            line = raw_line.strip()
-            matched_label: Optional[str] = None
-            for req in self.back_required_headings:
-                if req.pattern.match(line):
-                    matched_label = req.label
-                    break
-            if matched_label:
-                if current_label is not None:
-                    sections[current_label] = "\n".join(buffer).strip()
-                heading_counts[matched_label] += 1
-                current_label = matched_label
-                buffer = []
-            else:
-                if current_label is not None:
-                    buffer.append(raw_line)
-        if current_label is not None:
-            sections[current_label] = "\n".join(buffer).strip()
-        return sections, heading_counts
+    def _rule_back_headings(
+        self, forbid_duplicates: bool, allow_missing: bool
+    ) -> Check:
+        requirements = self.back_required_headings
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            missing = []
+            for requirement in requirements:
+                count = back.heading_count.get(requirement.label, 0)
+                if count == 0:
+                    missing.append(requirement.label)
+                elif count > 1 and forbid_duplicates:
+                    result.add_error(f"Duplicate heading detected: {requirement.label}")
+            if missing:
+                if allow_missing and self._has_rationale_marker(back.text):
+                    result.add_warning(
+                        "Missing sections replaced with rationale marker: "
+                        + ", ".join(missing)
+                    )
+                else:
+                    for label in missing:
+                        result.add_error(f"Missing required heading: {label}")
 
-    def _check_back_headings(
-        self,
-        back_text: str,
-        sections: Dict[str, str],
-        heading_count: Dict[str, int],
-        result: ValidationResult,
-    ) -> None:
-        missing = []
-        for requirement in self.back_required_headings:
-            count = heading_count.get(requirement.label, 0)
-            if count == 0:
-                missing.append(requirement.label)
-            elif count > 1 and self.lint_policy.get(
-                "forbid_duplicate_section_headers", False
-            ):
-                result.add_error(f"Duplicate heading detected: {requirement.label}")
-        if missing:
-            if self.back_allow_missing_blocks and self._has_rationale_marker(back_text):
-                result.add_warning(
-                    "Missing sections replaced with rationale marker: "
-                    + ", ".join(missing)
-                )
-            else:
-                for label in missing:
-                    result.add_error(f"Missing required heading: {label}")
+        return check
 
     def _has_rationale_marker(self, back_text: str) -> bool:
         return bool(re.search(r"\(No [^\n)]*applicable\)\s*$", back_text.strip()))
 
-    def _check_back_word_counts(self, back_text: str, result: ValidationResult) -> None:
-        words = self._tokenize_words(back_text)
-        if words < self.back_min_words:
-            result.add_error(
-                f"Back must contain at least {self.back_min_words} words (found {words})"
-            )
-        if words > self.back_max_words:
-            result.add_error(
-                f"Back must contain no more than {self.back_max_words} words (found {words})"
-            )
-
-        sentences = re.split(r"[\.\?\!]", back_text)
-        for idx, sentence in enumerate(sentences, start=1):
-            sentence_words = self._tokenize_words(sentence)
-            if sentence_words > self.back_max_sentence_words:
+    def _rule_back_word_counts(
+        self, min_words: int, max_words: int, max_sentence_words: int
+    ) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            words = back.word_count
+            if words < min_words:
                 result.add_error(
-                    f"Sentence {idx} exceeds {self.back_max_sentence_words} words ({sentence_words} words)"
+                    f"Back must contain at least {min_words} words (found {words})"
                 )
+            if words > max_words:
+                result.add_error(
+                    f"Back must contain no more than {max_words} words (found {words})"
+                )
+
+            for idx, sentence in enumerate(back.sentences, start=1):
+                if sentence.words > max_sentence_words:
+                    result.add_error(
+                        f"Sentence {idx} exceeds {max_sentence_words} words ({sentence.words} words)"
+                    )
+
+        return check
 
     # ------------------------------------------------------------------
     # Authorities discipline
     # ------------------------------------------------------------------
-    def _check_authorities(
-        self, section_text: Optional[str], result: ValidationResult
-    ) -> None:
-        if not section_text:
-            result.add_error("Authorities map section is empty")
-            return
-
-        lines = [line.strip() for line in section_text.splitlines() if line.strip()]
-        if not lines:
-            result.add_error("Authorities map must describe at least one step")
-            return
+    def _rule_authorities(
+        self,
+        lead_required: bool,
+        fallback_allowed: bool,
+        max_per_step: int,
+        priority_order: List[str],
+        require_citation: bool,
+        uncertainty_token: Optional[str],
+    ) -> Check:
+        rules = AuthorityDiscipline(lead_required, fallback_allowed, max_per_step)
+        priority_index = {name: idx for idx, name in enumerate(priority_order)}
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            if not back.sections.get("Authorities map."):
+                result.add_error("Authorities map section is empty")
+                return
+
+            lines = back.section_lines["Authorities map."]
+            if not lines:
+                result.add_error("Authorities map must describe at least one step")
+                return
+
+            any_authority = False
+            for idx, line in enumerate(lines, start=1):
+                extracted = self._extract_authorities(line, uncertainty_token)
+                if not extracted:
+                    result.add_error(
+                        f"Step {idx} in authorities map lacks cited authority"
+                    )
+                    continue
+                any_authority = True
+                if len(extracted) > rules.max_per_step:
+                    result.add_error(
+                        f"Step {idx} lists {len(extracted)} authorities; maximum is {rules.max_per_step}"
+                    )
+                if len(extracted) > 1 and not rules.fallback_allowed:
+                    result.add_error(f"Step {idx} cannot include fallback authorities")
+                categories = [auth.category for auth in extracted]
+                if not self._is_priority_respected(categories, priority_index):
+                    result.add_error(
+                        f"Step {idx} authorities are out of priority order (expected {priority_order})"
+                    )
+                for auth in extracted:
+                    self._validate_authority_details(auth, require_citation, result)
+            if rules.lead_required and not any_authority:
+                result.add_error("Authorities map requires at least one lead authority")
 
-        any_authority = False
-        for idx, line in enumerate(lines, start=1):
-            extracted = self._extract_authorities(line)
-            if not extracted:
-                result.add_error(f"Step {idx} in authorities map lacks cited authority")
-                continue
-            any_authority = True
-            if len(extracted) > self.authority_rules.max_per_step:
-                result.add_error(
-                    f"Step {idx} lists {len(extracted)} authorities; maximum is {self.authority_rules.max_per_step}"
-                )
-            if len(extracted) > 1 and not self.authority_rules.fallback_allowed:
-                result.add_error(f"Step {idx} cannot include fallback authorities")
-            categories = [auth.category for auth in extracted]
-            if not self._is_priority_respected(categories):
-                result.add_error(
-                    f"Step {idx} authorities are out of priority order (expected {self.priority_order})"
-                )
-            for auth in extracted:
-                self._validate_authority_details(auth, result)
-        if self.authority_rules.lead_required and not any_authority:
-            result.add_error("Authorities map requires at least one lead authority")
+        return check
 
     @dataclass
     class ExtractedAuthority:
         text: str
         category: str
 
-    def _extract_authorities(self, line: str) -> List[ExtractedAuthority]:
+    _CASE_RE = re.compile(r"([A-Z][A-Za-z]+ v [A-Z][A-Za-z][^;\.,]*)")
+    _STATUTE_RE = re.compile(r"([A-Z][A-Za-z]+ Act[^;\.,]*)")
+
+    def _extract_authorities(
+        self, line: str, explicit_token: Optional[str] = None
+    ) -> List[ExtractedAuthority]:
         authorities: List[SchemaValidator.ExtractedAuthority] = []
-        explicit_token = self.allowed_uncertainty_token
         if explicit_token and explicit_token in line:
             authorities.append(
                 self.ExtractedAuthority(text=explicit_token, category="Token")
             )
             return authorities
 
-        case_pattern = re.compile(r"([A-Z][A-Za-z]+ v [A-Z][A-Za-z][^;\.,]*)")
-        statute_pattern = re.compile(r"([A-Z][A-Za-z]+ Act[^;\.,]*)")
-        matches = case_pattern.findall(line)
-        matches += statute_pattern.findall(line)
+        matches = self._CASE_RE.findall(line)
+        matches += self._STATUTE_RE.findall(line)
         seen = set()
         for match in matches:
             cleaned = match.strip()
@@ -338,21 +786,26 @@ class SchemaValidator:
             return "Statute"
         return "Other Aus"
 
-    def _is_priority_respected(self, categories: List[str]) -> bool:
+    def _is_priority_respected(
+        self, categories: List[str], priority_index: Mapping[str, int]
+    ) -> bool:
         if not categories:
             return True
         last_index = -1
         for category in categories:
-            if category not in self.priority_index:
+            if category not in priority_index:
                 continue
-            idx = self.priority_index[category]
+            idx = priority_index[category]
             if idx < last_index:
                 return False
             last_index = idx
         return True
 
     def _validate_authority_details(
-        self, authority: "SchemaValidator.ExtractedAuthority", result: ValidationResult
+        self,
+        authority: "SchemaValidator.ExtractedAuthority",
+        require_citation: bool,
+        result: ValidationResult,
     ) -> None:
         text = authority.text
         if authority.category == "Token":
@@ -367,13 +820,10 @@ class SchemaValidator:
                 r"nuance|approved|persuasive|caution", text, re.IGNORECASE
             ):
                 result.add_error("UK/PC authority requires a nuance note")
-        if self.authorities_policy.get(
-            "require_year_and_neutral_or_report_cite", False
-        ):
-            if not self._has_year_and_citation(text):
-                result.add_error(
-                    f"Authority missing year and neutral/report citation: {text}"
-                )
+        if require_citation and not self._has_year_and_citation(text):
+            result.add_error(
+                f"Authority missing year and neutral/report citation: {text}"
+            )
 
     def _has_year_and_citation(self, text: str) -> bool:
         year_match = re.search(r"\b(19|20)\d{2}\b", text)
@@ -384,165 +834,175 @@ class SchemaValidator:
     # ------------------------------------------------------------------
     # Statutes discipline
     # ------------------------------------------------------------------
-    def _check_statutes(
-        self, section_text: Optional[str], back_text: str, result: ValidationResult
-    ) -> None:
-        if not section_text:
-            result.add_warning("Statutory hook section is empty")
-            return
-        lines = [line.strip() for line in section_text.splitlines() if line.strip()]
-        if not lines:
-            result.add_warning("Statutory hook section contains no statutes")
-            return
-
-        mentions = []
-        for line in lines:
-            matches = re.findall(r"([A-Z][A-Za-z]+ Act[^;\.,]*)", line)
-            for match in matches:
-                mention = match.strip()
-                mentions.append(mention)
-                if self.statutes_policy.get("include_only_operational_sections", False):
-                    lowered = mention.lower()
-                    if (
-                        " s " not in lowered
-                        and " section " not in lowered
-                        and "s." not in lowered
+    def _rule_statutes(
+        self,
+        operational_sections: bool,
+        victoria_first: bool,
+        commonwealth_if_engaged: bool,
+    ) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            if not back.sections.get("Statutory hook."):
+                result.add_warning("Statutory hook section is empty")
+                return
+            lines = back.section_lines["Statutory hook."]
+            if not lines:
+                result.add_warning("Statutory hook section contains no statutes")
+                return
+
+            mentions = []
+            for line in lines:
+                for match in self._STATUTE_RE.findall(line):
+                    mention = match.strip()
+                    mentions.append(mention)
+                    if operational_sections:
+                        lowered = mention.lower()
+                        if (
+                            " s " not in lowered
+                            and " section " not in lowered
+                            and "s." not in lowered
+                        ):
+                            result.add_error(
+                                f"Statute reference must include operational section: {mention}"
+                            )
+            if not mentions:
+                result.add_warning("No statutes referenced in statutory hook")
+            if victoria_first and mentions:
+                first = mentions[0]
+                if "(Vic" not in first:
+                    result.add_warning(
+                        "Victorian legislation should be prioritised before other jurisdictions"
+                    )
+            if commonwealth_if_engaged:
+                if re.search(
+                    r"\b(Cth|Commonwealth(?!\s+Law Reports)|federal)\b",
+                    back.text,
+                    re.IGNORECASE,
+                ):
+                    if not any(
+                        "(Cth" in mention
+                        or re.search(r"Commonwealth(?!\s+Law Reports)", mention)
+                        for mention in mentions
                     ):
                         result.add_error(
-                            f"Statute reference must include operational section: {mention}"
+                            "Commonwealth engagement flagged but no Commonwealth statute cited"
                         )
-        if not mentions:
-            result.add_warning("No statutes referenced in statutory hook")
-        if self.statutes_policy.get("prefer_victoria_first", False) and mentions:
-            first = mentions[0]
-            if "(Vic" not in first:
-                result.add_warning(
-                    "Victorian legislation should be prioritised before other jurisdictions"
-                )
-        if self.statutes_policy.get("require_commonwealth_if_engaged", False):
-            if re.search(
-                r"\b(Cth|Commonwealth(?!\s+Law Reports)|federal)\b",
-                back_text,
-                re.IGNORECASE,
-            ):
-                if not any(
-                    "(Cth" in mention
-                    or re.search(r"Commonwealth(?!\s+Law Reports)", mention)
-                    for mention in mentions
-                ):
-                    result.add_error(
-                        "Commonwealth engagement flagged but no Commonwealth statute cited"
-                    )
+
+        return check
 
     # ------------------------------------------------------------------
     # Diagram discipline
     # ------------------------------------------------------------------
-    def _check_diagram(
+    def _rule_diagram(
         self,
-        diagram: Optional[str],
-        sections: Dict[str, str],
-        result: ValidationResult,
-    ) -> None:
-        if diagram is None:
-            result.add_error("Diagram content is missing")
-            return
-        if not isinstance(diagram, str):
-            result.add_error("Diagram must be provided as a string")
-            return
-        text = diagram.strip()
-        if not text:
-            result.add_error("Diagram must not be empty")
-            return
-        if not self.diagram_policy:
-            return
+        structural: bool,
+        require_mermaid: bool,
+        require_mindmap: bool,
+        discourage_mirroring: bool,
+    ) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            diagram = card.get("diagram")
+            if diagram is None:
+                result.add_error("Diagram content is missing")
+                return
+            if not isinstance(diagram, str):
+                result.add_error("Diagram must be provided as a string")
+                return
+            stripped = diagram.strip()
+            if not stripped:
+                result.add_error("Diagram must not be empty")
+                return
+            if not structural:
+                return
+
+            mermaid_block = self._extract_mermaid_block(stripped)
+            if mermaid_block is None:
+                result.add_error("Diagram must be a fenced mermaid block")
+                return
+            header, body = mermaid_block
+            if require_mermaid and header != "mermaid":
+                result.add_error("Diagram fence must declare mermaid language")
+            lines = [line.rstrip() for line in body.splitlines() if line.strip()]
+            if not lines:
+                result.add_error("Diagram mermaid content is empty")
+                return
+            first_line = lines[0].strip()
+            declares_mindmap = first_line.lower().startswith("mindmap")
+            if require_mindmap and not declares_mindmap:
+                result.add_error("Diagram must declare a mindmap")
+
+            node_lines = lines[1:] if declares_mindmap else lines
+            structure = parse_mindmap(node_lines)
+            self.check_diagram_structure(structure, result)
+
+            if discourage_mirroring:
+                headings = {
+                    self._normalise_heading_name(name) for name in back.sections.keys()
+                }
+                mirrored = [
+                    branch
+                    for branch in structure.branches
+                    if self._normalise_heading_name(branch) in headings
+                ]
+                if mirrored:
+                    result.add_warning(
+                        "Mindmap branches mirror back section headings: "
+                        + ", ".join(sorted(set(mirrored)))
+                    )
 
-        mermaid_block = self._extract_mermaid_block(text)
-        if mermaid_block is None:
-            result.add_error("Diagram must be a fenced mermaid block")
-            return
-        header, body = mermaid_block
-        if (
-            self.diagram_policy.get("must_be_valid_mermaid", False)
-            and header != "mermaid"
-        ):
-            result.add_error("Diagram fence must declare mermaid language")
-        lines = [line.rstrip() for line in body.splitlines() if line.strip()]
-        if not lines:
-            result.add_error("Diagram mermaid content is empty")
-            return
-        first_line = lines[0].strip()
-        if self.diagram_policy.get(
-            "type"
-        ) == "mindmap" and not first_line.lower().startswith("mindmap"):
-            result.add_error("Diagram must declare a mindmap")
-
-        node_lines = lines[1:] if first_line.lower().startswith("mindmap") else lines
-        total_nodes = sum(1 for line in node_lines if line.strip())
-        max_nodes = int(self.diagram_policy.get("max_total_nodes", 0) or 0)
-        if max_nodes and total_nodes > max_nodes:
-            result.add_error(
-                f"Mindmap contains {total_nodes} nodes but maximum is {max_nodes}"
-            )
+        return check
 
-        top_level = self._count_top_level_branches(node_lines)
-        min_branches = int(self.diagram_policy.get("top_level_branches_min", 0) or 0)
-        max_branches = int(self.diagram_policy.get("top_level_branches_max", 0) or 0)
-        if min_branches and top_level < min_branches:
-            result.add_error(
-                f"Mindmap must have at least {min_branches} top-level branches (found {top_level})"
-            )
-        if max_branches and top_level > max_branches:
-            result.add_error(
-                f"Mindmap must have no more than {max_branches} top-level branches (found {top_level})"
-            )
+    def check_diagram_structure(
+        self, structure: MindmapStructure, result: ValidationResult
+    ) -> None:
+        """Apply the diagram policy's node and branch limits to ``structure``.
 
-        if self.diagram_policy.get("discourage_heading_mirroring", False):
-            headings = {self._normalise_heading_name(name) for name in sections.keys()}
-            mirrored = [
-                branch
-                for branch in self._iter_top_level_labels(node_lines)
-                if self._normalise_heading_name(branch) in headings
-            ]
-            if mirrored:
-                result.add_warning(
-                    "Mindmap branches mirror back section headings: "
-                    + ", ".join(sorted(set(mirrored)))
-                )
+        Callers holding an in-memory diagram (such as the Monte Carlo
+        optimiser) can validate it here without rendering Mermaid text.
+        """
+
+        for error in structure_errors(structure, **self.diagram_limits):
+            result.add_error(error)
 
     # ------------------------------------------------------------------
     # Anchors
     # ------------------------------------------------------------------
-    def _check_anchors(self, card: Dict, result: ValidationResult) -> None:
-        anchors = card.get("anchors")
-        if anchors is None:
-            result.add_error("Anchors field is missing")
-            return
-        items = self._flatten_anchor_items(anchors)
-        min_items = int(self.anchors_policy.get("min_items", 0))
-        max_items = int(self.anchors_policy.get("max_items", len(items) or 0))
-        if len(items) < min_items:
-            result.add_error(
-                f"Anchors must include at least {min_items} items (found {len(items)})"
-            )
-        if max_items and len(items) > max_items:
-            result.add_error(
-                f"Anchors must include no more than {max_items} items (found {len(items)})"
-            )
-        each_item_max = int(self.anchors_policy.get("each_item_max_words", 10**6))
-        for idx, item in enumerate(items, start=1):
-            words = self._tokenize_words(item)
-            if words > each_item_max:
+    def _rule_anchors(
+        self,
+        min_items: int,
+        max_items: int,
+        each_item_max_words: int,
+        require_reference: bool,
+        uk_requires_note: bool,
+    ) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            anchors = card.get("anchors")
+            if anchors is None:
+                result.add_error("Anchors field is missing")
+                return
+            items = self._flatten_anchor_items(anchors)
+            if len(items) < min_items:
+                result.add_error(
+                    f"Anchors must include at least {min_items} items (found {len(items)})"
+                )
+            if max_items and len(items) > max_items:
                 result.add_error(
-                    f"Anchor {idx} exceeds {each_item_max} words ({words} words)"
+                    f"Anchors must include no more than {max_items} items (found {len(items)})"
                 )
-            if self.anchors_policy.get("require_case_or_statute_ref_per_item", False):
-                if not self._contains_case_or_statute(item):
+            for idx, item in enumerate(items, start=1):
+                words = self._tokenize_words(item)
+                if words > each_item_max_words:
+                    result.add_error(
+                        f"Anchor {idx} exceeds {each_item_max_words} words ({words} words)"
+                    )
+                if require_reference and not self._contains_case_or_statute(item):
                     result.add_error(f"Anchor {idx} must reference a case or statute")
-            if self.anchors_policy.get("uk_or_persuasive_requires_note", False):
-                if re.search(r"\b(UK|PC|Privy Council)\b", item) and not re.search(
-                    r"nuance|approved|distinguished|persuasive", item, re.IGNORECASE
-                ):
-                    result.add_error("UK/PC anchors must include nuance or note")
+                if uk_requires_note:
+                    if re.search(r"\b(UK|PC|Privy Council)\b", item) and not re.search(
+                        r"nuance|approved|distinguished|persuasive", item, re.IGNORECASE
+                    ):
+                        result.add_error("UK/PC anchors must include nuance or note")
+
+        return check
 
     def _flatten_anchor_items(self, anchors: object) -> List[str]:
         if isinstance(anchors, list):
@@ -573,86 +1033,58 @@ class SchemaValidator:
     # ------------------------------------------------------------------
     # Abbreviations
     # ------------------------------------------------------------------
-    def _check_abbreviations(self, back_text: str, result: ValidationResult) -> None:
-        if not back_text:
-            return
-        seen: Dict[str, int] = {}
-        for match in re.finditer(r"\b([A-Z]{2,})\b", back_text):
-            abbreviation = match.group(1)
-            if abbreviation in seen:
-                continue
-            seen[abbreviation] = match.start()
-            if self._is_all_caps_word_allowed(abbreviation):
-                continue
-            if not self._has_abbreviation_definition(
-                back_text, abbreviation, match.start()
-            ):
+    def _rule_abbreviations(self, allowed: List[str]) -> Check:
+        allowed_words = frozenset(allowed)
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            for abbreviation, index in back.caps.items():
+                if abbreviation in allowed_words or back.defines_at(
+                    abbreviation, index
+                ):
+                    continue
                 result.add_error(
                     f"Abbreviation '{abbreviation}' must be expanded on first use"
                 )
 
-    def _is_all_caps_word_allowed(self, token: str) -> bool:
-        whitelist = {"HCA", "AGLC", "JD", "LLB", "NSW", "VIC", "SA", "WA", "QLD", "ACT"}
-        return token in whitelist
-
-    def _has_abbreviation_definition(
-        self, text: str, abbreviation: str, index: int
-    ) -> bool:
-        window_start = max(0, index - 80)
-        window_end = index + len(abbreviation) + 80
-        window = text[window_start:window_end]
-        # Long form (ABBR)
-        pattern = re.compile(
-            rf"([A-Za-z][A-Za-z\s'-]{{3,}})\s*\({re.escape(abbreviation)}\)"
-        )
-        for match in pattern.finditer(window):
-            start = window_start + match.start(0)
-            end = window_start + match.end(0)
-            if start <= index <= end:
-                return True
-        reverse = re.compile(
-            rf"{re.escape(abbreviation)}\s*\([A-Za-z][A-Za-z\s'-]{{3,}}\)"
-        )
-        for match in reverse.finditer(window):
-            start = window_start + match.start(0)
-            end = window_start + match.end(0)
-            if start <= index <= end:
-                return True
-        return False
+        return check
 
     # ------------------------------------------------------------------
     # Tripwires
     # ------------------------------------------------------------------
-    def _check_tripwires(self, card: Dict, result: ValidationResult) -> None:
-        tripwires = card.get("tripwires")
-        if tripwires is None:
-            result.add_error("Tripwires field is missing")
-            return
-        if not isinstance(tripwires, list):
-            result.add_error("Tripwires must be a list")
-            return
-        tripwires = [str(item).strip() for item in tripwires if str(item).strip()]
-        min_tripwires = int(self.tripwires_policy.get("min", 0))
-        max_tripwires = int(self.tripwires_policy.get("max", len(tripwires) or 0))
-        if len(tripwires) < min_tripwires:
-            result.add_error(
-                f"At least {min_tripwires} tripwires required (found {len(tripwires)})"
-            )
-        if max_tripwires and len(tripwires) > max_tripwires:
-            result.add_error(
-                f"No more than {max_tripwires} tripwires allowed (found {len(tripwires)})"
-            )
-        self._check_tripwire_duplicates(tripwires, result)
+    def _rule_tripwires(
+        self, min_count: int, max_count: int, duplicate_threshold: Optional[float]
+    ) -> Check:
+        min_tripwires, max_tripwires = min_count, max_count
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            tripwires = card.get("tripwires")
+            if tripwires is None:
+                result.add_error("Tripwires field is missing")
+                return
+            if not isinstance(tripwires, list):
+                result.add_error("Tripwires must be a list")
+                return
+            tripwires = [str(item).strip() for item in tripwires if str(item).strip()]
+            if len(tripwires) < min_tripwires:
+                result.add_error(
+                    f"At least {min_tripwires} tripwires required (found {len(tripwires)})"
+                )
+            if max_tripwires and len(tripwires) > max_tripwires:
+                result.add_error(
+                    f"No more than {max_tripwires} tripwires allowed (found {len(tripwires)})"
+                )
+            if duplicate_threshold is not None:
+                self._check_tripwire_duplicates(tripwires, duplicate_threshold, result)
+
+        return check
 
     def _check_tripwire_duplicates(
-        self, tripwires: List[str], result: ValidationResult
+        self, tripwires: List[str], threshold: float, result: ValidationResult
     ) -> None:
-        threshold = float(
-            self.tripwires_policy.get("duplicate_similarity_threshold", 0.8)
-        )
-        for first, second in itertools.combinations(enumerate(tripwires, start=1), 2):
+        vectors = [Sentence(trip, 0, *_token_vector(trip)) for trip in tripwires]
+        for first, second in itertools.combinations(enumerate(vectors, start=1), 2):
             (idx_a, trip_a), (idx_b, trip_b) = first, second
-            if self._text_similarity(trip_a, trip_b) >= threshold:
+            if trip_a.similarity(trip_b) >= threshold:
                 result.add_error(
                     f"Tripwires {idx_a} and {idx_b} are near-duplicates (similarity >= {threshold})"
                 )
@@ -660,133 +1092,124 @@ class SchemaValidator:
     # ------------------------------------------------------------------
     # Keywords and tags
     # ------------------------------------------------------------------
-    def _check_keywords(self, card: Dict, result: ValidationResult) -> None:
-        keywords = card.get("keywords")
-        if keywords is None or not isinstance(keywords, list):
-            result.add_error("Keywords must be a list")
-            return
-        keywords = [str(item).strip() for item in keywords if str(item).strip()]
-        min_keywords = int(self.keywords_policy.get("min", 0))
-        max_keywords = int(self.keywords_policy.get("max", len(keywords) or 0))
-        if len(keywords) < min_keywords:
-            result.add_error(
-                f"At least {min_keywords} keywords required (found {len(keywords)})"
-            )
-        if max_keywords and len(keywords) > max_keywords:
-            result.add_error(
-                f"No more than {max_keywords} keywords allowed (found {len(keywords)})"
-            )
-        recommended = set(k.lower() for k in self.recommended_keywords)
-        chosen = set(k.lower() for k in keywords)
-        missing_recommended = [kw for kw in recommended if kw not in chosen]
-        back_text = str(card.get("back", ""))
-        for keyword in missing_recommended:
-            if re.search(re.escape(keyword), back_text, re.IGNORECASE):
-                result.add_warning(f"Consider adding recommended keyword: {keyword}")
-
-    def _check_tags(self, card: Dict, result: ValidationResult) -> None:
-        tags = card.get("tags")
-        if tags is None or not isinstance(tags, list):
-            result.add_error("Tags must be a list")
-            return
-        tag_values = {str(tag).strip() for tag in tags if str(tag).strip()}
-        required = set(self.tags_policy.get("required", []))
-        missing = [tag for tag in required if tag not in tag_values]
-        if missing:
-            result.add_error("Missing required tags: " + ", ".join(sorted(missing)))
+    def _rule_keywords(
+        self, min_count: int, max_count: int, recommended: List[str]
+    ) -> Check:
+        min_keywords, max_keywords = min_count, max_count
+        recommended_patterns = [
+            (keyword, re.compile(re.escape(keyword), re.IGNORECASE))
+            for keyword in recommended
+        ]
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            keywords = card.get("keywords")
+            if keywords is None or not isinstance(keywords, list):
+                result.add_error("Keywords must be a list")
+                return
+            keywords = [str(item).strip() for item in keywords if str(item).strip()]
+            if len(keywords) < min_keywords:
+                result.add_error(
+                    f"At least {min_keywords} keywords required (found {len(keywords)})"
+                )
+            if max_keywords and len(keywords) > max_keywords:
+                result.add_error(
+                    f"No more than {max_keywords} keywords allowed (found {len(keywords)})"
+                )
+            chosen = set(k.lower() for k in keywords)
+            for keyword, pattern in recommended_patterns:
+                if keyword not in chosen and pattern.search(back.text):
+                    result.add_warning(
+                        f"Consider adding recommended keyword: {keyword}"
+                    )
+
+        return check
+
+    def _rule_tags(self, required: List[str]) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            tags = card.get("tags")
+            if tags is None or not isinstance(tags, list):
+                result.add_error("Tags must be a list")
+                return
+            tag_values = {str(tag).strip() for tag in tags if str(tag).strip()}
+            missing = [tag for tag in required if tag not in tag_values]
+            if missing:
+                result.add_error("Missing required tags: " + ", ".join(missing))
+
+        return check
 
     # ------------------------------------------------------------------
     # Linting helpers
     # ------------------------------------------------------------------
-    def _check_placeholder_text(self, card: Dict, result: ValidationResult) -> None:
-        fields_to_scan = {
-            "front": card.get("front", ""),
-            "back": card.get("back", ""),
-            "why_it_matters": card.get("why_it_matters", ""),
-            "mnemonic": card.get("mnemonic", ""),
-        }
-        for fld, value in fields_to_scan.items():
-            text = str(value)
-            for regex in self.placeholder_regexes:
-                if regex.search(text):
+    def _rule_uncertainty_token(self, token: str) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            if token in back.text:
+                result.add_warning(
+                    "Back includes explicit uncertainty token; ensure follow-up research"
+                )
+
+        return check
+
+    def _rule_placeholder_text(self, patterns: List[str]) -> Check:
+        regexes = [re.compile(pat, re.IGNORECASE) for pat in patterns]
+
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            for fld in ("front", "back", "why_it_matters", "mnemonic"):
+                value = str(card.get(fld, ""))
+                for regex in regexes:
+                    if regex.search(value):
+                        result.add_error(
+                            f"Field '{fld}' contains placeholder text matching '{regex.pattern}'"
+                        )
+
+        return check
+
+    def _rule_repeated_sentences(self, threshold: float) -> Check:
+        def check(card: Dict, back: BackTextAnalysis, result: ValidationResult) -> None:
+            sentences = []
+            for fld in ("front", "back", "why_it_matters"):
+                if fld == "back":
+                    split = back.sentences
+                else:
+                    split = split_sentences(str(card.get(fld, "")))
+                sentences.extend((fld, sentence) for sentence in split if sentence.text)
+            for (field_a, sent_a), (field_b, sent_b) in itertools.combinations(
+                sentences, 2
+            ):
+                if sent_a.similarity(sent_b) >= threshold:
                     result.add_error(
-                        f"Field '{field}' contains placeholder text matching '{regex.pattern}'"
+                        f"Sentences from {field_a} and {field_b} are near-duplicates (>= {threshold})"
                     )
 
-    def _check_repeated_sentences(self, card: Dict, result: ValidationResult) -> None:
-        threshold = float(
-            self.lint_policy.get("forbid_repeated_sentences_similarity_threshold", 0.8)
-        )
-        sentences = []
-        for fld in ("front", "back", "why_it_matters"):
-            text = str(card.get(fld, ""))
-            for sentence in filter(
-                None, [segment.strip() for segment in re.split(r"[\.\?\!]", text)]
-            ):
-                sentences.append((field, sentence))
-        for (field_a, sent_a), (field_b, sent_b) in itertools.combinations(
-            sentences, 2
-        ):
-            if self._text_similarity(sent_a, sent_b) >= threshold:
-                result.add_error(
-                    f"Sentences from {field_a} and {field_b} are near-duplicates (>= {threshold})"
-                )
+        return check
 
     # ------------------------------------------------------------------
     # Utility helpers
     # ------------------------------------------------------------------
-    def _extract_heading_label(self, pattern: str) -> str:
-        stripped = pattern
-        stripped = stripped.strip("^")
-        stripped = stripped.replace("\\.", ".")
-        stripped = re.sub(r"\\", "", stripped)
-        return stripped
-
     def _extract_mermaid_block(self, text: str) -> Optional[Tuple[str, str]]:
-        fence = re.search(r"```\s*(\w+)\s*(.*?)```", text, re.DOTALL)
-        if not fence:
-            return None
-        language = fence.group(1).strip().lower()
-        body = fence.group(2)
-        return language, body
-
-    def _count_top_level_branches(self, node_lines: List[str]) -> int:
-        branches = 0
-        for line in node_lines:
-            stripped = line.lstrip()
-            indent = len(line) - len(stripped)
-            if indent in (1, 2):
-                branches += 1
-        return branches
-
-    def _iter_top_level_labels(self, node_lines: List[str]) -> Iterable[str]:
-        for line in node_lines:
-            stripped = line.lstrip()
-            indent = len(line) - len(stripped)
-            if indent in (1, 2):
-                yield stripped.strip()
+        return extract_mermaid_block(text)
 
     def _normalise_heading_name(self, name: str) -> str:
         return re.sub(r"[^a-z0-9]+", "", name.lower())
 
     def _tokenize_words(self, text: str) -> int:
-        tokens = re.findall(r"[A-Za-z0-9']+", text)
-        return len(tokens)
+        return len(_WORD_RE.findall(text))
 
     def _text_similarity(self, text_a: str, text_b: str) -> float:
-        tokens_a = self._normalise_tokens(text_a)
-        tokens_b = self._normalise_tokens(text_b)
-        if not tokens_a or not tokens_b:
-            return 0.0
-        counter_a = Counter(tokens_a)
-        counter_b = Counter(tokens_b)
-        intersection = set(counter_a) & set(counter_b)
-        dot = sum(counter_a[token] * counter_b[token] for token in intersection)
-        norm_a = math.sqrt(sum(count**2 for count in counter_a.values()))
-        norm_b = math.sqrt(sum(count**2 for count in counter_b.values()))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+        return Sentence(text_a, 0, *_token_vector(text_a)).similarity(
+            Sentence(text_b, 0, *_token_vector(text_b))
+        )
+
 
-    def _normalise_tokens(self, text: str) -> List[str]:
-        return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token]
+__all__ = [
+    "BackTextAnalysis",
+    "PolicyPlan",
+    "RuleSpec",
+    "SchemaValidator",
+    "Sentence",
+    "ValidationResult",
+    "compile_policy",
+    "load_plan",
+    "load_plan_file",
+    "policy_hash",
+    "split_sentences",
+]
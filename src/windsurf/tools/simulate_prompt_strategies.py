@@ -2,25 +2,49 @@ import math
 import random
 import statistics
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:  # NumPy enables the vectorised engine; the pure-Python loop needs nothing.
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - exercised only without NumPy.
+    np = None
 
 TOKEN_PRICE_PER_1K_IN = 0.12  # USD
 TOKEN_PRICE_PER_1K_OUT = 0.12  # USD
+TOKEN_DISTRIBUTIONS = ("normal", "lognormal")
 
 
 def _clamp_positive(value: float) -> float:
     return max(0.0, value)
 
 
-def _draw_gaussian(mean: float, stdev: float) -> float:
+def _draw_gaussian(mean: float, stdev: float, rng=random) -> float:
     if stdev <= 0:
         return mean
-    return _clamp_positive(random.gauss(mean, stdev))
+    return _clamp_positive(rng.gauss(mean, stdev))
+
+
+def _lognormal_params(mean: float, stdev: float) -> Tuple[float, float]:
+    """``(mu, sigma)`` of the lognormal with this mean and standard deviation."""
+
+    sigma_sq = math.log1p((stdev / mean) ** 2)
+    return math.log(mean) - sigma_sq / 2, math.sqrt(sigma_sq)
+
+
+def _draw_tokens(mean: float, stdev: float, distribution: str, rng=random) -> float:
+    if distribution == "lognormal" and mean > 0 and stdev > 0:
+        return rng.lognormvariate(*_lognormal_params(mean, stdev))
+    return _draw_gaussian(mean, stdev, rng)
 
 
 @dataclass
 class Strategy:
-    """Configuration for a single-pass or multi-pass prompting strategy."""
+    """Configuration for a single-pass or multi-pass prompting strategy.
+
+    ``token_distribution`` is the shape of the per-case prompt and completion
+    token draws: ``"normal"`` (clamped at zero) or ``"lognormal"`` with the
+    same mean and standard deviation, as fitted by ``calibrate_strategies``.
+    """
 
     name: str
     cases: int
@@ -37,19 +61,31 @@ class Strategy:
     verifier_prompt_sd: float = 0.0
     verifier_completion_tokens: float = 0.0
     verifier_completion_sd: float = 0.0
+    token_distribution: str = "normal"
 
-    def draw_case_tokens(self) -> Tuple[float, float]:
-        prompt = _draw_gaussian(self.prompt_tokens_mean, self.prompt_tokens_sd)
-        completion = _draw_gaussian(self.completion_tokens_mean, self.completion_tokens_sd)
+    def draw_case_tokens(self, rng=random) -> Tuple[float, float]:
+        prompt = _draw_tokens(
+            self.prompt_tokens_mean, self.prompt_tokens_sd, self.token_distribution, rng
+        )
+        completion = _draw_tokens(
+            self.completion_tokens_mean,
+            self.completion_tokens_sd,
+            self.token_distribution,
+            rng,
+        )
         return prompt, completion
 
-    def draw_verifier_tokens(self) -> Tuple[float, float]:
-        prompt = _draw_gaussian(self.verifier_prompt_tokens, self.verifier_prompt_sd)
-        completion = _draw_gaussian(self.verifier_completion_tokens, self.verifier_completion_sd)
+    def draw_verifier_tokens(self, rng=random) -> Tuple[float, float]:
+        prompt = _draw_gaussian(
+            self.verifier_prompt_tokens, self.verifier_prompt_sd, rng
+        )
+        completion = _draw_gaussian(
+            self.verifier_completion_tokens, self.verifier_completion_sd, rng
+        )
         return prompt, completion
 
-    def draw_coverage(self) -> float:
-        return min(1.0, max(0.0, random.gauss(self.coverage_mean, self.coverage_sd)))
+    def draw_coverage(self, rng=random) -> float:
+        return min(1.0, max(0.0, rng.gauss(self.coverage_mean, self.coverage_sd)))
 
 
 @dataclass
@@ -65,7 +101,33 @@ class SimulationResult:
     mean_json_failures: float
 
 
-def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> SimulationResult:
+def simulate(
+    strategy: Strategy,
+    runs: int = 5000,
+    budget: float = 4.0,
+    seed: Optional[int] = None,
+    engine: str = "auto",
+) -> SimulationResult:
+    """Simulate ``runs`` batches of ``strategy`` and summarise cost and coverage.
+
+    ``engine="numpy"`` draws every run at once as arrays; ``engine="python"``
+    is the original per-token loop.  ``"auto"`` picks NumPy when installed.
+    ``seed`` makes either engine reproducible.
+    """
+    if strategy.token_distribution not in TOKEN_DISTRIBUTIONS:
+        raise ValueError(f"Unknown token distribution: {strategy.token_distribution}")
+    if engine == "auto":
+        engine = "numpy" if np is not None else "python"
+    if engine == "numpy":
+        return _simulate_numpy(strategy, runs, budget, seed)
+    if engine != "python":
+        raise ValueError(f"Unknown engine: {engine}")
+    return _simulate_python(strategy, runs, budget, random.Random(seed))
+
+
+def _simulate_python(
+    strategy: Strategy, runs: int, budget: float, rng: random.Random
+) -> SimulationResult:
     costs: List[float] = []
     coverages: List[float] = []
     json_failures: List[float] = []
@@ -78,15 +140,18 @@ def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> Simul
         failures_this_run = 0
 
         for _case in range(strategy.cases):
-            prompt_tokens, completion_tokens = strategy.draw_case_tokens()
+            prompt_tokens, completion_tokens = strategy.draw_case_tokens(rng)
             total_prompt_tokens += prompt_tokens
             total_completion_tokens += completion_tokens
 
             retry_count = 0
-            while random.random() < strategy.failure_rate and retry_count < strategy.max_retries:
+            while (
+                rng.random() < strategy.failure_rate
+                and retry_count < strategy.max_retries
+            ):
                 failures_this_run += 1
                 retry_count += 1
-                r_prompt, r_completion = strategy.draw_case_tokens()
+                r_prompt, r_completion = strategy.draw_case_tokens(rng)
                 total_prompt_tokens += r_prompt
                 total_completion_tokens += r_completion
 
@@ -94,11 +159,11 @@ def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> Simul
             verifier_calls = strategy.verifier_calls_per_case
             whole_calls = int(verifier_calls)
             fractional_call = verifier_calls - whole_calls
-            if fractional_call > 0 and random.random() < fractional_call:
+            if fractional_call > 0 and rng.random() < fractional_call:
                 whole_calls += 1
 
             for _ in range(whole_calls):
-                v_prompt, v_completion = strategy.draw_verifier_tokens()
+                v_prompt, v_completion = strategy.draw_verifier_tokens(rng)
                 verifier_prompt_tokens += v_prompt
                 verifier_completion_tokens += v_completion
 
@@ -109,7 +174,7 @@ def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> Simul
             + (verifier_completion_tokens / 1000.0) * TOKEN_PRICE_PER_1K_OUT
         )
 
-        coverage = strategy.draw_coverage()
+        coverage = strategy.draw_coverage(rng)
         costs.append(total_cost)
         coverages.append(coverage)
         json_failures.append(failures_this_run)
@@ -127,7 +192,9 @@ def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> Simul
             return data[int(k)]
         return data[f] * (c - k) + data[c] * (k - f)
 
-    budget_hit_rate = sum(1 for v in costs if v <= budget) / len(costs) if costs else 0.0
+    budget_hit_rate = (
+        sum(1 for v in costs if v <= budget) / len(costs) if costs else 0.0
+    )
 
     return SimulationResult(
         name=strategy.name,
@@ -142,8 +209,119 @@ def simulate(strategy: Strategy, runs: int = 5000, budget: float = 4.0) -> Simul
     )
 
 
-def run_default_scenarios(runs: int = 5000, budget: float = 4.0) -> List[SimulationResult]:
-    strategies = [
+def _clamped_normal(rng, mean: float, stdev: float, size) -> "np.ndarray":
+    if stdev <= 0:
+        return np.full(size, float(mean))
+    return np.maximum(rng.normal(mean, stdev, size), 0.0)
+
+
+def _token_draws(
+    rng, mean: float, stdev: float, size, distribution: str = "normal"
+) -> "np.ndarray":
+    if distribution == "lognormal" and mean > 0 and stdev > 0:
+        mu, sigma = _lognormal_params(mean, stdev)
+        return rng.lognormal(mu, sigma, size)
+    return _clamped_normal(rng, mean, stdev, size)
+
+
+def _per_run_sums(
+    rng, counts: "np.ndarray", mean: float, stdev: float, distribution: str = "normal"
+) -> "np.ndarray":
+    """Sum ``counts[i]`` token draws for every run ``i``."""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(len(counts))
+    draws = _token_draws(rng, mean, stdev, total, distribution)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    return np.bincount(owners, weights=draws, minlength=len(counts))
+
+
+def _simulate_numpy(
+    strategy: Strategy, runs: int, budget: float, seed: Optional[int]
+) -> SimulationResult:
+    if np is None:  # pragma: no cover - exercised only without NumPy.
+        raise RuntimeError(
+            "The numpy engine requires NumPy. Install it with `pip install numpy`."
+        )
+    if runs <= 0:
+        return SimulationResult(strategy.name, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    rng = np.random.default_rng(seed)
+    shape = (runs, strategy.cases)
+
+    # First attempt for every case.
+    kind = strategy.token_distribution
+    prompt = _token_draws(
+        rng, strategy.prompt_tokens_mean, strategy.prompt_tokens_sd, shape, kind
+    ).sum(axis=1)
+    completion = _token_draws(
+        rng, strategy.completion_tokens_mean, strategy.completion_tokens_sd, shape, kind
+    ).sum(axis=1)
+
+    # Retries: each attempt fails with ``failure_rate`` until ``max_retries``,
+    # i.e. a geometric count of failures truncated at ``max_retries``.
+    rate = min(max(strategy.failure_rate, 0.0), 1.0)
+    cap = max(strategy.max_retries, 0)
+    if rate <= 0 or cap == 0:
+        retries = np.zeros(shape, dtype=np.int64)
+    elif rate >= 1:
+        retries = np.full(shape, cap, dtype=np.int64)
+    else:
+        retries = np.minimum(rng.geometric(1.0 - rate, shape) - 1, cap)
+    retries_per_run = retries.sum(axis=1)
+    prompt += _per_run_sums(
+        rng,
+        retries_per_run,
+        strategy.prompt_tokens_mean,
+        strategy.prompt_tokens_sd,
+        kind,
+    )
+    completion += _per_run_sums(
+        rng,
+        retries_per_run,
+        strategy.completion_tokens_mean,
+        strategy.completion_tokens_sd,
+        kind,
+    )
+
+    # Verifier calls: the whole part on every case plus a Bernoulli extra call.
+    whole_calls = int(strategy.verifier_calls_per_case)
+    fractional_call = strategy.verifier_calls_per_case - whole_calls
+    calls = np.full(runs, whole_calls * strategy.cases, dtype=np.int64)
+    if fractional_call > 0:
+        calls += rng.binomial(strategy.cases, fractional_call, runs)
+    prompt += _per_run_sums(
+        rng, calls, strategy.verifier_prompt_tokens, strategy.verifier_prompt_sd
+    )
+    completion += _per_run_sums(
+        rng, calls, strategy.verifier_completion_tokens, strategy.verifier_completion_sd
+    )
+
+    costs = (prompt / 1000.0) * TOKEN_PRICE_PER_1K_IN + (
+        completion / 1000.0
+    ) * TOKEN_PRICE_PER_1K_OUT
+    coverages = np.clip(
+        rng.normal(strategy.coverage_mean, max(strategy.coverage_sd, 0.0), runs),
+        0.0,
+        1.0,
+    )
+    p05_cost, p95_cost = np.percentile(costs, [5, 95])
+    p05_cov, p95_cov = np.percentile(coverages, [5, 95])
+
+    return SimulationResult(
+        name=strategy.name,
+        mean_cost=float(costs.mean()),
+        p05_cost=float(p05_cost),
+        p95_cost=float(p95_cost),
+        budget_hit_rate=float((costs <= budget).mean()),
+        mean_coverage=float(coverages.mean()),
+        p05_coverage=float(p05_cov),
+        p95_coverage=float(p95_cov),
+        mean_json_failures=float(retries_per_run.mean()),
+    )
+
+
+def default_strategies() -> List[Strategy]:
+    return [
         Strategy(
             name="Compact single-pass (current prompt)",
             cases=70,
@@ -187,7 +365,15 @@ def run_default_scenarios(runs: int = 5000, budget: float = 4.0) -> List[Simulat
         ),
     ]
 
-    return [simulate(strategy, runs=runs, budget=budget) for strategy in strategies]
+
+def run_default_scenarios(
+    runs: int = 5000, budget: float = 4.0, seed: Optional[int] = None
+) -> List[SimulationResult]:
+    strategies = default_strategies()
+    return [
+        simulate(strategy, runs=runs, budget=budget, seed=seed)
+        for strategy in strategies
+    ]
 
 
 def pretty_print(results: Iterable[SimulationResult]) -> None:
@@ -196,11 +382,12 @@ def pretty_print(results: Iterable[SimulationResult]) -> None:
         print(f"Mean cost: ${res.mean_cost:0.2f}")
         print(f"Cost 5th–95th percentile: ${res.p05_cost:0.2f} – ${res.p95_cost:0.2f}")
         print(f"Budget ≤$4 hit rate: {res.budget_hit_rate*100:0.1f}%")
-        print(f"Mean coverage: {res.mean_coverage*100:0.1f}% (P5 {res.p05_coverage*100:0.1f}%, P95 {res.p95_coverage*100:0.1f}%)")
+        print(
+            f"Mean coverage: {res.mean_coverage*100:0.1f}% (P5 {res.p05_coverage*100:0.1f}%, P95 {res.p95_coverage*100:0.1f}%)"
+        )
         print(f"Mean JSON retries per run: {res.mean_json_failures:0.2f}")
 
 
 if __name__ == "__main__":
-    random.seed(7)
-    results = run_default_scenarios()
+    results = run_default_scenarios(seed=7)
     pretty_print(results)
@@ -0,0 +1,260 @@
+"""Grid sweeps over prompt strategy parameters with a cost/coverage frontier.
+
+``sweep`` expands a grid of ``Strategy`` overrides around a base strategy,
+simulates every point in a process pool and marks the points on the Pareto
+frontier (no other point is both cheaper and better covered).  The CLI writes
+the sweep as CSV and/or JSON and can plot it when matplotlib is installed::
+
+    python -m windsurf.tools.strategy_sweep --base 1 \\
+        --prompt-tokens 1200:2000:200 --failure-rate 0.02,0.05,0.1 \\
+        --max-retries 0,1,2 --verifier-rate 0,0.2,0.4 --coverage 0.78,0.85 \\
+        --csv sweep.csv --json sweep.json --plot sweep.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .calibrate_strategies import calibrated_strategy, load_calibration
+from .simulate_prompt_strategies import (
+    SimulationResult,
+    Strategy,
+    default_strategies,
+    simulate,
+)
+
+SWEEP_PARAMETERS = {
+    "prompt_tokens": "prompt_tokens_mean",
+    "failure_rate": "failure_rate",
+    "max_retries": "max_retries",
+    "verifier_rate": "verifier_calls_per_case",
+    "coverage": "coverage_mean",
+}
+
+
+@dataclass
+class SweepPoint:
+    params: Dict[str, float]
+    result: SimulationResult
+    on_frontier: bool = False
+
+    def as_row(self) -> Dict[str, object]:
+        row: Dict[str, object] = dict(self.params)
+        row.update(asdict(self.result))
+        row["on_frontier"] = self.on_frontier
+        return row
+
+
+def parse_values(spec: str, integer: bool = False) -> List[float]:
+    """Parse ``"a,b,c"`` or an inclusive ``"start:stop:step"`` range."""
+
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Range step must be positive: {spec}")
+        count = int(round((stop - start) / step)) + 1
+        values = [round(start + i * step, 10) for i in range(max(count, 0))]
+    else:
+        values = [float(part) for part in spec.split(",") if part.strip()]
+    return [int(v) for v in values] if integer else values
+
+
+def expand_grid(base: Strategy, grid: Mapping[str, Sequence[float]]) -> List[Strategy]:
+    """Return one ``Strategy`` per combination of the ``grid`` overrides."""
+
+    fields = list(grid)
+    strategies: List[Strategy] = []
+    for combo in itertools.product(*(grid[name] for name in fields)):
+        overrides = dict(zip(fields, combo))
+        label = ", ".join(f"{name}={value:g}" for name, value in overrides.items())
+        strategies.append(replace(base, name=f"{base.name} [{label}]", **overrides))
+    return strategies
+
+
+def pareto_frontier(points: Sequence[SweepPoint]) -> List[SweepPoint]:
+    """Mark and return the points that minimise cost and maximise coverage."""
+
+    frontier: List[SweepPoint] = []
+    best_coverage = float("-inf")
+    ordered = sorted(
+        points, key=lambda p: (p.result.mean_cost, -p.result.mean_coverage)
+    )
+    for point in ordered:
+        point.on_frontier = point.result.mean_coverage > best_coverage
+        if point.on_frontier:
+            best_coverage = point.result.mean_coverage
+            frontier.append(point)
+    return frontier
+
+
+def _simulate_one(args: tuple) -> SimulationResult:
+    strategy, runs, budget, seed = args
+    return simulate(strategy, runs=runs, budget=budget, seed=seed)
+
+
+def sweep(
+    base: Strategy,
+    grid: Mapping[str, Sequence[float]],
+    runs: int = 2000,
+    budget: float = 4.0,
+    seed: Optional[int] = 0,
+    workers: Optional[int] = None,
+) -> List[SweepPoint]:
+    """Simulate every grid point; all points share ``seed`` for fair comparison."""
+
+    strategies = expand_grid(base, grid)
+    tasks = [(strategy, runs, budget, seed) for strategy in strategies]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        results = [_simulate_one(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_one, tasks, chunksize=chunksize))
+    points = [
+        SweepPoint({name: getattr(s, name) for name in grid}, result)
+        for s, result in zip(strategies, results)
+    ]
+    pareto_frontier(points)
+    return points
+
+
+def write_csv(points: Sequence[SweepPoint], path: Path) -> None:
+    rows = [point.as_row() for point in points]
+    if not rows:
+        path.write_text("", encoding="utf-8")
+        return
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(points: Sequence[SweepPoint], path: Path) -> None:
+    payload = {
+        "points": [point.as_row() for point in points],
+        "frontier": [point.as_row() for point in points if point.on_frontier],
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def write_plot(points: Sequence[SweepPoint], path: Path) -> bool:
+    """Scatter cost against coverage; returns ``False`` without matplotlib."""
+
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except Exception:
+        return False
+    frontier = sorted(
+        (p for p in points if p.on_frontier), key=lambda p: p.result.mean_cost
+    )
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.scatter(
+        [p.result.mean_cost for p in points],
+        [p.result.mean_coverage for p in points],
+        s=12,
+        alpha=0.4,
+        label="grid",
+    )
+    ax.plot(
+        [p.result.mean_cost for p in frontier],
+        [p.result.mean_coverage for p in frontier],
+        "o-",
+        color="tab:red",
+        label="Pareto frontier",
+    )
+    ax.set_xlabel("Mean cost (USD)")
+    ax.set_ylabel("Mean coverage")
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return True
+
+
+def _print_frontier(points: Iterable[SweepPoint]) -> None:
+    print(f"{'cost':>8} {'p95':>8} {'coverage':>9}  parameters")
+    for point in sorted(
+        (p for p in points if p.on_frontier), key=lambda p: p.result.mean_cost
+    ):
+        params = ", ".join(f"{k}={v:g}" for k, v in point.params.items())
+        res = point.result
+        print(
+            f"${res.mean_cost:7.2f} ${res.p95_cost:7.2f} {res.mean_coverage*100:8.1f}%  {params}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    bases = default_strategies()
+    parser = argparse.ArgumentParser(description="Sweep prompt strategy parameters")
+    parser.add_argument(
+        "--base",
+        type=int,
+        default=1,
+        choices=range(1, len(bases) + 1),
+        help="; ".join(f"{i}: {s.name}" for i, s in enumerate(bases, start=1)),
+    )
+    for option in SWEEP_PARAMETERS:
+        parser.add_argument(
+            f"--{option.replace('_', '-')}",
+            dest=option,
+            help="Comma list or start:stop:step range",
+        )
+    parser.add_argument(
+        "--calibration",
+        type=Path,
+        help="Calibration JSON from calibrate_strategies to apply to the base",
+    )
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--budget", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--csv", type=Path, help="Write every grid point as CSV")
+    parser.add_argument("--json", type=Path, help="Write points and frontier as JSON")
+    parser.add_argument(
+        "--plot", type=Path, help="Write a cost/coverage plot (matplotlib)"
+    )
+    args = parser.parse_args(argv)
+
+    grid: Dict[str, List[float]] = {}
+    for option, field_name in SWEEP_PARAMETERS.items():
+        spec = getattr(args, option)
+        if spec:
+            grid[field_name] = parse_values(spec, integer=field_name == "max_retries")
+    if not grid:
+        parser.error("give at least one parameter range to sweep")
+
+    base = bases[args.base - 1]
+    if args.calibration:
+        base = calibrated_strategy(base, load_calibration(args.calibration))
+    points = sweep(
+        base,
+        grid,
+        runs=args.runs,
+        budget=args.budget,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    if args.csv:
+        write_csv(points, args.csv)
+    if args.json:
+        write_json(points, args.json)
+    if args.plot and not write_plot(points, args.plot):
+        print("matplotlib is not installed; skipping plot")
+    _print_frontier(points)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,63 @@
+"""Minimal YAML reader and writer used when PyYAML is not installed.
+
+``safe_load`` handles the subset the card deck and the policy file use:
+block mappings and sequences (including sequences at the same indentation
+as their key and ``- key: value`` items), literal and folded block scalars
+with chomping and indentation indicators, single- and double-quoted scalars
+(also across lines), flow lists and mappings, plain multi-line scalars and
+comments.  Scalars resolve like PyYAML's safe loader for booleans, nulls,
+integers and floats; timestamps stay strings.
+
+The parser makes one pass over the lines.  Containers that are still open
+live on an explicit stack keyed by indentation, so there is no recursion per
+nesting level, and block or quoted scalars consume their own lines directly
+(comment characters are literal there), so every line is looked at once.
+
+``safe_dump`` writes the same subset in PyYAML's block style straight to the
+stream: multi-line strings become literal block scalars (``|``, ``|-`` or
+``|+``), other strings are plain when that reads back unchanged and quoted
+otherwise, and ``sort_keys=False`` keeps mapping order.  Long lines are not
+wrapped.
+"""
+
 from __future__ import annotations
 
-import json
-from typing import Any, Tuple
+import io
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class YAMLError(ValueError):
+    """Raised for input outside the supported subset or malformed YAML."""
+
+
+_MISSING = object()
+
+_BOOL = {
+    "true": True, "True": True, "TRUE": True,
+    "false": False, "False": False, "FALSE": False,
+    "yes": True, "Yes": True, "YES": True,
+    "no": False, "No": False, "NO": False,
+    "on": True, "On": True, "ON": True,
+    "off": False, "Off": False, "OFF": False,
+}  # fmt: skip
+_NULL = {"", "~", "null", "Null", "NULL"}
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9][0-9_]*)$")
+_BASE_INT_RE = re.compile(r"([-+]?)(0x|0b|0)([0-9a-fA-F_]+)$")
+_FLOAT_RE = re.compile(r"[-+]?(?:[0-9][0-9_]*\.[0-9_]*|\.[0-9_]+)(?:[eE][-+][0-9]+)?$")
+_SPECIAL_FLOATS = {
+    ".inf": float("inf"), ".Inf": float("inf"), ".INF": float("inf"),
+    "+.inf": float("inf"), "+.Inf": float("inf"), "+.INF": float("inf"),
+    "-.inf": float("-inf"), "-.Inf": float("-inf"), "-.INF": float("-inf"),
+    ".nan": float("nan"), ".NaN": float("nan"), ".NAN": float("nan"),
+}  # fmt: skip
+_ESCAPES = {
+    "0": "\0", "a": "\a", "b": "\b", "t": "\t", "\t": "\t", "n": "\n",
+    "v": "\v", "f": "\f", "r": "\r", "e": "\x1b", " ": " ", '"': '"',
+    "/": "/", "\\": "\\", "N": "\x85", "_": "\xa0", "L": "\u2028", "P": "\u2029",
+}  # fmt: skip
+_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|.)")
 
 
 def safe_load(stream: Any) -> Any:
@@ -11,151 +67,771 @@ def safe_load(stream: Any) -> Any:
         text = stream
     if text is None:
         return None
-    lines = text.splitlines()
-    data, _ = _parse_block(lines, 0, 0)
-    return data
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    return _Parser(text).parse()
 
 
-def safe_dump(data: Any, stream: Any, **_: Any) -> None:
-    # Fallback: write JSON-formatted string which remains valid YAML
-    dumped = json.dumps(data, ensure_ascii=False, indent=2)
-    stream.write(dumped)
+def safe_dump(
+    data: Any,
+    stream: Any = None,
+    *,
+    sort_keys: bool = True,
+    allow_unicode: bool = False,
+    indent: int = 2,
+    explicit_start: bool = False,
+    **_: Any,
+) -> Optional[str]:
+    """Write ``data`` as block-style YAML; return it as a string without ``stream``."""
 
+    buffer = io.StringIO() if stream is None else None
+    target = buffer if buffer is not None else stream
+    if explicit_start:
+        target.write("---\n")
+    _Emitter(target.write, sort_keys, allow_unicode, max(indent, 2)).document(data)
+    return buffer.getvalue() if buffer is not None else None
 
-def _parse_block(lines: list[str], index: int, indent: int) -> Tuple[Any, int]:
-    mapping: dict[str, Any] = {}
-    sequence: list[Any] = []
-    mode: str | None = None
 
-    while index < len(lines):
-        raw_line = lines[index]
-        stripped_line = _strip_comments(raw_line).rstrip()
-        if not stripped_line.strip():
-            index += 1
-            continue
-        current_indent = len(raw_line) - len(raw_line.lstrip(" "))
-        if current_indent < indent:
-            break
-        line = stripped_line.strip()
-        if line.startswith("- "):
-            if mode is None:
-                mode = "list"
-            elif mode != "list":
-                break
-            value, index = _parse_list_value(lines, index, current_indent)
-            sequence.append(value)
+# ---------------------------------------------------------------------------
+# Scalars
+# ---------------------------------------------------------------------------
+def _resolve_plain(token: str) -> Any:
+    if token in _NULL:
+        return None
+    if token in _BOOL:
+        return _BOOL[token]
+    first = token[0]
+    if first.isdigit() or first in "+-.":
+        if _INT_RE.match(token):
+            return int(token.replace("_", ""))
+        match = _BASE_INT_RE.match(token)
+        if match:
+            sign, prefix, digits = match.groups()
+            base = {"0x": 16, "0b": 2}.get(prefix, 8)
+            try:
+                value = int(digits.replace("_", ""), base)
+            except ValueError:
+                return token
+            return -value if sign == "-" else value
+        if _FLOAT_RE.match(token):
+            return float(token.replace("_", ""))
+        if token in _SPECIAL_FLOATS:
+            return _SPECIAL_FLOATS[token]
+    return token
+
+
+def _strip_comment(text: str) -> str:
+    """Drop a trailing `` #`` comment from a plain scalar."""
+
+    if "#" not in text:
+        return text.rstrip()
+    if text.startswith("#"):
+        return ""
+    cut = text.find(" #")
+    tab = text.find("\t#")
+    if tab != -1 and (cut == -1 or tab < cut):
+        cut = tab
+    return (text if cut == -1 else text[:cut]).rstrip()
+
+
+def _find_close(text: str, start: int, quote: str) -> int:
+    """Index of the quote that closes a scalar opened before ``start``, or -1."""
+
+    pos = text.find(quote, start)
+    while pos != -1:
+        if quote == "'":
+            if pos + 1 < len(text) and text[pos + 1] == "'":
+                pos = text.find(quote, pos + 2)
+                continue
+            return pos
+        backslashes = 0
+        back = pos - 1
+        while back >= start and text[back] == "\\":
+            backslashes += 1
+            back -= 1
+        if backslashes % 2 == 0:
+            return pos
+        pos = text.find(quote, pos + 1)
+    return -1
+
+
+def _unquote(raw: str, quote: str) -> str:
+    if quote == "'":
+        return raw.replace("''", "'")
+    if "\\" not in raw:
+        return raw
+
+    def _escape(match: "re.Match[str]") -> str:
+        code = match.group(1)
+        if len(code) > 1:
+            return chr(int(code[1:], 16))
+        if code not in _ESCAPES:
+            raise YAMLError(f"unknown escape sequence \\{code}")
+        return _ESCAPES[code]
+
+    return _ESCAPE_RE.sub(_escape, raw)
+
+
+def _fold_quoted(pieces: List[str], quote: str) -> str:
+    """Join the lines of a multi-line quoted scalar the way YAML folds them."""
+
+    out = pieces[0]
+    breaks = 0
+    last = len(pieces) - 1
+    for index in range(1, len(pieces)):
+        piece = pieces[index]
+        content = piece.lstrip(" \t") if index == last else piece.strip(" \t")
+        if not content and index != last:
+            breaks += 1
             continue
+        if (
+            quote == '"'
+            and out.endswith("\\")
+            and (len(out) - len(out.rstrip("\\"))) % 2
+        ):
+            out = out[:-1] + content  # escaped line break
         else:
-            if mode is None:
-                mode = "dict"
-            elif mode != "dict":
+            out = out.rstrip(" \t") + ("\n" * breaks if breaks else " ") + content
+        breaks = 0
+    return out
+
+
+class _Flow:
+    """Recursive-descent reader for a complete flow collection."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Any:
+        value = self._node(")")
+        self._skip()
+        if self.pos != len(self.text):
+            raise YAMLError(
+                f"unexpected text after flow collection: {self.text[self.pos:]!r}"
+            )
+        return value
+
+    def _skip(self) -> None:
+        text = self.text
+        while self.pos < len(text) and text[self.pos] in " \t\r\n":
+            self.pos += 1
+
+    def _node(self, stops: str) -> Any:
+        self._skip()
+        if self.pos >= len(self.text):
+            raise YAMLError("unterminated flow collection")
+        char = self.text[self.pos]
+        if char == "[":
+            return self._sequence()
+        if char == "{":
+            return self._mapping()
+        if char in "'\"":
+            end = _find_close(self.text, self.pos + 1, char)
+            if end == -1:
+                raise YAMLError("unterminated quoted scalar in flow collection")
+            raw = self.text[self.pos + 1 : end]
+            self.pos = end + 1
+            return _unquote(_fold_quoted(raw.split("\n"), char), char)
+        start = self.pos
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in stops:
+                break
+            if char == ":" and (
+                self.pos + 1 == len(text) or text[self.pos + 1] in " ,]}"
+            ):
                 break
-            key, value, index = _parse_mapping_entry(lines, index, current_indent)
+            self.pos += 1
+        return _resolve_plain(" ".join(text[start : self.pos].split()))
+
+    def _sequence(self) -> List[Any]:
+        self.pos += 1
+        items: List[Any] = []
+        while True:
+            self._skip()
+            if self.pos < len(self.text) and self.text[self.pos] == "]":
+                self.pos += 1
+                return items
+            item = self._node(",:]")
+            self._skip()
+            if self._peek() == ":":
+                # ``[key: value]`` is a single-pair mapping, as in PyYAML.
+                self.pos += 1
+                self._skip()
+                item = {item: None if self._peek() in ",]" else self._node(",]")}
+                self._skip()
+            items.append(item)
+            self._separator("]")
+
+    def _mapping(self) -> Dict[Any, Any]:
+        self.pos += 1
+        mapping: Dict[Any, Any] = {}
+        while True:
+            self._skip()
+            if self.pos < len(self.text) and self.text[self.pos] == "}":
+                self.pos += 1
+                return mapping
+            key = self._node(",:}")
+            self._skip()
+            value = None
+            if self.pos < len(self.text) and self.text[self.pos] == ":":
+                self.pos += 1
+                value = self._node(",}")
             mapping[key] = value
-    if mode == "list":
-        return sequence, index
-    return mapping, index
-
-
-def _parse_list_value(lines: list[str], index: int, indent: int) -> Tuple[Any, int]:
-    raw_line = lines[index]
-    stripped = _strip_comments(raw_line).rstrip()
-    entry = stripped[indent:].lstrip()[2:].strip()
-    index += 1
-    if entry:
-        if entry.endswith(":"):
-            key = entry[:-1].strip()
-            nested, index = _parse_block(lines, index, indent + 2)
-            return {key: nested}, index
-        value, index = _parse_scalar(entry, lines, index, indent + 2)
-        return value, index
-    nested, index = _parse_block(lines, index, indent + 2)
-    return nested, index
-
-
-def _parse_mapping_entry(
-    lines: list[str], index: int, indent: int
-) -> Tuple[str, Any, int]:
-    raw_line = lines[index]
-    stripped = _strip_comments(raw_line).rstrip()
-    current = stripped[indent:]
-    key, _, remainder = current.partition(":")
-    key = key.strip()
-    remainder = remainder.strip()
-    index += 1
-    if remainder:
-        value, index = _parse_scalar(remainder, lines, index, indent + 2)
-        return key, value, index
-    value, index = _parse_block(lines, index, indent + 2)
-    return key, value, index
-
-
-def _parse_scalar(
-    token: str, lines: list[str], index: int, indent: int
-) -> Tuple[Any, int]:
-    if token.startswith("'") or token.startswith('"'):
+            self._skip()
+            self._separator("}")
+
+    def _peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def _separator(self, close: str) -> None:
+        """Consume the ``,`` after an entry; anything but ``close`` is an error."""
+
+        char = self._peek()
+        if char == ",":
+            self.pos += 1
+        elif char != close:
+            if not char:
+                raise YAMLError("unterminated flow collection")
+            raise YAMLError(f"unexpected {char!r} in flow collection")
+
+
+# ---------------------------------------------------------------------------
+# Block structure
+# ---------------------------------------------------------------------------
+class _Parser:
+    def __init__(self, text: str) -> None:
+        if text.startswith("\ufeff"):
+            text = text[1:]
+        self.lines = text.splitlines()
+        self.final_break = text.endswith(("\n", "\r"))
+        self.index = 0
+        self.root: Any = _MISSING
+        # Open containers as (indent, container), innermost last.
+        self.stack: List[Tuple[int, Any]] = []
+        # ``key:`` or ``-`` awaiting a nested block: (container, key, indent, in_mapping)
+        self.pending: Optional[Tuple[Any, Any, int, bool]] = None
+        # Last plain scalar, which may continue on more-indented lines.
+        self.plain: Optional[Tuple[Any, Any, int]] = None
+        self.plain_breaks = 0
+        self.scalar_root: List[Any] = []
+
+    def parse(self) -> Any:
+        lines = self.lines
+        while self.index < len(lines):
+            line = lines[self.index]
+            self.index += 1
+            stripped = line.lstrip(" ")
+            if not stripped or stripped[0] == "#":
+                if self.plain is not None and not stripped:
+                    self.plain_breaks += 1
+                continue
+            indent = len(line) - len(stripped)
+            if indent == 0 and (
+                stripped[0] == "%"
+                or stripped.rstrip() in ("---", "...")
+                or stripped.startswith("--- ")
+            ):
+                if stripped.startswith("--- ") and _strip_comment(stripped[4:]):
+                    self._line(0, stripped[4:].lstrip().rstrip())
+                continue
+            self._line(indent, stripped.rstrip())
+        if self.root is _MISSING:
+            return None
+        return self.scalar_root[0] if self.root is self.scalar_root else self.root
+
+    def _line(self, indent: int, text: str) -> None:
+        is_item = text == "-" or text.startswith("- ")
+
+        if self.plain is not None:
+            container, key, owner = self.plain
+            if indent > owner and self.pending is None:
+                extra = _strip_comment(text)
+                if extra:
+                    joiner = "\n" * self.plain_breaks if self.plain_breaks else " "
+                    container[key] = f"{container[key]}{joiner}{extra}"
+                self.plain_breaks = 0
+                return
+            self.plain = None
+        self.plain_breaks = 0
+
+        if self.pending is not None:
+            container, key, owner, in_mapping = self.pending
+            self.pending = None
+            if indent > owner or (in_mapping and indent == owner and is_item):
+                child: Any = [] if is_item else {}
+                container[key] = child
+                self.stack.append((indent, child))
+
+        stack = self.stack
+        while stack:
+            top_indent, top = stack[-1]
+            if top_indent > indent or (
+                top_indent == indent and isinstance(top, list) and not is_item
+            ):
+                stack.pop()
+                continue
+            break
+
+        if not stack:
+            if self.root is not _MISSING:
+                raise YAMLError(f"unexpected content at line {self.index}: {text!r}")
+            if is_item:
+                self.root = []
+            elif self._split_key(text) is not None:
+                self.root = {}
+            else:
+                self.scalar_root = [None]
+                self.scalar_root[0] = self._value(text, -1, self.scalar_root, 0)
+                self.root = self.scalar_root
+                return
+            stack.append((indent, self.root))
+
+        top_indent, top = stack[-1]
+        if top_indent != indent:
+            raise YAMLError(f"bad indentation at line {self.index}: {text!r}")
+
+        if is_item:
+            if not isinstance(top, list):
+                raise YAMLError(f"sequence item inside a mapping at line {self.index}")
+            content = text[1:].lstrip(" ")
+            top.append(None)
+            if not content or content[0] == "#":
+                self.pending = (top, len(top) - 1, indent, False)
+                return
+            column = indent + len(text) - len(content)
+            nested_item = content == "-" or content.startswith("- ")
+            if nested_item or self._split_key(content) is not None:
+                child = [] if nested_item else {}
+                top[-1] = child
+                stack.append((column, child))
+                self._line(column, content)
+                return
+            top[-1] = self._value(content, indent, top, len(top) - 1)
+            return
+
+        if not isinstance(top, dict):
+            raise YAMLError(f"mapping entry inside a sequence at line {self.index}")
+        split = self._split_key(text)
+        if split is None:
+            raise YAMLError(f"expected 'key: value' at line {self.index}: {text!r}")
+        key, rest = split
+        if not rest or rest[0] == "#":
+            top[key] = None
+            self.pending = (top, key, indent, True)
+            return
+        top[key] = self._value(rest, indent, top, key)
+
+    @staticmethod
+    def _split_key(text: str) -> Optional[Tuple[Any, str]]:
+        """Split ``key: rest``; ``None`` when ``text`` is not a mapping entry."""
+
+        first = text[0]
+        if first in "'\"":
+            end = _find_close(text, 1, first)
+            if end == -1:
+                return None
+            after = text[end + 1 :].lstrip(" ")
+            if not after.startswith(":") or (len(after) > 1 and after[1] not in " \t"):
+                return None
+            return _unquote(text[1:end], first), after[1:].strip()
+        if first in "[{|>!&*#":
+            return None
+        sep = text.find(": ")
+        tab = text.find(":\t")
+        if tab != -1 and (sep == -1 or tab < sep):
+            sep = tab
+        if sep == -1:
+            if not text.endswith(":"):
+                return None
+            sep = len(text) - 1
+        comment = text.find(" #")
+        if comment != -1 and comment < sep:
+            return None
+        return _resolve_plain(text[:sep].rstrip()), text[sep + 1 :].strip()
+
+    def _value(self, token: str, owner: int, container: Any, key: Any) -> Any:
+        first = token[0]
+        if first in "|>":
+            return self._block_scalar(token, owner)
+        if first in "'\"":
+            return self._quoted(token)
+        if first in "[{":
+            return self._flow(token)
+        value = _strip_comment(token)
+        self.plain = (container, key, owner)
+        self.plain_breaks = 0
+        return _resolve_plain(value)
+
+    def _quoted(self, token: str) -> str:
         quote = token[0]
-        if token.endswith(quote) and not token.endswith(f"\\{quote}"):
-            return token[1:-1], index
-        parts = [token[1:]]
-        while index < len(lines):
-            segment = _strip_comments(lines[index])
-            index += 1
-            if segment.rstrip().endswith(quote):
-                parts.append(segment.rstrip()[:-1])
+        pieces: List[str] = []
+        text, start = token, 1
+        while True:
+            end = _find_close(text, start, quote)
+            if end != -1:
+                pieces.append(text[start:end])
                 break
-            parts.append(segment.rstrip())
-        return "\n".join(parts), index
-    if token in {"|", "|-", ">", ">-"}:
-        block_lines: list[str] = []
+            pieces.append(text[start:])
+            if self.index >= len(self.lines):
+                raise YAMLError("unterminated quoted scalar")
+            text, start = self.lines[self.index], 0
+            self.index += 1
+        rest = text[end + 1 :].strip()
+        if rest and rest[0] != "#":
+            raise YAMLError(f"unexpected text after quoted scalar: {rest!r}")
+        return _unquote(_fold_quoted(pieces, quote), quote)
+
+    def _flow(self, token: str) -> Any:
+        parts = [token]
+        depth = _bracket_depth(token)
+        while depth > 0:
+            if self.index >= len(self.lines):
+                raise YAMLError("unterminated flow collection")
+            line = self.lines[self.index]
+            self.index += 1
+            parts.append(line)
+            depth += _bracket_depth(line)
+        text = "\n".join(parts)
+        closing = _flow_end(text)
+        if text[closing:].strip() and not text[closing:].strip().startswith("#"):
+            raise YAMLError(
+                f"unexpected text after flow collection: {text[closing:]!r}"
+            )
+        return _Flow(text[:closing]).parse()
+
+    def _block_scalar(self, header: str, owner: int) -> str:
+        header = _strip_comment(header)
+        style = header[0]
+        chomp = "clip"
+        increment = 0
+        for char in header[1:]:
+            if char == "-":
+                chomp = "strip"
+            elif char == "+":
+                chomp = "keep"
+            elif char.isdigit():
+                increment = int(char)
+            else:
+                raise YAMLError(f"bad block scalar header: {header!r}")
+
+        lines = self.lines
+        index = self.index
+        min_indent = max(owner + 1, 1)
+        if increment:
+            block_indent = min_indent + increment - 1
+        else:
+            block_indent = 0
+            probe = index
+            while probe < len(lines):
+                stripped = lines[probe].lstrip(" ")
+                if stripped:
+                    block_indent = len(lines[probe]) - len(stripped)
+                    break
+                probe += 1
+            if block_indent < min_indent:
+                block_indent = min_indent
+
+        body: List[str] = []
         while index < len(lines):
-            raw_line = lines[index]
-            stripped = _strip_comments(raw_line)
-            if not stripped.strip():
-                block_lines.append("")
+            line = lines[index]
+            stripped = line.lstrip(" ")
+            if not stripped:
+                body.append(line[block_indent:])
                 index += 1
                 continue
-            current_indent = len(raw_line) - len(raw_line.lstrip(" "))
-            if current_indent < indent:
+            if len(line) - len(stripped) < block_indent:
                 break
-            block_lines.append(stripped[indent:])
+            body.append(line[block_indent:])
             index += 1
-        text = "\n".join(block_lines)
-        if token.startswith(">"):
-            text = " ".join(line.strip() for line in text.splitlines())
-        return text, index
-    lower = token.lower()
-    if lower in {"true", "false"}:
-        return lower == "true", index
-    if lower == "null":
-        return None, index
-    try:
-        if "." in token:
-            return float(token), index
-        return int(token), index
-    except ValueError:
-        pass
-    if token.startswith("[") and token.endswith("]"):
-        try:
-            return json.loads(token), index
-        except json.JSONDecodeError:
-            return token, index
-    return token, index
-
-
-def _strip_comments(line: str) -> str:
-    result = []
-    in_single = False
-    in_double = False
-    i = 0
-    while i < len(line):
-        ch = line[i]
-        if ch == "'" and not in_double:
-            in_single = not in_single
-        elif ch == '"' and not in_single:
-            in_double = not in_double
-        if ch == "#" and not in_single and not in_double:
+        self.index = index
+
+        trailing = 0
+        while body and not body[-1].strip(" "):
+            body.pop()
+            trailing += 1
+
+        out: List[str] = []
+        breaks = 0
+        previous_normal = False
+        for line in body:
+            if not line:
+                breaks += 1
+                continue
+            normal = line[0] not in " \t"
+            if out:
+                if style == ">" and previous_normal and normal:
+                    out.append("\n" * breaks if breaks else " ")
+                else:
+                    out.append("\n" * (breaks + 1))
+            elif breaks:
+                out.append("\n" * breaks)
+            out.append(line)
+            previous_normal = normal
+            breaks = 0
+        if breaks and out:
+            trailing += breaks
+        # The last content line has no line break when it ends the file.
+        last_break = (
+            1 if out and (index < len(lines) or self.final_break or trailing) else 0
+        )
+
+        if chomp == "strip":
+            return "".join(out)
+        if chomp == "keep":
+            return "".join(out) + "\n" * (last_break + trailing)
+        return "".join(out) + "\n" * last_break
+
+
+def _bracket_depth(text: str) -> int:
+    """Net ``[``/``{`` nesting added by ``text``, ignoring quoted spans."""
+
+    depth = 0
+    quote = ""
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == quote:
+                if quote == "'" and text[index + 1 : index + 2] == "'":
+                    index += 1
+                else:
+                    quote = ""
+            elif char == "\\" and quote == '"':
+                index += 1
+        elif char in "'\"":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "#" and (index == 0 or text[index - 1] in " \t"):
             break
-        result.append(ch)
-        i += 1
-    return "".join(result)
+        index += 1
+    return depth
+
+
+def _flow_end(text: str) -> int:
+    """Index just past the flow collection that starts ``text``."""
+
+    depth = 0
+    quote = ""
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == quote:
+                if quote == "'" and text[index + 1 : index + 2] == "'":
+                    index += 1
+                else:
+                    quote = ""
+            elif char == "\\" and quote == '"':
+                index += 1
+        elif char in "'\"":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return len(text)
+
+
+# ---------------------------------------------------------------------------
+# Emitter
+# ---------------------------------------------------------------------------
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_TIMESTAMP_RE = re.compile(r"[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}")
+_DOUBLE_ESCAPES = {
+    "\0": "\\0", "\a": "\\a", "\b": "\\b", "\t": "\\t", "\n": "\\n",
+    "\v": "\\v", "\f": "\\f", "\r": "\\r", "\x1b": "\\e", '"': '\\"',
+    "\\": "\\\\", "\x85": "\\N", "\xa0": "\\_", "\u2028": "\\L", "\u2029": "\\P",
+}  # fmt: skip
+_LINE_BREAKS = frozenset("\r\x85\u2028\u2029")
+
+
+def _printable(char: str, allow_unicode: bool) -> bool:
+    code = ord(char)
+    if code < 0x80:
+        return 0x20 <= code < 0x7F or char in "\t\n"
+    if not allow_unicode:
+        return False
+    return (
+        char not in _LINE_BREAKS
+        and code not in (0xA0, 0xFEFF)
+        and not (0xD800 <= code <= 0xDFFF or 0x7F <= code < 0xA0)
+    )
+
+
+class _Emitter:
+    """Writes one document to ``write`` in block style (see ``safe_dump``)."""
+
+    def __init__(
+        self,
+        write: Callable[[str], Any],
+        sort_keys: bool,
+        allow_unicode: bool,
+        indent: int,
+    ) -> None:
+        self.write = write
+        self.sort_keys = sort_keys
+        self.allow_unicode = allow_unicode
+        self.indent = indent
+
+    def document(self, data: Any) -> None:
+        if isinstance(data, dict) and data:
+            self._mapping(data, 0, inline=False)
+        elif isinstance(data, (list, tuple)) and data:
+            self._sequence(data, 0, inline=False)
+        else:
+            self._scalar(data, self.indent)
+
+    def _items(self, data: Dict[Any, Any]) -> Any:
+        if self.sort_keys:
+            return sorted(data.items(), key=lambda item: item[0])
+        return data.items()
+
+    def _mapping(self, data: Dict[Any, Any], indent: int, inline: bool) -> None:
+        write = self.write
+        for key, value in self._items(data):
+            if inline:
+                inline = False
+            else:
+                write(" " * indent)
+            write(self._key(key))
+            write(":")
+            if isinstance(value, dict) and value:
+                write("\n")
+                self._mapping(value, indent + self.indent, inline=False)
+            elif isinstance(value, (list, tuple)) and value:
+                write("\n")
+                self._sequence(value, indent, inline=False)
+            else:
+                write(" ")
+                self._scalar(value, indent + self.indent)
+
+    def _sequence(self, data: Any, indent: int, inline: bool) -> None:
+        write = self.write
+        for item in data:
+            if inline:
+                inline = False
+            else:
+                write(" " * indent)
+            write("- ")
+            if isinstance(item, dict) and item:
+                self._mapping(item, indent + 2, inline=True)
+            elif isinstance(item, (list, tuple)) and item:
+                self._sequence(item, indent + 2, inline=True)
+            else:
+                self._scalar(item, indent + self.indent)
+
+    def _key(self, key: Any) -> str:
+        if isinstance(key, str) and ("\n" in key or not key):
+            return self._double_quoted(key)
+        return self._inline(key)
+
+    def _scalar(self, value: Any, block_indent: int) -> None:
+        if isinstance(value, str) and "\n" in value and self._block_ok(value):
+            self._literal(value, block_indent)
+        else:
+            self.write(self._inline(value))
+            self.write("\n")
+
+    def _inline(self, value: Any) -> str:
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, float):
+            if math.isnan(value):
+                return ".nan"
+            if math.isinf(value):
+                return ".inf" if value > 0 else "-.inf"
+            text = repr(value).lower()
+            if "." not in text and "e" in text:
+                text = text.replace("e", ".0e", 1)
+            return text
+        if isinstance(value, dict):
+            return "{}"
+        if isinstance(value, (list, tuple)):
+            return "[]"
+        text = str(value)
+        if self._plain_ok(text):
+            return text
+        if "\n" not in text and all(_printable(c, self.allow_unicode) for c in text):
+            return "'" + text.replace("'", "''") + "'"
+        return self._double_quoted(text)
+
+    def _plain_ok(self, text: str) -> bool:
+        if not text or text != text.strip(" \t") or "\n" in text:
+            return False
+        first = text[0]
+        if first in _INDICATORS and not (
+            first in "-?:" and len(text) > 1 and text[1] not in " \t"
+        ):
+            return False
+        if ": " in text or " #" in text or text.endswith(":") or "\t" in text:
+            return False
+        if _resolve_plain(text) is not text or _TIMESTAMP_RE.match(text):
+            return False
+        return all(_printable(c, self.allow_unicode) for c in text)
+
+    def _block_ok(self, text: str) -> bool:
+        return text.strip(" \n") != "" and all(
+            _printable(c, self.allow_unicode) for c in text
+        )
+
+    def _double_quoted(self, text: str) -> str:
+        out = ['"']
+        for char in text:
+            if char in _DOUBLE_ESCAPES:
+                out.append(_DOUBLE_ESCAPES[char])
+            elif _printable(char, self.allow_unicode):
+                out.append(char)
+            else:
+                code = ord(char)
+                if code <= 0xFF:
+                    out.append(f"\\x{code:02X}")
+                elif code <= 0xFFFF:
+                    out.append(f"\\u{code:04X}")
+                else:
+                    out.append(f"\\U{code:08X}")
+        out.append('"')
+        return "".join(out)
+
+    def _literal(self, text: str, block_indent: int) -> None:
+        write = self.write
+        if not text.endswith("\n"):
+            chomp = "-"
+        elif text.endswith("\n\n"):
+            chomp = "+"
+        else:
+            chomp = ""
+        first_content = text.lstrip("\n")
+        header = (
+            "|" + (str(self.indent) if first_content[:1] in (" ", "\t") else "") + chomp
+        )
+        write(header)
+        write("\n")
+        padding = " " * block_indent
+        start = 0
+        end = len(text) - 1 if text.endswith("\n") else len(text)
+        while start <= end:
+            stop = text.find("\n", start, end)
+            if stop == -1:
+                stop = end
+            line = text[start:stop]
+            if line:
+                write(padding)
+                write(line)
+            write("\n")
+            start = stop + 1
+
+
+__all__ = ["YAMLError", "safe_dump", "safe_load"]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from windsurf.backups import BackupStore
+
+
+def test_identical_content_is_stored_once_and_restored(tmp_path) -> None:
+    store = BackupStore(tmp_path / "backups", base=tmp_path)
+    cards = [tmp_path / "a.yml", tmp_path / "b.yml"]
+    for card in cards:
+        card.write_text("front: same?\n", encoding="utf-8")
+
+    for card in cards:
+        store.add(card, "run-1")
+    store.add(cards[0], "run-1")  # same run, same bytes: no new manifest line
+    cards[0].write_text("front: edited?\n", encoding="utf-8")
+    store.add(cards[0], "run-2")
+
+    assert [entry.path for entry in store.manifest("run-1")] == ["a.yml", "b.yml"]
+    assert len(list(store.objects_dir.glob("*/*"))) == 2
+    assert store.runs() == ["run-1", "run-2"]
+
+    restored = store.restore("run-1")
+    assert sorted((path.name, changed) for path, changed in restored) == [
+        ("a.yml", True),
+        ("b.yml", False),
+    ]
+    assert cards[0].read_text(encoding="utf-8") == "front: same?\n"
+    undo = [run for run in store.runs() if run.startswith("restore-")]
+    assert [entry.path for entry in store.manifest(undo[0])] == ["a.yml"]
+
+
+def test_prune_keeps_newest_runs_and_their_blobs(tmp_path) -> None:
+    store = BackupStore(tmp_path / "backups", base=tmp_path, link="copy")
+    card = tmp_path / "card.yml"
+    for run, text in (("run-1", "old"), ("run-2", "shared"), ("run-3", "shared")):
+        card.write_text(text, encoding="utf-8")
+        store.add(card, run)
+
+    stats = store.prune(retain=2)
+
+    assert stats["runs_removed"] == 1 and stats["blobs_removed"] == 1
+    assert store.runs() == ["run-2", "run-3"]
+    blob = store.manifest("run-3")[0].blob
+    assert store.read_blob(blob) == b"shared"
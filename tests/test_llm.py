@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from windsurf import llm, telemetry
+
+
+class _Flaky(llm.FakeBackend):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = list(failures)
+
+    def create(self, **params):
+        if self.failures:
+            raise self.failures.pop(0)
+        return super().create(**params)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def _metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "METRICS_PATH", tmp_path / "metrics.jsonl")
+    return tmp_path / "metrics.jsonl"
+
+
+def test_fake_backend_is_deterministic() -> None:
+    client = llm.LLMClient(llm.LLMConfig(backend="fake"))
+    messages = [{"role": "user", "content": "hello"}]
+
+    first = client.complete(messages, tool="test")
+    assert first == client.complete(messages, tool="test")
+    assert first != client.complete([{"role": "user", "content": "bye"}], tool="test")
+    assert json.loads(first)["fake"] is True
+    assert client.backend.calls[0]["timeout"] == client.config.timeout
+    assert client.unavailable_reason() is None
+
+
+def test_transient_errors_are_retried_with_backoff(_metrics) -> None:
+    delays = []
+    backend = _Flaky([TimeoutError("slow"), _StatusError(503)])
+    client = llm.LLMClient(
+        llm.LLMConfig(backoff_base=1.0), backend=backend, sleep=delays.append
+    )
+
+    assert client.complete([{"role": "user", "content": "x"}], tool="test")
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 1.0 and 0 <= delays[1] <= 2.0
+    attempts = [(r["attempt"], r["status"]) for r in telemetry.read_records(_metrics)]
+    assert attempts == [(1, "error"), (2, "error"), (3, "ok")]
+
+
+def test_permanent_errors_and_exhausted_retries_raise() -> None:
+    delays = []
+    client = llm.LLMClient(
+        llm.LLMConfig(), backend=_Flaky([_StatusError(401)]), sleep=delays.append
+    )
+    with pytest.raises(_StatusError):
+        client.complete([], tool="test")
+    assert delays == []
+
+    client = llm.LLMClient(
+        llm.LLMConfig(), backend=_Flaky([_StatusError(429)] * 3), sleep=delays.append
+    )
+    with pytest.raises(_StatusError):
+        client.complete([], tool="test", max_retries=1)
+    assert len(delays) == 1
+
+
+def test_shared_clients_are_reused(monkeypatch) -> None:
+    monkeypatch.setenv("WINDSURF_LLM_BACKEND", "fake")
+    llm.reset_clients()
+    try:
+        assert llm.get_client() is llm.get_client()
+        assert llm.get_client(model="other") is not llm.get_client()
+        assert isinstance(llm.get_client().backend, llm.FakeBackend)
+    finally:
+        llm.reset_clients()
+
+
+def test_only_transport_errors_are_retried(monkeypatch) -> None:
+    class APIConnectionError(Exception):
+        pass
+
+    assert llm.is_retryable(TimeoutError())
+    assert llm.is_retryable(ConnectionResetError())
+    assert llm.is_retryable(APIConnectionError())
+    assert not llm.is_retryable(RuntimeError("OpenAI SDK not available"))
+    assert not llm.is_retryable(AttributeError())
+
+    delays = []
+    client = llm.LLMClient(llm.LLMConfig(backend="openai"), sleep=delays.append)
+    monkeypatch.setattr(
+        client, "_build_backend", lambda: (_ for _ in ()).throw(RuntimeError("no SDK"))
+    )
+    with pytest.raises(RuntimeError):
+        client.complete([], tool="test")
+    assert delays == []
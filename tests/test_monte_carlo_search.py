@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import shutil
+from itertools import combinations, product
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+yaml = pytest.importorskip("yaml")
+
+from jd.monte_carlo.batch_search import BatchDiagramSearch  # noqa: E402
+from jd.monte_carlo.card_context import build_card_context  # noqa: E402
+from jd.monte_carlo.config import (  # noqa: E402
+    ALLOWED_CHILD_VECTORS,
+    CARDS_DIR,
+    get_card_context,
+    use_card_context,
+)
+from jd.monte_carlo.deck import optimise_deck  # noqa: E402
+from jd.monte_carlo.diagram_generator import DiagramCandidate  # noqa: E402
+from jd.monte_carlo.evaluation import compute_metrics, score_candidate  # noqa: E402
+from jd.monte_carlo.exact_search import _best_children, solve_exact  # noqa: E402
+from jd.monte_carlo.optimize_diagram import optimise_diagram  # noqa: E402
+from jd.monte_carlo.policy_validator import (  # noqa: E402
+    validate_candidate,
+    validate_diagram,
+)
+from windsurf.tools.mindmap import parse_mindmap  # noqa: E402
+
+SCORE_WEIGHTS = {"coverage": 0.45, "priority": 0.40, "balance": 0.15}
+
+
+@pytest.mark.parametrize("section_weights", [None, {"Legal Test": 0.4}])
+def test_batch_scores_match_reference_metrics(section_weights) -> None:
+    search = BatchDiagramSearch(section_weights, SCORE_WEIGHTS)
+    candidate, score = search.run(500, seed=3, batch_size=128)
+
+    assert validate_diagram(candidate.to_mermaid()).valid
+    reference = score_candidate(compute_metrics(candidate), SCORE_WEIGHTS)
+    assert score == pytest.approx(reference)
+
+
+def test_batch_engine_is_seeded() -> None:
+    first = optimise_diagram(300, {}, SCORE_WEIGHTS, seed=11, engine="batch")
+    second = optimise_diagram(300, {}, SCORE_WEIGHTS, seed=11, engine="batch")
+
+    assert first.children == second.children
+
+
+def test_structural_validation_agrees_with_rendered_text() -> None:
+    candidate, _ = solve_exact(None, SCORE_WEIGHTS)
+    body = candidate.to_mermaid().splitlines()[2:-1]
+
+    assert parse_mindmap(body) == candidate.structure()
+    assert validate_candidate(candidate).valid
+
+    label = candidate.labels[0]
+    candidate.children[label] = candidate.children[label] + ["Extra"]
+    assert not validate_candidate(candidate).valid
+    assert not validate_diagram(candidate.to_mermaid()).valid
+
+
+def test_exact_solver_matches_brute_force() -> None:
+    context = get_card_context()
+    labels = context.section_labels
+    brute_best = float("-inf")
+    for vector in ALLOWED_CHILD_VECTORS:
+        choices = [
+            combinations(context.section_content[label], count)
+            for label, count in zip(labels, vector)
+        ]
+        for picks in product(*choices):
+            candidate = DiagramCandidate(
+                labels=labels,
+                children={label: list(p) for label, p in zip(labels, picks)},
+            )
+            score = score_candidate(compute_metrics(candidate), SCORE_WEIGHTS)
+            brute_best = max(brute_best, score)
+
+    candidate, score = solve_exact(None, SCORE_WEIGHTS)
+
+    assert score == pytest.approx(brute_best)
+    assert validate_diagram(candidate.to_mermaid()).valid
+
+
+CARD = {
+    "front": "Trespass (Vic): what are the elements?",
+    "back": (
+        "Issue.\nWas there a direct interference with possession?\n\n"
+        "Rule.\n- Actionable per se.\n- Direct and voluntary act.\n\n"
+        "Application scaffold.\n(1) Prove possession.\n(2) Identify the act.\n"
+        "(3) Test justification.\n\n"
+        "Authorities map.\n- Halliday v Nevill (1984) 155 CLR 1 — Implied licence.\n"
+        "- Plenty v Dillon (1991) 171 CLR 635 — Mistake no defence.\n"
+        "- Kuru v State of NSW (2008) 236 CLR 1 — Licence withdrawn.\n\n"
+        "Tripwires.\n- Ownership is not the interest protected.\n\n"
+        "Conclusion.\nShow possession, directness and no justification."
+    ),
+    "anchors": {
+        "cases": [{"name": "Kuru v State of NSW"}],
+        "statutes": [
+            {"name": "Summary Offences Act 1966 (Vic)"},
+            {"name": "Wrongs Act 1958 (Vic)"},
+        ],
+    },
+}
+
+
+def test_card_context_is_derived_from_back_and_anchors() -> None:
+    context = build_card_context(CARD)
+
+    assert context.root_label == "Trespass (Vic)"
+    assert context.section_content["Application"][0] == "Prove possession"
+    # Anchored cases outrank the order of the authorities map.
+    case_priority = context.key_item_priority["Case Law"]
+    assert max(case_priority, key=case_priority.get) == "Kuru v State of NSW"
+    # No statutory hook section: the anchors fill the pool.
+    assert context.section_content["Statute"] == [
+        "Summary Offences Act 1966 (Vic)",
+        "Wrongs Act 1958 (Vic)",
+    ]
+    # Long items are cut at a phrase boundary, never on a function word.
+    assert "Was there a direct interference" in context.section_content["Legal Test"]
+
+    candidate, _ = solve_exact(None, SCORE_WEIGHTS, context=context)
+    with use_card_context(context):
+        diagram = candidate.to_mermaid()
+        assert validate_diagram(diagram).valid
+        assert 'root(("Trespass (Vic)"))' in diagram
+        assert '      ["Summary Offences Act 1966 (Vic)"]' in diagram
+        body = diagram.splitlines()[2:-1]
+        assert parse_mindmap(body) == candidate.structure()
+
+
+def test_vectors_needing_more_children_than_a_pool_are_infeasible() -> None:
+    context = build_card_context(CARD)
+    context.section_content["Statute"] = context.section_content["Statute"][:1]
+
+    with pytest.raises(RuntimeError):
+        solve_exact(None, SCORE_WEIGHTS, context=context)
+    with pytest.raises(RuntimeError):
+        BatchDiagramSearch(None, SCORE_WEIGHTS, context=context)
+
+    candidate, _ = solve_exact(None, SCORE_WEIGHTS)
+    label = candidate.labels[1]
+    candidate.children[label] = [candidate.children[label][0]] * len(
+        candidate.children[label]
+    )
+    assert not validate_candidate(candidate).valid
+
+
+CARD_NAMES = [
+    "0004-causation-s51-factual-vs-scope.yml",
+    "0005-trespass-to-land-elements.yml",
+]
+
+
+def test_deck_optimises_each_card_in_its_own_context(tmp_path: Path) -> None:
+    paths = []
+    for name in CARD_NAMES:
+        shutil.copy(CARDS_DIR / name, tmp_path / name)
+        paths.append(tmp_path / name)
+
+    reports = optimise_deck(paths, workers=2)
+
+    assert [r["status"] for r in reports] == ["updated", "updated"]
+    assert reports[0]["root"] == "Causation (Vic)"
+    diagrams = [yaml.safe_load(p.read_text(encoding="utf-8"))["diagram"] for p in paths]
+    assert diagrams == [r["diagram"] for r in reports]
+    assert "Kuru v State of NSW" in diagrams[1]
+    assert "Kuru v State of NSW" not in diagrams[0]
+
+
+def test_score_weight_optimisation_is_stable_and_cached(tmp_path, monkeypatch) -> None:
+    from jd.monte_carlo import config, score_optimizer
+
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path)
+    metrics = score_optimizer.sample_candidate_metrics(64, seed=5)
+    population = np.random.default_rng(1).uniform(0.1, 2.0, size=(3, 7))
+    batched = score_optimizer._evaluate(population, metrics)
+    single = [score_optimizer._evaluate(population[:, i], metrics) for i in range(7)]
+    assert batched == pytest.approx(single)
+
+    first = score_optimizer.optimise_score_weights(sample_size=64, seed=5)
+    second = score_optimizer.optimise_score_weights(sample_size=64, seed=5)
+
+    assert first == second
+    assert score_optimizer.load_score_weights(sample_size=64, seed=5) == first
+    (cache_file,) = tmp_path.glob("score_weights-*.json")
+    assert config.context_fingerprint() in cache_file.name
+
+
+def test_section_weight_cache_respects_max_iterations(tmp_path, monkeypatch) -> None:
+    import json
+
+    from jd.monte_carlo import config, weight_optimizer
+    from jd.monte_carlo.optimize_diagram import _maybe_optimise_section_weights
+
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path)
+    for iterations, weight in ((150, 0.1), (40, 0.9)):
+        path = weight_optimizer._cache_file(iterations, weight_optimizer.DEFAULT_SEED)
+        path.write_text(json.dumps({"Legal Test": weight}))
+
+    assert _maybe_optimise_section_weights(False, 40) == {"Legal Test": 0.9}
+    assert _maybe_optimise_section_weights(False, 150) == {"Legal Test": 0.1}
+
+
+def test_exact_children_never_cycle_the_pool() -> None:
+    priorities = {"a": 1.0, "b": 0.9}
+    assert _best_children(["b", "a"], priorities, 2) == ["a", "b"]
+    assert _best_children(["b", "a"], priorities, 3) is None
+    assert _best_children(["a", "a"], priorities, 2) is None
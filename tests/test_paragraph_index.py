@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import functools
+
+import pytest
+
+from windsurf.tools.legal_pinpoint_pipeline import Paragraph, PinpointVerifier
+
+pytest.importorskip("numpy")
+
+from windsurf.tools.paragraph_index import (  # noqa: E402
+    SemanticRetriever,
+    encoder_fingerprint,
+)
+
+PARAGRAPHS = [
+    Paragraph("[10]", "The appellant was injured while water skiing behind the boat."),
+    Paragraph("[11]", "Costs follow the event and the orders below are set aside."),
+    Paragraph(
+        "[12]",
+        "A participant who knowingly accepts the obvious dangers of a sport "
+        "consents to those dangers, so volenti non fit injuria may defeat the claim "
+        "where the plaintiff fully appreciated and accepted the risk of injury.",
+    ),
+    Paragraph("[13]", "The trial judge found the driver had been careless."),
+]
+
+
+def test_paraphrased_proposition_finds_target(tmp_path) -> None:
+    retriever = SemanticRetriever(cache_dir=tmp_path)
+
+    candidates = retriever(
+        PARAGRAPHS, "plaintiff consented to the dangers of the sport", max_total=1
+    )
+
+    assert [p.para_no for p in candidates] == ["[12]"]
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    reloaded = SemanticRetriever(cache_dir=tmp_path)
+    assert reloaded(PARAGRAPHS, "consented to the dangers", max_total=1) == candidates
+
+
+class _ScaledEncoder:
+    def __init__(self, scale: float) -> None:
+        self.scale = scale
+
+    def __call__(self, texts):
+        import numpy as np
+
+        return np.array([[len(text) * self.scale, 1.0] for text in texts])
+
+
+def _encode(texts, scale=1.0):
+    import numpy as np
+
+    return np.array([[len(text) * scale, 1.0] for text in texts])
+
+
+def test_custom_encoders_do_not_share_cache_entries(tmp_path) -> None:
+    fingerprints = {
+        encoder_fingerprint(_ScaledEncoder(1.0)),
+        encoder_fingerprint(_ScaledEncoder(2.0)),
+        encoder_fingerprint(functools.partial(_encode, scale=2.0)),
+        encoder_fingerprint(_encode),
+        encoder_fingerprint(_encode, version="v2"),
+    }
+    assert len(fingerprints) == 5
+    assert encoder_fingerprint(_ScaledEncoder(1.0)) == encoder_fingerprint(
+        _ScaledEncoder(1.0)
+    )
+    assert encoder_fingerprint(_encode).startswith(f"{__name__}._encode:")
+
+    for scale in (1.0, 2.0):
+        SemanticRetriever(cache_dir=tmp_path, encoder=_ScaledEncoder(scale)).index_for(
+            PARAGRAPHS
+        )
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+
+def test_verifier_uses_retriever() -> None:
+    verifier = PinpointVerifier(
+        searcher=lambda _q: ["file://fixture"],
+        fetcher=lambda _u: PARAGRAPHS,
+        retriever=SemanticRetriever(),
+    )
+
+    result = verifier.verify(
+        query="Rootes v Shelton",
+        case_name="Rootes v Shelton",
+        citation="(1967) 116 CLR 383",
+        target_para="[12]",
+        proposition="Consent to the obvious dangers of a sport",
+    )
+
+    assert result is not None
+    assert result.pinpoint == "[12]"
+
+
+def test_verifier_passes_stop_marker_past_the_target() -> None:
+    seen = []
+
+    def fetcher(_url, stop_after=None):
+        seen.append(stop_after)
+        return PARAGRAPHS
+
+    verifier = PinpointVerifier(
+        searcher=lambda _q: ["file://fixture"], fetcher=fetcher, stop_window=2
+    )
+    verifier.verify(
+        query="Rootes v Shelton",
+        case_name="Rootes v Shelton",
+        citation="(1967) 116 CLR 383",
+        target_para="[12]",
+        proposition="Consent to the obvious dangers of a sport",
+    )
+
+    assert seen == ["[14]"]
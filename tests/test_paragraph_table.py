@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from windsurf.tools.legal_pinpoint_pipeline import (
+    Paragraph,
+    ParagraphTable,
+    build_pinpoint_prompt,
+    pack_pinpoint_prompt,
+    slice_candidate_paragraphs,
+)
+
+PARAGRAPHS = [
+    Paragraph(
+        para_no="[10]", text="The plaintiff accepted the risk.", page=3, offset=0
+    ),
+    Paragraph(
+        para_no="[11]", text="Volenti requires full knowledge.", page=3, offset=40
+    ),
+    Paragraph(para_no="[12]", text="The defence failed on the facts."),
+]
+
+
+def test_table_round_trips_paragraphs() -> None:
+    table = ParagraphTable(PARAGRAPHS)
+
+    assert len(table) == 3
+    assert list(table) == PARAGRAPHS
+    assert table[-1].page is None
+    assert table.index_of("[11]") == 1
+    assert not hasattr(table, "__dict__")
+
+
+def test_table_is_accepted_by_prompt_helpers() -> None:
+    table = ParagraphTable(PARAGRAPHS)
+
+    candidates = slice_candidate_paragraphs(table, keywords=["volenti"], window=0)
+    assert [p.para_no for p in candidates] == ["[11]"]
+    prompt = build_pinpoint_prompt(table, "Rootes v Shelton", "Volenti")
+    assert "[12] The defence failed on the facts." in prompt
+
+
+def test_packed_prompt_respects_budget_and_keeps_target_whole() -> None:
+    filler = " ".join(f"filler{i}" for i in range(400))
+    paragraphs = [
+        Paragraph(para_no="[10]", text=f"{filler} volenti {filler}"),
+        Paragraph(para_no="[11]", text="Volenti requires full knowledge of the risk."),
+        Paragraph(para_no="[12]", text=filler),
+    ]
+
+    packed = pack_pinpoint_prompt(
+        paragraphs,
+        "Rootes v Shelton",
+        "Volenti",
+        token_budget=300,
+        target_para="[11]",
+        keywords=["volenti"],
+    )
+
+    assert packed.estimated_tokens <= 300
+    assert not packed.over_budget
+    assert "[11] Volenti requires full knowledge of the risk." in packed.prompt
+    assert packed.truncated == ["[10]"]
+    assert "[...] " in packed.prompt and " volenti " in packed.prompt
+
+
+def test_tables_do_not_share_markers() -> None:
+    first = ParagraphTable(PARAGRAPHS)
+    second = ParagraphTable([Paragraph(para_no="[99]", text="Only here.")])
+
+    assert second.para_no_at(0) == "[99]"
+    assert first.para_no_at(0) == "[10]"
+    with pytest.raises(ValueError):
+        first.index_of("[99]")
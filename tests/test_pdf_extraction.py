@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from windsurf.tools.legal_pinpoint_pipeline import PagedPdfExtractor
+
+fitz = pytest.importorskip("fitz")
+
+
+def _build_pdf(pages: int, paras_per_page: int) -> bytes:
+    doc = fitz.open()
+    number = 1
+    for page_no in range(1, pages + 1):
+        page = doc.new_page()
+        y = 72
+        for _ in range(paras_per_page):
+            page.insert_text((72, y), f"[{number}] Volenti risk on page {page_no}.")
+            number += 1
+            y += 20
+    return doc.tobytes()
+
+
+def test_paragraphs_keep_page_and_offset() -> None:
+    data = _build_pdf(pages=6, paras_per_page=2)
+    paragraphs = PagedPdfExtractor(workers=2, pages_per_chunk=2).extract(data)
+
+    assert [p.para_no for p in paragraphs] == [f"[{n}]" for n in range(1, 13)]
+    first, second = paragraphs[0], paragraphs[1]
+    assert (first.page, first.offset) == (1, 0)
+    assert second.page == 1 and second.offset > 0
+    assert paragraphs[-1].page == 6
+    assert paragraphs[-1].text == "Volenti risk on page 6."
+
+
+def test_stop_after_skips_later_pages() -> None:
+    data = _build_pdf(pages=12, paras_per_page=2)
+    paragraphs = PagedPdfExtractor(workers=2, pages_per_chunk=2).extract(
+        data, stop_after="[5]"
+    )
+
+    para_nos = [p.para_no for p in paragraphs]
+    assert "[5]" in para_nos
+    assert "[6]" in para_nos
+    assert paragraphs[-1].page == 3
+
+
+def test_extract_file_reads_from_a_path(tmp_path) -> None:
+    path = tmp_path / "judgment.pdf"
+    path.write_bytes(_build_pdf(pages=6, paras_per_page=2))
+    extractor = PagedPdfExtractor(workers=2, pages_per_chunk=2)
+
+    assert extractor.extract_file(path) == extractor.extract(path.read_bytes())
+    paragraphs = extractor.extract_file(path, stop_after="[3]")
+    assert [p.para_no for p in paragraphs][-1] in ("[4]", "[5]", "[6]")
+
+
+def test_chunks_are_submitted_a_window_ahead(monkeypatch) -> None:
+    from windsurf.tools import legal_pinpoint_pipeline as pipeline
+
+    submitted = []
+
+    class RecordingPool(pipeline.ProcessPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args)
+            return super().submit(fn, *args)
+
+    monkeypatch.setattr(pipeline, "ProcessPoolExecutor", RecordingPool)
+    data = _build_pdf(pages=20, paras_per_page=2)
+    PagedPdfExtractor(workers=2, pages_per_chunk=2).extract(data, stop_after="[3]")
+
+    assert len(submitted) <= 3
+    assert all(args and not isinstance(args[0], bytes) for args in submitted)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import yaml
+
+from windsurf.flashcards.processor import FlashcardProcessor, scaffold_card_data
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_PATH = ROOT / "src/jd/policy/cards_policy.yml"
+CARD = ROOT / "src/jd/cards_yaml/0003-breach-what-is-the-shirt-calculus.yml"
+
+
+def _processor(tmp_path: Path) -> FlashcardProcessor:
+    processor = FlashcardProcessor()
+    processor.backup_root = tmp_path / "backups"
+    processor.configure_run("run-1")
+    return processor
+
+
+def test_scaffold_fills_every_required_field() -> None:
+    policy = yaml.safe_load(POLICY_PATH.read_text(encoding="utf-8"))
+
+    card = scaffold_card_data("Vicarious liability", "torts", policy)
+
+    required = policy["schema"]["required_fields"]
+    assert list(card)[: len(required)] == required
+    assert card["front"] == "Vicarious liability?"
+    assert card["back"].startswith("Issue.")
+    assert card["tags"] == ["MLS_H1", "torts"]
+    assert card["anchors"]["statutes"]
+    assert card["template"] == "concept"
+
+
+def test_run_card_loads_once_and_saves_once(tmp_path) -> None:
+    card = tmp_path / CARD.name
+    text = CARD.read_text(encoding="utf-8").replace("tags:", "sources: none\ntags:", 1)
+    card.write_text(text, encoding="utf-8")
+    processor = _processor(tmp_path)
+    calls = {"load_card": 0, "save_card": 0}
+    for name in calls:
+        original = getattr(processor, name)
+
+        def counted(*args, _name=name, _original=original):
+            calls[_name] += 1
+            return _original(*args)
+
+        setattr(processor, name, counted)
+
+    result = processor.run_card(card, ["edit", "repair"], apply_changes=True)
+
+    assert calls == {"load_card": 1, "save_card": 1}
+    assert list(result["stages"]) == ["repair", "edit"]
+    assert result["stages"] == {"repair": True, "edit": False}
+    assert result["repairs"] is True and result["status"] == "saved"
+    assert len(processor.backup_store.manifest("run-1")) == 1
+    assert yaml.safe_load(card.read_text(encoding="utf-8"))["sources"] == []
+
+
+def test_run_card_without_changes_does_not_save(tmp_path) -> None:
+    card = tmp_path / CARD.name
+    shutil.copy(CARD, card)
+    before = card.read_text(encoding="utf-8")
+
+    result = _processor(tmp_path).run_card(
+        card, ["edit", "validate"], apply_changes=True
+    )
+
+    assert result["stages"] == {"edit": False, "validate": False}
+    assert "saved" not in result
+    assert card.read_text(encoding="utf-8") == before
+    assert not (tmp_path / "backups").exists()
+
+
+def test_unchanged_cards_are_not_restamped_or_rewritten(tmp_path) -> None:
+    card = tmp_path / "card.yml"
+    card.write_text("front: Duty  of care?\nback: Issue. x\ntags: [Tort, tort]\n")
+    processor = _processor(tmp_path)
+    processor._schema_validator_loaded = True  # no validator: every card is valid
+
+    first = processor.run_card(card, processor.PIPELINE_STAGES, apply_changes=True)
+    written = card.read_text(encoding="utf-8")
+    second = processor.run_card(card, processor.PIPELINE_STAGES, apply_changes=True)
+
+    assert first["status"] == "saved"
+    assert yaml.safe_load(written)["updated"]
+    assert second["skipped"] is True and "saved" not in second
+    assert not any(second["stages"].values())
+    assert card.read_text(encoding="utf-8") == written
+    assert len(processor.backup_store.manifest("run-1")) == 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from windsurf.flashcards.processor import FlashcardProcessor
+from windsurf.profiling import Profiler
+
+CARD = (
+    Path(__file__).resolve().parents[1]
+    / "src/jd/cards_yaml/0003-breach-what-is-the-shirt-calculus.yml"
+)
+
+
+def test_summary_and_table(tmp_path) -> None:
+    profiler = Profiler()
+    for seconds in (0.001, 0.002, 0.003, 0.010):
+        profiler.add("stage.slow", seconds)
+    double = profiler.wrap("stage.fast", lambda x: x * 2)
+    assert double(21) == 42
+    profiler.cards = 4
+
+    summary = profiler.summary()
+    assert list(summary) == ["stage.slow", "stage.fast"]
+    slow = summary["stage.slow"]
+    assert slow["calls"] == 4
+    assert slow["total_ms"] == pytest.approx(16.0)
+    assert slow["per_card_ms"] == pytest.approx(4.0)
+    assert slow["p50_ms"] == pytest.approx(2.5)
+    assert slow["max_ms"] == pytest.approx(10.0)
+
+    payload = profiler.write_json(tmp_path / "profile.json", pattern="*.yml")
+    assert json.loads((tmp_path / "profile.json").read_text()) == payload
+    assert len(profiler.format_table(top=1).splitlines()) == 2
+
+
+def test_processor_stages_and_checks_are_timed(tmp_path) -> None:
+    card = tmp_path / CARD.name
+    shutil.copy(CARD, card)
+    processor = FlashcardProcessor()
+    profiler = Profiler()
+    processor.enable_profiling(profiler)
+
+    result = processor.process_card(card)
+
+    assert result["status"] in {"valid", "invalid"}
+    summary = profiler.summary()
+    for name in ("stage.process_card", "stage.load_card", "stage.normalize_card"):
+        assert summary[name]["calls"] == 1
+    assert "check.repeated_sentences" in summary
+    assert "stage.save_card" not in summary
+    assert "process_card" not in vars(FlashcardProcessor())
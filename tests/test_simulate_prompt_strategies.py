@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from windsurf.tools.simulate_prompt_strategies import Strategy, simulate  # noqa: E402
+
+STRATEGY = Strategy(
+    name="Two-pass",
+    cases=30,
+    prompt_tokens_mean=1500,
+    prompt_tokens_sd=280,
+    completion_tokens_mean=170,
+    completion_tokens_sd=30,
+    failure_rate=0.2,
+    max_retries=2,
+    verifier_calls_per_case=0.3,
+    verifier_prompt_tokens=420,
+    verifier_prompt_sd=80,
+    verifier_completion_tokens=120,
+    verifier_completion_sd=25,
+)
+
+
+def test_numpy_engine_matches_python_loop() -> None:
+    fast = simulate(STRATEGY, runs=4000, seed=3, engine="numpy")
+    slow = simulate(STRATEGY, runs=4000, seed=3, engine="python")
+
+    assert fast.name == slow.name
+    assert fast.mean_cost == pytest.approx(slow.mean_cost, rel=0.01)
+    assert fast.p95_cost == pytest.approx(slow.p95_cost, rel=0.02)
+    assert fast.mean_json_failures == pytest.approx(slow.mean_json_failures, rel=0.05)
+    assert fast.mean_coverage == pytest.approx(slow.mean_coverage, abs=0.005)
+
+
+def test_numpy_engine_is_seeded() -> None:
+    assert simulate(STRATEGY, runs=500, seed=9) == simulate(STRATEGY, runs=500, seed=9)
+    assert simulate(STRATEGY, runs=500, seed=9) != simulate(STRATEGY, runs=500, seed=10)
+
+
+def test_python_engine_is_seeded_without_touching_global_rng() -> None:
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+
+    first = simulate(STRATEGY, runs=200, seed=9, engine="python")
+
+    assert random.random() == expected
+    assert simulate(STRATEGY, runs=200, seed=9, engine="python") == first
+
+
+def test_lognormal_tokens_keep_the_mean_and_the_right_tail() -> None:
+    skewed = replace(
+        STRATEGY, prompt_tokens_sd=1200, failure_rate=0.0, verifier_calls_per_case=0.0
+    )
+    lognormal = replace(skewed, token_distribution="lognormal")
+    expected = skewed.cases * (1500 + 170) * 0.12 / 1000
+
+    fast = simulate(lognormal, runs=4000, seed=3, engine="numpy")
+    slow = simulate(lognormal, runs=4000, seed=3, engine="python")
+
+    assert fast.mean_cost == pytest.approx(expected, rel=0.01)
+    assert slow.mean_cost == pytest.approx(expected, rel=0.01)
+    assert fast.p95_cost == pytest.approx(slow.p95_cost, rel=0.03)
+    assert fast.p95_cost > simulate(skewed, runs=4000, seed=3, engine="numpy").p95_cost
+    with pytest.raises(ValueError):
+        simulate(replace(skewed, token_distribution="gamma"), runs=10)
+
+
+def test_sweep_marks_pareto_frontier() -> None:
+    from windsurf.tools.strategy_sweep import parse_values, sweep
+
+    assert parse_values("1200:1600:200") == [1200.0, 1400.0, 1600.0]
+    assert parse_values("0,1,2", integer=True) == [0, 1, 2]
+
+    grid = {"prompt_tokens_mean": [1200, 1800], "coverage_mean": [0.78, 0.85]}
+    points = sweep(STRATEGY, grid, runs=200, seed=1, workers=1)
+
+    assert len(points) == 4
+    frontier = sorted(
+        (p for p in points if p.on_frontier), key=lambda p: p.result.mean_cost
+    )
+    assert frontier
+    for point in points:
+        assert (
+            not any(
+                other.result.mean_cost < point.result.mean_cost
+                and other.result.mean_coverage > point.result.mean_coverage
+                for other in points
+            )
+            or not point.on_frontier
+        )
+    coverages = [p.result.mean_coverage for p in frontier]
+    assert coverages == sorted(coverages)
+
+
+def test_calibration_from_brief_logs(tmp_path) -> None:
+    import json
+
+    from windsurf.tools.calibrate_strategies import (
+        calibrate_directory,
+        calibrated_strategy,
+    )
+
+    status = [
+        {
+            "file": "a.pdf",
+            "status": "ok",
+            "attempt": "full/4k",
+            "sample_len": 8000,
+            "raw_len": 800,
+        },
+        {
+            "file": "b.pdf",
+            "status": "ok",
+            "attempt": "full/2.5k",
+            "sample_len": 8000,
+            "raw_len": 600,
+        },
+        {"file": "c.pdf", "status": "fail", "error": "bad json"},
+        "not json",
+    ]
+    failed = [{"file": "c.pdf", "error": "bad json", "sample_len": 1000}]
+    (tmp_path / "batch_status.log").write_text(
+        "\n".join(json.dumps(r) if isinstance(r, dict) else r for r in status) + "\n"
+    )
+    (tmp_path / "failed_responses.jsonl").write_text(json.dumps(failed[0]) + "\n")
+
+    calibration = calibrate_directory(tmp_path)
+    assert (calibration.cases, calibration.attempts, calibration.failed_attempts) == (
+        3,
+        6,
+        4,
+    )
+    assert calibration.failure_rate == pytest.approx(4 / 6)
+    assert calibration.attempt_levels == {"full/4k": 1, "full/2.5k": 1, "min/2.5k": 0}
+    assert calibration.completion_tokens_mean == pytest.approx(175)
+    # full/4k, full/4k + full/2.5k, then all three levels on a 1000-char excerpt.
+    prompts = [135 + 1000, 135 + 1000, 135 + 625, 135 + 250, 135 + 250, 80 + 250]
+    assert calibration.prompt_tokens_mean == pytest.approx(sum(prompts) / len(prompts))
+
+    lognormal = calibrate_directory(tmp_path, fit="lognormal")
+    assert lognormal.prompt_tokens_mean == pytest.approx(
+        calibration.prompt_tokens_mean, rel=0.1
+    )
+
+    assert calibrated_strategy(STRATEGY, lognormal).token_distribution == "lognormal"
+    strategy = calibrated_strategy(STRATEGY, calibration, cases=50)
+    assert strategy.token_distribution == "normal"
+    assert strategy.cases == 50
+    assert strategy.max_retries == 2
+    assert strategy.prompt_tokens_mean == pytest.approx(calibration.prompt_tokens_mean)
+    assert strategy.verifier_calls_per_case == STRATEGY.verifier_calls_per_case
@@ -0,0 +1,26 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import synthetic_deck  # noqa: E402
+
+
+def test_valid_share_follows_the_defect_rate():
+    sample = synthetic_deck.DeckSample.load()
+    for defect_rate in (0.0, 0.2):
+        rng = random.Random(7)
+        cards = [
+            synthetic_deck.synthetic_card(sample, n, rng, defect_rate)
+            for n in range(200)
+        ]
+        valid = sum(sample.validator.validate_card(card).is_valid for card in cards)
+        assert abs(valid / len(cards) - (1 - defect_rate)) <= 0.07
+
+
+def test_abbreviations_are_defined_before_first_use():
+    back = synthetic_deck.define_abbreviations(
+        "Rule.\n- Sullivan v Moody (2001) 207 CLR 562 [2001] HCA 59."
+    )
+    assert back.splitlines()[1] == "Abbreviations: Commonwealth Law Reports (CLR)."
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from windsurf import telemetry
+
+
+class _Completions:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+
+    def create(self, **params):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _response(content: str, usage=None):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def test_calls_are_recorded_and_summarised(tmp_path, monkeypatch) -> None:
+    metrics = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(telemetry, "METRICS_PATH", metrics)
+    client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=_Completions(
+                [
+                    TimeoutError("slow"),
+                    _response(
+                        "{}", SimpleNamespace(prompt_tokens=1000, completion_tokens=200)
+                    ),
+                    _response("x" * 40),
+                ]
+            )
+        )
+    )
+    messages = [{"role": "user", "content": "y" * 400}]
+
+    with pytest.raises(TimeoutError):
+        telemetry.create_completion(client, tool="grade", model="m", messages=messages)
+    telemetry.create_completion(
+        client, tool="grade", attempt=2, model="m", messages=messages
+    )
+    telemetry.create_completion(client, tool="briefs", model="m", messages=messages)
+
+    records = list(telemetry.read_records(metrics))
+    assert [r["status"] for r in records] == ["error", "ok", "ok"]
+    assert records[2]["estimated"] is True
+    assert (records[2]["prompt_tokens"], records[2]["completion_tokens"]) == (100, 10)
+
+    summary = telemetry.summarise(records, telemetry.RUN_ID)
+    assert summary["grade"]["calls"] == 2
+    assert summary["grade"]["errors"] == 1
+    assert summary["grade"]["retries"] == 1
+    assert summary["total"]["completion_tokens"] == 210
+    assert summary["total"]["cost_usd"] == pytest.approx(
+        telemetry.estimate_cost(1000 + 100, 210), abs=1e-4
+    )
+    assert summary["total"]["p95_latency_ms"] >= summary["total"]["p50_latency_ms"]
+    assert telemetry.summarise(records, "another-run") == {}
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import copy
+import datetime
+import pickle
 from pathlib import Path
 
 import pytest
 
+from windsurf.tools import schema_validator
 from windsurf.tools.schema_validator import SchemaValidator
 
 POLICY_PATH = Path(__file__).resolve().parents[1] / "jd/policy/cards_policy.yml"
@@ -277,6 +280,16 @@ def test_invalid_mermaid_nodes(validator: SchemaValidator, base_card: dict) -> N
     assert any("Mindmap" in err for err in result.errors)
 
 
+def test_branches_under_root_node_are_counted(
+    validator: SchemaValidator, base_card: dict
+) -> None:
+    card = copy.deepcopy(base_card)
+    branches = "\n".join(f"    Branch{i}\n      Leaf{i}" for i in range(4))
+    card["diagram"] = f"```mermaid\nmindmap\n  root((Duty))\n{branches}\n```"
+    result = validator.validate_card(card)
+    assert not any("Mindmap" in err for err in result.errors)
+
+
 def test_tripwires_below_minimum(validator: SchemaValidator, base_card: dict) -> None:
     card = copy.deepcopy(base_card)
     card["tripwires"] = ["Only one tripwire provided."]
@@ -299,3 +312,90 @@ def test_duplicate_sentences_flagged(
     card["why_it_matters"] = duplicate_sentence
     result = validator.validate_card(card)
     assert any("duplicate" in err.lower() for err in result.errors)
+
+
+def test_plan_skips_disabled_checks() -> None:
+    policy = copy.deepcopy(POLICY_DATA)
+    policy["back"]["abbreviations"]["expand_on_first_use"] = False
+    policy["lint"].pop("forbid_placeholder_text_regex", None)
+    policy["tripwires"]["enforce_distinctness"] = False
+    plan = schema_validator.compile_policy(policy)
+
+    assert "abbreviations" not in plan.rule_names
+    assert "placeholder_text" not in plan.rule_names
+    assert plan.rule_names[:3] == ["required_fields", "tags", "keywords"]
+    tripwires = next(rule for rule in plan.rules if rule.name == "tripwires")
+    assert tripwires.params["duplicate_threshold"] is None
+
+
+def test_plan_cached_by_policy_hash(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, base_card: dict
+) -> None:
+    monkeypatch.setattr(schema_validator, "_PLANS", {})
+    plan = schema_validator.load_plan(POLICY_DATA, cache_dir=tmp_path)
+    assert (tmp_path / f"{plan.policy_hash}.json").exists()
+    assert schema_validator.load_plan(POLICY_DATA, cache_dir=tmp_path) is plan
+
+    monkeypatch.setattr(schema_validator, "_PLANS", {})
+    cached = schema_validator.load_plan(POLICY_DATA, cache_dir=tmp_path)
+    assert cached is not plan and cached == plan
+
+    card = copy.deepcopy(base_card)
+    card["keywords"] = ["salient features"]
+    shipped = SchemaValidator(POLICY_PATH, plan=pickle.loads(pickle.dumps(cached)))
+    expected = SchemaValidator(POLICY_PATH, policy_data=POLICY_DATA).validate_card(card)
+    assert shipped.validate_card(card) == expected
+    assert not expected.is_valid
+
+
+def test_plan_cache_write_failures_do_not_block_validation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(schema_validator, "_PLANS", {})
+    policy = dict(POLICY_DATA, reviewed=datetime.date(2026, 10, 18))
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+
+    assert schema_validator.load_plan(policy, cache_dir=blocker / "plans").rules
+    plan = schema_validator.load_plan(dict(policy, note="dated"), cache_dir=tmp_path)
+    assert (tmp_path / f"{plan.policy_hash}.json").exists()
+
+
+def test_back_text_analysis(validator: SchemaValidator) -> None:
+    back = validator.analyse_back(
+        "Issue.\nWho owes the HCA duty? See NSW law.\n\n"
+        "Rule.\n  - Sullivan v Moody.\nRule.\nAgain! HCA"
+    )
+
+    assert back.sections == {
+        "Issue.": "Who owes the HCA duty? See NSW law.",
+        "Rule.": "Again! HCA",
+    }
+    assert back.heading_count == {"Issue.": 1, "Rule.": 2}
+    assert back.section_lines["Issue."] == ["Who owes the HCA duty? See NSW law."]
+    assert back.word_count == validator._tokenize_words(back.text)
+    assert [s.words for s in back.sentences][:3] == [1, 5, 3]
+    assert back.caps == {"HCA": back.text.index("HCA"), "NSW": back.text.index("NSW")}
+    duty = [s for s in back.sentences if s.text.startswith("Who")][0]
+    assert duty.similarity(duty) == pytest.approx(1.0)
+
+
+def test_abbreviation_definitions_and_policy_whitelist() -> None:
+    back = SchemaValidator(POLICY_PATH, policy_data=POLICY_DATA).analyse_back(
+        "The Victorian Civil and Administrative Tribunal (VCAT) sits. "
+        "IVAA (Insurance Victoria Act) applies; CLR reports; VCAT again."
+    )
+    assert back.defines_at("VCAT", back.caps["VCAT"])
+    assert back.defines_at("IVAA", back.caps["IVAA"])
+    assert not back.defines_at("CLR", back.caps["CLR"])
+
+    policy = copy.deepcopy(POLICY_DATA)
+    policy["back"]["abbreviations"]["allowed_without_expansion"] = ["CLR"]
+    plan = schema_validator.compile_policy(policy)
+    rule = next(rule for rule in plan.rules if rule.name == "abbreviations")
+    assert rule.params == {"allowed": ["CLR"]}
+
+    check = dict(SchemaValidator(POLICY_PATH, plan=plan)._checks)["abbreviations"]
+    result = schema_validator.ValidationResult()
+    check({}, back, result)
+    assert result.errors == []
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from windsurf.cli import verify
+
+JUDGMENT_HTML = """
+<html><body>
+<p>[1] The appellant slipped on a wet floor in the respondent's supermarket.</p>
+<p>[2] A person who voluntarily accepts an obvious risk of injury cannot later
+recover damages for harm suffered when that very risk materialises, because
+the defence of volenti non fit injuria rests on full knowledge and free
+acceptance of the risk by the plaintiff.</p>
+</body></html>
+"""
+
+
+def test_batch_streams_jsonl_records(tmp_path) -> None:
+    source = tmp_path / "judgment.html"
+    source.write_text(JUDGMENT_HTML, encoding="utf-8")
+    rows = [
+        {
+            "case": "Example v Shop",
+            "citation": "[2020] HCA 1",
+            "para": "[2]",
+            "proposition": "Volenti requires free acceptance of a known risk.",
+            "query": "Example v Shop",
+            "source_file": str(source),
+            "keywords": ["volenti"],
+        },
+        {
+            "case": "Example v Shop",
+            "para": "[9]",
+            "proposition": "A paragraph that does not exist.",
+            "source_file": str(source),
+        },
+    ]
+    requests_path = tmp_path / "requests.jsonl"
+    requests_path.write_text(
+        "\n".join(json.dumps(row) for row in rows), encoding="utf-8"
+    )
+    output = tmp_path / "results.jsonl"
+
+    exit_code = verify.main(
+        [str(requests_path), "--output", str(output), "--workers", "2"]
+    )
+
+    records = {
+        record["index"]: record
+        for record in map(json.loads, output.read_text(encoding="utf-8").splitlines())
+    }
+    assert exit_code == 1
+    assert records[1]["status"] == "verified"
+    assert records[1]["result"]["pinpoint"] == "[2]"
+    assert "volenti" in records[1]["result"]["quote"]
+    assert records[2]["status"] == "not_found"
+    assert all(record["elapsed_ms"] >= 0 for record in records.values())
+
+
+def test_csv_rows_split_keywords(tmp_path) -> None:
+    path = tmp_path / "requests.csv"
+    path.write_text(
+        "case,citation,para,proposition,keywords\n"
+        "A v B,[2001] HCA 2,[4],Duty of care,duty; care\n",
+        encoding="utf-8",
+    )
+
+    (request,) = verify.read_requests(path)
+
+    assert request.target_para == "[4]"
+    assert request.query == "A v B"
+    assert request.keywords == ["duty", "care"]
+
+
+def test_shared_cache_is_bounded_and_retries_failures() -> None:
+    calls = []
+    results = {"a": ["A"], "b": ["B"], "c": ["C"]}
+
+    def loader(key):
+        calls.append(key)
+        if key == "boom" and calls.count(key) == 1:
+            raise OSError("transient")
+        return results.get(key, [])
+
+    cache = verify.SharedCache(loader, maxsize=2)
+    assert cache("a") == ["A"]
+    assert cache("b") == ["B"]
+    assert cache("a") == ["A"]  # refreshes "a", so "b" is the oldest
+    assert cache("c") == ["C"]
+    cache("a")
+    cache("b")
+    assert calls == ["a", "b", "c", "b"]
+
+    with pytest.raises(OSError):
+        cache("boom")
+    assert cache("boom") == []
+    assert cache("boom") == []
+    assert calls[-3:] == ["boom", "boom", "boom"]
+
+
+def test_batch_reads_pdfs_without_a_process_pool() -> None:
+    batch = verify.BatchVerifier()
+
+    assert batch._document_fetcher.pdf_extractor.workers == 1
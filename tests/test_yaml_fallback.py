@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from windsurf.tools import yaml_fallback
+
+CARD = """﻿front: "Breach: which factors?"
+back: |
+  Issue.
+  Rule # literal, not a comment
+
+    - nested bullet
+tripwires:
+- Conflating duty with breach.
+- Ignoring s 49 # trailing comment
+anchors:
+  cases:
+    - name: Wyong Shire Council v Shirt
+      pinpoints:
+        - 47
+        - '[12]'
+  statutes: []
+why_it_matters: >-
+  Folded
+  text
+reading_level: Plain English (JD)
+diagram: |-
+  mindmap
+    root"""
+
+
+def test_card_subset() -> None:
+    data = yaml_fallback.safe_load(CARD)
+
+    assert list(data) == [
+        "front",
+        "back",
+        "tripwires",
+        "anchors",
+        "why_it_matters",
+        "reading_level",
+        "diagram",
+    ]
+    assert data["front"] == "Breach: which factors?"
+    assert (
+        data["back"] == "Issue.\nRule # literal, not a comment\n\n  - nested bullet\n"
+    )
+    assert data["tripwires"] == ["Conflating duty with breach.", "Ignoring s 49"]
+    assert data["anchors"] == {
+        "cases": [{"name": "Wyong Shire Council v Shirt", "pinpoints": [47, "[12]"]}],
+        "statutes": [],
+    }
+    assert data["why_it_matters"] == "Folded text"
+    assert data["diagram"] == "mindmap\n  root"
+
+
+def test_scalars_and_flow_collections() -> None:
+    data = yaml_fallback.safe_load(
+        "a: yes\nb: ~\nc: 1.5\nd: 'it''s'\ne: \"tab\\tu\\u00e9\"\n"
+        "f: [x, 'y, z', [1, 2], {k: v}]\ng: \"two\n  lines\"\nh: plain\n  continued\n"
+    )
+    assert data == {
+        "a": True,
+        "b": None,
+        "c": 1.5,
+        "d": "it's",
+        "e": "tab\tué",
+        "f": ["x", "y, z", [1, 2], {"k": "v"}],
+        "g": "two lines",
+        "h": "plain continued",
+    }
+    assert yaml_fallback.safe_load("") is None
+    assert yaml_fallback.safe_load("- a\n-\n  - b\n") == ["a", ["b"]]
+
+
+def test_colon_inside_flow_sequence_is_a_single_pair_mapping() -> None:
+    assert yaml_fallback.safe_load("tags: [a: b]") == {"tags": [{"a": "b"}]}
+    assert yaml_fallback.safe_load("x: {a: [b: c]}") == {"x": {"a": [{"b": "c"}]}}
+    assert yaml_fallback.safe_load("keywords: [Torts, s 48: Wrongs Act]") == {
+        "keywords": ["Torts", {"s 48": "Wrongs Act"}]
+    }
+    assert yaml_fallback.safe_load("a: [x:, y]") == {"a": [{"x": None}, "y"]}
+
+
+def test_malformed_input_raises() -> None:
+    with pytest.raises(yaml_fallback.YAMLError):
+        yaml_fallback.safe_load("a:\n  b: 1\n c: 2\n")
+    with pytest.raises(yaml_fallback.YAMLError):
+        yaml_fallback.safe_load('a: "never closed\n')
+    with pytest.raises(yaml_fallback.YAMLError):
+        yaml_fallback.safe_load("a: {b: c d: e}")
+
+
+def test_matches_pyyaml_on_deck() -> None:
+    yaml = pytest.importorskip("yaml")
+    root = Path(__file__).resolve().parents[1] / "src" / "jd"
+    paths = sorted((root / "cards_yaml").glob("*.yml")) + [
+        root / "policy" / "cards_policy.yml"
+    ]
+    compared = 0
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        try:
+            expected = yaml.safe_load(text)
+        except yaml.YAMLError:
+            continue
+        assert yaml_fallback.safe_load(text) == expected, path.name
+        compared += 1
+    assert compared
+
+
+def test_dump_round_trips_with_block_scalars() -> None:
+    data = {
+        "front": "Breach: which factors?",
+        "back": "Issue.\n\n  - indented\nlast",
+        "tripwires": ["yes", "s 49 # not a comment", "", None],
+        "anchors": {
+            "cases": [{"name": "Shirt", "pinpoints": [47, "[12]"]}],
+            "statutes": [],
+        },
+        "diagram": "mindmap\n  root\n",
+        "score": 1.5,
+    }
+    text = yaml_fallback.safe_dump(data, sort_keys=False, allow_unicode=True)
+
+    assert text.startswith(
+        "front: 'Breach: which factors?'\nback: |-\n  Issue.\n\n    - indented\n"
+    )
+    assert "diagram: |\n  mindmap\n    root\n" in text
+    assert yaml_fallback.safe_load(text) == data
+    assert list(yaml_fallback.safe_load(text)) == list(data)
+
+    yaml = pytest.importorskip("yaml")
+    assert yaml.safe_load(text) == data